@@ -0,0 +1,387 @@
+# catalog_db.py
+import argparse
+import os
+import sqlite3
+import sys
+import json_codec
+from catalog_store import source_stamp, stamp_is_current
+from catalog_validator import PARAM_INSERT_PATTERN
+from profile_resolver import ProfileResolver
+
+DB_VERSION = 1
+
+# Each group and control row keeps its own JSON (groups without controls or subgroups, controls
+# without enhancements) so the catalog round-trips exactly; the other tables index that JSON
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE groups (id TEXT PRIMARY KEY, parent_id TEXT, family TEXT, seq INTEGER, title TEXT, class TEXT, json TEXT);
+CREATE TABLE controls (id TEXT PRIMARY KEY, group_id TEXT, parent_id TEXT, family TEXT, seq INTEGER,
+                       title TEXT, class TEXT, json TEXT);
+CREATE TABLE params (id TEXT, owner_id TEXT, label TEXT);
+CREATE TABLE param_refs (param_id TEXT, owner_id TEXT);
+CREATE TABLE props (owner_id TEXT, name TEXT, value TEXT, class TEXT, ns TEXT);
+CREATE TABLE links (owner_id TEXT, rel TEXT, href TEXT, target TEXT);
+CREATE TABLE parts (rowid INTEGER PRIMARY KEY, id TEXT, owner_id TEXT, parent_id TEXT, name TEXT, title TEXT, prose TEXT);
+CREATE VIRTUAL TABLE part_text USING fts5(title, prose, content='parts', content_rowid='rowid');
+"""
+
+# Created after the bulk import, which fills the full-text index in one 'rebuild' instead
+INDEXES = """
+CREATE INDEX controls_family ON controls (family, seq);
+CREATE INDEX controls_group ON controls (group_id, seq);
+CREATE INDEX controls_parent ON controls (parent_id);
+CREATE INDEX groups_parent ON groups (parent_id);
+CREATE INDEX params_id ON params (id, owner_id);
+CREATE INDEX params_owner ON params (owner_id);
+CREATE INDEX param_refs_param ON param_refs (param_id, owner_id);
+CREATE INDEX param_refs_owner ON param_refs (owner_id);
+CREATE INDEX props_name ON props (name, value, owner_id);
+CREATE INDEX props_owner ON props (owner_id);
+CREATE INDEX links_target ON links (target, owner_id);
+CREATE INDEX links_owner ON links (owner_id);
+CREATE INDEX parts_owner ON parts (owner_id);
+CREATE TRIGGER parts_insert AFTER INSERT ON parts BEGIN
+    INSERT INTO part_text (rowid, title, prose) VALUES (new.rowid, new.title, new.prose);
+END;
+CREATE TRIGGER parts_delete AFTER DELETE ON parts BEGIN
+    INSERT INTO part_text (part_text, rowid, title, prose) VALUES ('delete', old.rowid, old.title, old.prose);
+END;
+"""
+
+OWNED_TABLES = ("params", "param_refs", "props", "links", "parts")
+# Columns filled by CatalogRows; parts.rowid is assigned by SQLite
+PARTS_COLUMNS = "id, owner_id, parent_id, name, title, prose"
+
+def db_path_for(json_path):
+    return os.path.splitext(json_path)[0] + ".sqlite"
+
+class CatalogRows:
+    """Rows for the normalized tables, collected from catalog dicts before one executemany per table."""
+    def __init__(self, seq=0):
+        self.seq = seq
+        self.tables = {name: [] for name in ("groups", "controls") + OWNED_TABLES}
+
+    def add_owned(self, owner_id, item):
+        for param in item.get("params") or []:
+            self.tables["params"].append((param["id"], owner_id, param.get("label")))
+        for prop in item.get("props") or []:
+            self.tables["props"].append((owner_id, prop.get("name"), prop.get("value"), prop.get("class"), prop.get("ns")))
+        for link in item.get("links") or []:
+            href = link.get("href", "")
+            self.tables["links"].append((owner_id, link.get("rel"), href, href[1:] if href.startswith("#") else None))
+        refs = set()
+        for part in item.get("parts") or []:
+            self.add_part(owner_id, None, part, refs)
+        self.tables["param_refs"].extend((param_id, owner_id) for param_id in refs)
+
+    def add_part(self, owner_id, parent_id, part, refs):
+        prose = part.get("prose")
+        if prose:
+            refs.update(PARAM_INSERT_PATTERN.findall(prose))
+        self.tables["parts"].append((part.get("id"), owner_id, parent_id, part.get("name"), part.get("title"), prose))
+        for sub_part in part.get("parts") or []:
+            self.add_part(owner_id, part.get("id"), sub_part, refs)
+
+    def add_group(self, group, parent_id=None, family=None, seq=None):
+        shell = {key: value for key, value in group.items() if key not in ("controls", "groups")}
+        family = family or group["id"]
+        if seq is None:
+            self.seq += 1
+            seq = self.seq
+        self.tables["groups"].append((group["id"], parent_id, family, seq, group.get("title"), group.get("class"),
+                                      json_codec.dumps(shell, compact=True)))
+        self.add_owned(group["id"], group)
+        for control in group.get("controls") or []:
+            self.add_control(control, group["id"], family=family)
+        for subgroup in group.get("groups") or []:
+            self.add_group(subgroup, group["id"], family)
+
+    def add_control(self, control, group_id=None, parent_id=None, family=None, seq=None):
+        shell = {key: value for key, value in control.items() if key != "controls"}
+        family = family or control["id"].split("-")[0]  # Loose controls: the id prefix (ac-2 -> ac)
+        if seq is None:
+            self.seq += 1
+            seq = self.seq
+        self.tables["controls"].append((control["id"], group_id, parent_id, family, seq, control.get("title"),
+                                        control.get("class"), json_codec.dumps(shell, compact=True)))
+        self.add_owned(control["id"], control)
+        for child in control.get("controls") or []:
+            self.add_control(child, group_id, control["id"], family)
+
+    def insert(self, connection):
+        for name, rows in self.tables.items():
+            if rows:
+                marks = ", ".join("?" * len(rows[0]))
+                columns = f" ({PARTS_COLUMNS})" if name == "parts" else ""
+                connection.executemany(f"INSERT INTO {name}{columns} VALUES ({marks})", rows)
+
+class CatalogDB:
+    """A catalog imported into SQLite: indexed queries, full-text search over prose, and
+    write-back of single controls and groups without rewriting the rest.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = OFF")
+
+    def close(self):
+        self.connection.close()
+
+    def meta(self, key):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json_codec.loads(row[0]) if row else None
+
+    def set_meta(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json_codec.dumps(value, compact=True)))
+
+    # Reading
+
+    def to_dict(self):
+        """The "catalog" object rebuilt from the stored rows, in document order."""
+        data = self.meta("shell")
+        groups, children = {}, {}
+        for group_id, parent_id, text in self.connection.execute("SELECT id, parent_id, json FROM groups ORDER BY seq"):
+            group = groups[group_id] = json_codec.loads(text)
+            children.setdefault(parent_id, []).append(group)
+        for group_id, group in groups.items():
+            if group_id in children:
+                group["groups"] = children[group_id]
+        controls = {}
+        for control_id, group_id, parent_id, text in self.connection.execute(
+                "SELECT id, group_id, parent_id, json FROM controls ORDER BY seq"):
+            control = controls[control_id] = json_codec.loads(text)
+            owner = controls.get(parent_id) if parent_id else groups.get(group_id) if group_id else data
+            if owner is not None:
+                owner.setdefault("controls", []).append(control)
+        if None in children:
+            data["groups"] = children[None]
+        return data
+
+    def control_dict(self, control_id):
+        """One control with its enhancements, or None."""
+        rows = self.connection.execute("""
+            WITH RECURSIVE tree(id) AS (SELECT ? UNION ALL SELECT c.id FROM controls c JOIN tree ON c.parent_id = tree.id)
+            SELECT id, parent_id, json FROM controls WHERE id IN tree ORDER BY seq""", (control_id,)).fetchall()
+        controls = {}
+        for row_id, parent_id, text in rows:
+            control = controls[row_id] = json_codec.loads(text)
+            if row_id != control_id and parent_id in controls:
+                controls[parent_id].setdefault("controls", []).append(control)
+        return controls.get(control_id)
+
+    def find_controls(self, families=None, prop=None, param=None, links_to=None, text=None, enhancements=True):
+        """(id, title) of the controls matching every given criterion, in document order.
+
+        families: family (top-level group) ids; prop: a prop name or (name, value); param: a parameter
+        id the control defines or inserts in its prose; links_to: a control id it links to; text: an
+        FTS5 query over its parts' titles and prose.
+        """
+        where, args = [], []
+        if families:
+            where.append(f"c.family IN ({', '.join('?' * len(families))})")
+            args.extend(family.lower() for family in families)
+        if prop:
+            name, value = prop if isinstance(prop, (tuple, list)) else (prop, None)
+            where.append("EXISTS (SELECT 1 FROM props p WHERE p.owner_id = c.id AND p.name = ?"
+                         + (" AND p.value = ?)" if value is not None else ")"))
+            args.extend([name] if value is None else [name, value])
+        if param:
+            where.append("(EXISTS (SELECT 1 FROM params p WHERE p.id = ? AND p.owner_id = c.id)"
+                         " OR EXISTS (SELECT 1 FROM param_refs r WHERE r.param_id = ? AND r.owner_id = c.id))")
+            args.extend([param, param])
+        if links_to:
+            where.append("EXISTS (SELECT 1 FROM links l WHERE l.target = ? AND l.owner_id = c.id)")
+            args.append(links_to)
+        if text:
+            where.append("c.id IN (SELECT parts.owner_id FROM part_text JOIN parts ON parts.rowid = part_text.rowid"
+                         " WHERE part_text MATCH ?)")
+            args.append(text)
+        if not enhancements:
+            where.append("c.parent_id IS NULL")
+        query = "SELECT c.id, c.title FROM controls c"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        return self.connection.execute(query + " ORDER BY c.seq", args).fetchall()
+
+    def search(self, text, limit=50):
+        """Best full-text matches as (owner id, part name, snippet), most relevant first."""
+        return self.connection.execute("""
+            SELECT parts.owner_id, parts.name, snippet(part_text, 1, '[', ']', '...', 12)
+            FROM part_text JOIN parts ON parts.rowid = part_text.rowid
+            WHERE part_text MATCH ? ORDER BY rank LIMIT ?""", (text, limit)).fetchall()
+
+    # Write-back
+
+    def subtree(self, table, item_id):
+        """[(id,)] of a group or control and everything nested under it."""
+        return self.connection.execute(f"""
+            WITH RECURSIVE tree(id) AS (SELECT ? UNION ALL SELECT t.id FROM {table} t JOIN tree ON t.parent_id = tree.id)
+            SELECT id FROM tree""", (item_id,)).fetchall()
+
+    def remove_rows(self, table, ids):
+        for id_chunk in chunked([row_id for (row_id,) in ids]):
+            marks = ", ".join("?" * len(id_chunk))
+            self.connection.execute(f"DELETE FROM {table} WHERE id IN ({marks})", id_chunk)
+            for owned in OWNED_TABLES:
+                self.connection.execute(f"DELETE FROM {owned} WHERE owner_id IN ({marks})", id_chunk)
+
+    def put_control(self, control, group_id=None):
+        """Insert or replace a control and its enhancements, keeping its place in the document.
+
+        group_id is only needed for a control the database has not seen yet, or to move one to
+        the end of another group.
+        """
+        with self.connection:
+            row = self.connection.execute("SELECT group_id, parent_id, family, seq FROM controls WHERE id = ?",
+                                          (control["id"],)).fetchone()
+            last_seq = self.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM controls").fetchone()[0]
+            parent_id = family = None
+            if row:
+                self.remove_rows("controls", self.subtree("controls", control["id"]))
+            if row and group_id in (None, row[0]):
+                group_id, parent_id, family, seq = row
+            else:
+                seq = last_seq = last_seq + 1
+                if group_id:
+                    family = (self.connection.execute("SELECT family FROM groups WHERE id = ?", (group_id,)).fetchone()
+                              or [None])[0]
+            rows = CatalogRows(last_seq)  # Enhancements are renumbered after every existing row
+            rows.add_control(control, group_id, parent_id, family, seq)
+            rows.insert(self.connection)
+
+    def delete_control(self, control_id):
+        with self.connection:
+            self.remove_rows("controls", self.subtree("controls", control_id))
+
+    def put_group(self, group, parent_id=None):
+        """Insert or replace a group's own fields; its controls and subgroups are left as they are."""
+        with self.connection:
+            row = self.connection.execute("SELECT parent_id, family, seq FROM groups WHERE id = ?", (group["id"],)).fetchone()
+            family = None
+            if row:
+                parent_id, family, seq = row
+                self.remove_rows("groups", [(group["id"],)])
+            else:
+                seq = self.connection.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM groups").fetchone()[0]
+                if parent_id:
+                    family = (self.connection.execute("SELECT family FROM groups WHERE id = ?", (parent_id,)).fetchone()
+                              or [None])[0]
+            rows = CatalogRows()
+            rows.add_group({key: value for key, value in group.items() if key not in ("controls", "groups")},
+                           parent_id, family, seq)
+            rows.insert(self.connection)
+
+    def delete_group(self, group_id):
+        """Remove a group with its subgroups and every control in them."""
+        with self.connection:
+            groups = self.subtree("groups", group_id)
+            for id_chunk in chunked([row_id for (row_id,) in groups]):
+                marks = ", ".join("?" * len(id_chunk))
+                controls = self.connection.execute(f"SELECT id FROM controls WHERE group_id IN ({marks})", id_chunk).fetchall()
+                self.remove_rows("controls", controls)
+            self.remove_rows("groups", groups)
+
+    def put_shell(self, shell):
+        """Replace the catalog's own fields (uuid, metadata, params, back-matter)."""
+        with self.connection:
+            self.set_meta("shell", {key: value for key, value in shell.items() if key not in ("groups", "controls")})
+
+    def mark_synced(self, json_path):
+        """Record that the database matches json_path as it is now on disk (after a save)."""
+        with self.connection:
+            stamp = self.meta("source") or []
+            self.set_meta("source", source_stamp([json_path] + [path for path, _, _ in stamp[1:]]))
+
+def chunked(values, size=500):
+    """Split ids into chunks small enough for SQLite's bound-parameter limit."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def write_db(data, db_path, stamp=None):
+    """Import a catalog dict into a new database at db_path, replacing any existing one."""
+    temp_path = db_path + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(SCHEMA)
+        with connection:
+            rows = CatalogRows()
+            for group in data.get("groups") or []:
+                rows.add_group(group)
+            for control in data.get("controls") or []:
+                rows.add_control(control)
+            rows.insert(connection)
+            shell = {key: value for key, value in data.items() if key not in ("groups", "controls")}
+            for key, value in (("version", DB_VERSION), ("source", stamp), ("shell", shell)):
+                connection.execute("INSERT INTO meta VALUES (?, ?)", (key, json_codec.dumps(value, compact=True)))
+            connection.execute("INSERT INTO part_text (part_text) VALUES ('rebuild')")
+        connection.executescript(INDEXES)
+    finally:
+        connection.close()
+    os.replace(temp_path, db_path)
+
+def open_db(db_path, json_path=None):
+    """Open a database; returns None if it is missing, of another version, or stale for json_path."""
+    if not os.path.exists(db_path):
+        return None
+    try:
+        db = CatalogDB(db_path)
+        if db.meta("version") == DB_VERSION and (json_path is None or stamp_is_current(db.meta("source"), json_path)):
+            return db
+        db.close()
+    except sqlite3.DatabaseError:
+        pass
+    return None
+
+def build_db(json_path, db_path=None):
+    """Import an OSCAL catalog or profile into a database next to it, unless an up-to-date one exists."""
+    db_path = db_path or db_path_for(json_path)
+    db = open_db(db_path, json_path)
+    if db is not None:
+        db.close()
+        return db_path
+    resolver = ProfileResolver()
+    data = resolver.catalog_data(json_path)
+    sources = [json_path] + [path for path in resolver.documents if path != os.path.abspath(json_path)]
+    write_db(data, db_path, source_stamp(sources))
+    return db_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import an OSCAL catalog into SQLite and query its controls.")
+    parser.add_argument("path", help="Catalog or profile JSON; imported on first use and whenever it changes")
+    parser.add_argument("--db", help="Database file (default: next to the catalog, .sqlite)")
+    parser.add_argument("--family", action="append", help="Only controls in this family; repeat for several")
+    parser.add_argument("--prop", help="Only controls with this prop, as name or name=value")
+    parser.add_argument("--param", help="Only controls that define or insert this parameter")
+    parser.add_argument("--links-to", help="Only controls that link to this control")
+    parser.add_argument("--text", help="Only controls whose prose matches this full-text query")
+    parser.add_argument("--search", help="List the best full-text matches instead of controls")
+    args = parser.parse_args(argv)
+
+    try:
+        db = open_db(build_db(args.path, args.db))
+    except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+        print(f"Error: could not import {args.path}: {e}")
+        return 2
+    try:
+        if args.search:
+            for owner_id, name, snippet in db.search(args.search):
+                print(f"{owner_id}\t{name}\t{snippet}")
+            return 0
+        prop = tuple(args.prop.split("=", 1)) if args.prop and "=" in args.prop else args.prop
+        rows = db.find_controls(args.family, prop, args.param, args.links_to, args.text)
+    except sqlite3.OperationalError as e:  # Malformed full-text query
+        print(f"Error: {e}")
+        return 2
+    finally:
+        db.close()
+    for control_id, title in rows:
+        print(f"{control_id}\t{title}")
+    print(f"{len(rows)} controls")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
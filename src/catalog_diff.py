@@ -0,0 +1,233 @@
+# catalog_diff.py
+import argparse
+import hashlib
+import html
+import json
+import sys
+from bisect import bisect_left
+from collections import namedtuple
+from profile_resolver import catalog_data
+
+# Child lists whose entries have ids and are compared as elements in their own right
+KEYED_LISTS = {"groups": "group", "controls": "control", "params": "param", "parts": "part"}
+ROOT = ""
+
+Change = namedtuple("Change", "change kind id old_parent new_parent fields")
+
+class Element:
+    """One keyed node of a catalog: its own fields, ordered child keys and subtree hash."""
+    __slots__ = ("kind", "id", "parent", "fields", "children", "own_hash", "tree_hash")
+
+    def __init__(self, kind, id, parent, fields, children, own_hash, tree_hash):
+        self.kind = kind
+        self.id = id
+        self.parent = parent
+        self.fields = fields  # Everything except keyed children, e.g. title, props, prose, unkeyed parts
+        self.children = children
+        self.own_hash = own_hash
+        self.tree_hash = tree_hash
+
+def digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+def index_catalog(catalog):
+    """Flatten a catalog dict into {id: Element}, hashing bottom-up so each node is serialized once."""
+    elements = {}
+
+    def visit(obj, kind, key, parent):
+        fields, children = {}, []
+        for name, value in obj.items():
+            child_kind = KEYED_LISTS.get(name)
+            if child_kind and isinstance(value, list):
+                unkeyed = []
+                for child in value:
+                    if isinstance(child, dict) and child.get("id"):
+                        children.append(visit(child, child_kind, child["id"], key))
+                    else:
+                        unkeyed.append(child)
+                if unkeyed:
+                    fields[name] = unkeyed
+            else:
+                fields[name] = value
+        own_hash = digest(json.dumps(fields, sort_keys=True, separators=(",", ":")))
+        tree_hash = hashlib.blake2b(own_hash + b"".join(elements[child].tree_hash for child in children),
+                                    digest_size=16).digest()
+        elements[key] = Element(kind, key, parent, fields, children, own_hash, tree_hash)
+        return key
+
+    visit(catalog, "catalog", ROOT, None)
+    return elements
+
+def reordered(old_children, new_children):
+    """Children present under both parents whose relative order changed (outside the longest kept run)."""
+    new_positions = {key: position for position, key in enumerate(new_children)}
+    common = [key for key in old_children if key in new_positions]
+    # Longest increasing subsequence of new positions, in old order, stays put
+    tails, tail_keys, previous = [], [], {}
+    for key in common:
+        position = new_positions[key]
+        i = bisect_left(tails, position)
+        previous[key] = tail_keys[i - 1] if i else None
+        if i == len(tails):
+            tails.append(position)
+            tail_keys.append(key)
+        else:
+            tails[i] = position
+            tail_keys[i] = key
+    kept = set()
+    key = tail_keys[-1] if tail_keys else None
+    while key is not None:
+        kept.add(key)
+        key = previous[key]
+    return [key for key in common if key not in kept]
+
+def diff_catalogs(old_catalog, new_catalog):
+    """Compare two catalog dicts; returns Change tuples in the new catalog's document order."""
+    return diff_indexes(index_catalog(old_catalog), index_catalog(new_catalog))
+
+def diff_indexes(old, new):
+    """Compare two index_catalog results.
+
+    Elements are matched by id anywhere in the tree. Subtrees whose hashes match are skipped
+    without looking inside them, so comparing two revisions costs time proportional to what
+    changed plus one hashing pass over each document.
+    """
+    changes = []
+
+    def compare(key):
+        old_element, new_element = old[key], new[key]
+        if old_element.tree_hash == new_element.tree_hash:
+            return
+        if old_element.own_hash != new_element.own_hash:
+            fields = sorted(name for name in set(old_element.fields) | set(new_element.fields)
+                            if old_element.fields.get(name) != new_element.fields.get(name))
+            changes.append(Change("modified", new_element.kind, key, old_element.parent, new_element.parent, fields))
+        moved_here = set(reordered(old_element.children, new_element.children))
+        for child in new_element.children:
+            if child not in old:
+                changes.append(Change("added", new[child].kind, child, None, key, []))
+                add_subtree(child)
+                continue
+            if old[child].parent != key:
+                changes.append(Change("moved", new[child].kind, child, old[child].parent, key, []))
+            elif child in moved_here:
+                changes.append(Change("moved", new[child].kind, child, key, key, ["position"]))
+            compare(child)
+        for child in old_element.children:
+            if child not in new:
+                changes.append(Change("removed", old[child].kind, child, key, None, []))
+
+    def add_subtree(key):
+        # Descendants of an added element that already existed elsewhere were moved into it
+        for child in new[key].children:
+            if child in old:
+                changes.append(Change("moved", new[child].kind, child, old[child].parent, key, []))
+                compare(child)
+            else:
+                add_subtree(child)
+
+    compare(ROOT)
+    return changes
+
+def summarize(changes):
+    counts = {}
+    for change in changes:
+        counts[change.change] = counts.get(change.change, 0) + 1
+    return counts
+
+def change_details(change, old, new):
+    """Old and new values of a change's fields, for reports."""
+    old_fields = old[change.id].fields if change.id in old else {}
+    new_fields = new[change.id].fields if change.id in new else {}
+    return {name: {"old": old_fields.get(name), "new": new_fields.get(name)}
+            for name in change.fields if name != "position"}
+
+def diff_report_json(old_catalog, new_catalog, changes=None):
+    old, new = index_catalog(old_catalog), index_catalog(new_catalog)
+    changes = diff_indexes(old, new) if changes is None else changes
+    return {
+        "old": (old_catalog.get("metadata") or {}).get("title"),
+        "new": (new_catalog.get("metadata") or {}).get("title"),
+        "summary": summarize(changes),
+        "changes": [dict(change._asdict(), details=change_details(change, old, new)) for change in changes],
+    }
+
+def format_value(value):
+    if value is None:
+        return "<em>(none)</em>"
+    text = value if isinstance(value, str) else json.dumps(value, indent=1)
+    return f"<pre>{html.escape(text)}</pre>"
+
+def diff_report_html(old_catalog, new_catalog, changes=None):
+    """Render a self-contained HTML page listing the changes between two catalogs."""
+    report = diff_report_json(old_catalog, new_catalog, changes)
+    rows = []
+    for change in report["changes"]:
+        old_parent = html.escape(change["old_parent"] or "(catalog)")
+        new_parent = html.escape(change["new_parent"] or "(catalog)")
+        if change["change"] == "moved" and change["old_parent"] != change["new_parent"]:
+            where = f"{old_parent} &rarr; {new_parent}"
+        else:
+            where = old_parent if change["change"] == "removed" else new_parent
+        details = "".join(f"<tr><td>{html.escape(name)}</td><td>{format_value(values['old'])}</td>"
+                          f"<td>{format_value(values['new'])}</td></tr>" for name, values in change["details"].items())
+        fields = f"<table>{details}</table>" if details else html.escape(", ".join(change["fields"]))
+        rows.append(f'<tr class="{change["change"]}"><td>{change["change"]}</td><td>{change["kind"]}</td>'
+                    f'<td>{html.escape(change["id"] or "(catalog)")}</td><td>{where}</td><td>{fields}</td></tr>')
+    summary = ", ".join(f"{count} {name}" for name, count in report["summary"].items()) or "No changes"
+    return f"""<html>
+<head>
+<meta charset="utf-8">
+<title>Catalog changes</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 20px; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border: 1px solid #ddd; padding: 4px 8px; vertical-align: top; text-align: left; }}
+td table td {{ border: none; width: 33%; }}
+pre {{ white-space: pre-wrap; margin: 0; }}
+tr.added td:first-child {{ color: #2e7d32; }}
+tr.removed td:first-child {{ color: #c62828; }}
+tr.modified td:first-child {{ color: #ef6c00; }}
+tr.moved td:first-child {{ color: #1565c0; }}
+</style>
+</head>
+<body>
+<h1>Catalog changes</h1>
+<p>{html.escape(report["old"] or "")} &rarr; {html.escape(report["new"] or "")}</p>
+<p>{summary}</p>
+<table>
+<tr><th>Change</th><th>Kind</th><th>Id</th><th>Parent</th><th>Fields</th></tr>
+{"".join(rows)}
+</table>
+</body>
+</html>
+"""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two OSCAL catalog (or profile) revisions.")
+    parser.add_argument("old", help="Earlier catalog JSON")
+    parser.add_argument("new", help="Later catalog JSON")
+    parser.add_argument("--html", help="Write an HTML report to this file")
+    parser.add_argument("--json", help="Write a JSON report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        old_catalog, new_catalog = catalog_data(args.old), catalog_data(args.new)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: could not load catalogs: {e}")
+        return 2
+    changes = diff_catalogs(old_catalog, new_catalog)
+    if args.html:
+        with open(args.html, "w", encoding="utf-8") as f:
+            f.write(diff_report_html(old_catalog, new_catalog, changes))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(diff_report_json(old_catalog, new_catalog, changes), f, indent=2)
+    for change in changes:
+        fields = f" ({', '.join(change.fields)})" if change.fields else ""
+        print(f"{change.change:8} {change.kind:7} {change.id or '(catalog)'}{fields}")
+    print(", ".join(f"{count} {name}" for name, count in summarize(changes).items()) or "No changes")
+    return 1 if changes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,24 @@
-import json
+# catalog_exporter.py
+import argparse
+import hashlib
+import io
 import os
+import re
+import sys
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox
+import export_formats
+import json_codec
+from export_formats import BROTLI_AVAILABLE, ExportFormat, write_compressed, write_exports
+from oscal_handler import load_catalog_dict
+from compliance_summary import STATUSES
+
+# Line breaks and indentation in the generated markup, removed by minify_html
+MARKUP_BREAK_PATTERN = re.compile(r">\s*\n\s*<")
+LINE_BREAK_PATTERN = re.compile(r"\s*\n\s*")
+CSS_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.S)
+CSS_SPACE_PATTERN = re.compile(r"\s*([{};:,>])\s*")
 
 # Dictionary for control family summaries
 family_summaries = {
@@ -36,44 +53,340 @@ control_summaries = {
     # Add more summaries for other controls as needed
 }
 
+# Stylesheet and script of the exported page, inlined or written as content-hashed files
+PAGE_CSS = """body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }
+h1, h2, h3, h4 { color: #333; }
+h1 { border-bottom: 2px solid #333; padding-bottom: 5px; }
+h4 { margin-top: 20px; color: #555; }
+.group, .control { border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px; background-color: #f9f9f9; }
+.toc { list-style-type: none; padding-left: 0; }
+.toc li { margin: 5px 0; }
+details { margin: 10px 0; }
+summary { cursor: pointer; font-weight: bold; }
+ul { list-style-type: disc; margin-left: 20px; }
+p { margin: 5px 0; }
+a { color: #0066cc; text-decoration: none; }
+a:hover { text-decoration: underline; }
+.search-bar { margin: 20px 0; padding: 5px; width: 100%; }
+.filter-options { margin: 10px 0; }
+.compliance-dashboard { background: #e9f7ef; padding: 15px; border-radius: 5px; }
+.family-summary { border-collapse: collapse; margin-top: 10px; }
+.family-summary th, .family-summary td { border: 1px solid #ccc; padding: 2px 8px; text-align: right; }
+.family-summary td:first-child { text-align: left; }
+.implementation-guidance { background: #f0f8ff; padding: 10px; border-radius: 5px; }
+.status-select { margin-left: 10px; }
+::highlight(search) { background-color: #ffeb3b; }
+.toc-sidebar {
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 25%;
+    height: 100%;
+    background-color: #f9f9f9;
+    overflow-y: auto;
+    transition: width 0.3s;
+    z-index: 1000;
+}
+.main-content {
+    margin-left: 25%;
+    transition: margin-left 0.3s;
+}
+.toc-sidebar.collapsed {
+    width: 0;
+}
+.main-content.expanded {
+    margin-left: 0;
+}
+#toggleToc {
+    position: fixed;
+    top: 10px;
+    left: 10px;
+    z-index: 1001;
+    background-color: #0066cc;
+    color: white;
+    border: none;
+    padding: 5px 10px;
+    cursor: pointer;
+}
+#toggleToc:hover {
+    background-color: #0056b3;
+}
+"""
+
+PAGE_JS = """// Client-side state: one record per control, built from the JSON model at the end of the page
+var state = { controls: [], byId: {}, family: 'all', status: 'all', search: '', storageKey: null, pending: false };
+
+function loadSavedStatuses() {
+    try {
+        return JSON.parse(localStorage.getItem(state.storageKey)) || {};
+    } catch (e) {
+        return {};
+    }
+}
+
+// Only statuses changed from the exported ones are stored, per catalog
+function saveStatuses() {
+    var saved = {};
+    state.controls.forEach(function(control) {
+        if (control.status !== control.exported) {
+            saved[control.id] = control.status;
+        }
+    });
+    try {
+        localStorage.setItem(state.storageKey, JSON.stringify(saved));
+    } catch (e) {
+        // Storage disabled or full: changes last for this visit only
+    }
+}
+
+function initState() {
+    var model = JSON.parse(document.getElementById('controlState').textContent);
+    state.storageKey = 'oscal-status:' + model.catalog;
+    var saved = loadSavedStatuses();
+    model.controls.forEach(function(row) {
+        var element = document.getElementById(row[0]);
+        if (!element) {
+            return;
+        }
+        var control = { id: row[0], family: row[1], exported: row[2], status: saved[row[0]] || row[2],
+                        element: element, select: element.querySelector('.status-select'), text: null, visible: true };
+        if (control.select && control.select.value !== control.status) {
+            control.select.value = control.status;
+        }
+        state.controls.push(control);
+        state.byId[control.id] = control;
+    });
+}
+
+// Coalesce filter changes and keystrokes into one pass per animation frame
+function scheduleFilter() {
+    if (!state.pending) {
+        state.pending = true;
+        requestAnimationFrame(applyFilters);
+    }
+}
+
+// Family, status and search are applied together; only rows whose visibility changed are written
+function applyFilters() {
+    state.pending = false;
+    var query = state.search.toLowerCase();
+    var changed = [];
+    var matches = [];
+    state.controls.forEach(function(control) {
+        var visible = (state.family === 'all' || control.family === state.family)
+            && (state.status === 'all' || control.status === state.status);
+        if (visible && query) {
+            if (control.text === null) {
+                control.text = control.element.textContent.toLowerCase();
+            }
+            visible = control.text.indexOf(query) !== -1;
+            if (visible) {
+                matches.push(control);
+            }
+        }
+        if (visible !== control.visible) {
+            control.visible = visible;
+            changed.push(control);
+        }
+    });
+    changed.forEach(function(control) {
+        control.element.style.display = control.visible ? '' : 'none';
+    });
+    highlightMatches(matches, query);
+}
+
+// Highlight search hits with the CSS Custom Highlight API, leaving the markup untouched
+function highlightMatches(matches, query) {
+    if (!window.CSS || !CSS.highlights || typeof Highlight === 'undefined') {
+        return;
+    }
+    CSS.highlights.delete('search');
+    if (!query) {
+        return;
+    }
+    var highlight = new Highlight();
+    matches.forEach(function(control) {
+        var walker = document.createTreeWalker(control.element, NodeFilter.SHOW_TEXT);
+        for (var node = walker.nextNode(); node; node = walker.nextNode()) {
+            var text = node.nodeValue.toLowerCase();
+            for (var at = text.indexOf(query); at !== -1; at = text.indexOf(query, at + query.length)) {
+                var range = new Range();
+                range.setStart(node, at);
+                range.setEnd(node, at + query.length);
+                highlight.add(range);
+            }
+        }
+    });
+    CSS.highlights.set('search', highlight);
+}
+
+function searchControls() {
+    state.search = document.getElementById('searchInput').value;
+    scheduleFilter();
+}
+
+function filterControls() {
+    state.family = document.getElementById('familyFilter').value;
+    scheduleFilter();
+}
+
+function filterByStatus() {
+    state.status = document.getElementById('statusFilter').value;
+    scheduleFilter();
+}
+
+function updateStatus(select, controlId) {
+    var control = state.byId[controlId];
+    if (!control) {
+        return;
+    }
+    control.status = select.value;
+    saveStatuses();
+    if (state.status !== 'all') {
+        scheduleFilter();
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    var toggleButton = document.getElementById('toggleToc');
+    if (toggleButton) {
+        toggleButton.addEventListener('click', function() {
+            var toc = document.getElementById('tocSidebar');
+            var content = document.getElementById('mainContent');
+            if (toc.classList.contains('collapsed')) {
+                toc.classList.remove('collapsed');
+                content.classList.remove('expanded');
+            } else {
+                toc.classList.add('collapsed');
+                content.classList.add('expanded');
+            }
+        });
+    }
+    // One listener for every status select instead of a handler per control
+    document.getElementById('mainContent').addEventListener('change', function(event) {
+        if (event.target.classList.contains('status-select')) {
+            updateStatus(event.target, event.target.closest('.control').id);
+        }
+    });
+    initState();
+    // Pick up filter values the browser restored on reload
+    state.search = document.getElementById('searchInput').value;
+    state.family = document.getElementById('familyFilter').value;
+    state.status = document.getElementById('statusFilter').value;
+    scheduleFilter();
+});
+"""
+
+# Page shell around the rendered catalog; the body is streamed between page_head() and HTML_TAIL
+HTML_TAIL = """</body>
+</html>
+"""
+
+def page_head(assets=None, minify=False):
+    """The page up to <body>; with assets ({"css": url, "js": url}) the stylesheet and script are linked, not inlined."""
+    if assets:
+        resources = f'<link rel="stylesheet" href="{assets["css"]}">\n<script src="{assets["js"]}"></script>'
+    else:
+        css, js = (minify_css(PAGE_CSS), minify_js(PAGE_JS)) if minify else (PAGE_CSS, PAGE_JS)
+        resources = f'<style>\n{css.strip()}\n</style>\n<script>\n{js.strip()}\n</script>'
+    return f'<html>\n<head>\n<title>OSCAL Control Catalog Reference</title>\n{resources}\n</head>\n<body>\n'
+
+def minify_html(html):
+    """Drop line breaks and indentation between tags; any other run of whitespace with a line break becomes one space."""
+    return LINE_BREAK_PATTERN.sub(' ', MARKUP_BREAK_PATTERN.sub('><', html))
+
+def minify_css(css):
+    return CSS_SPACE_PATTERN.sub(r'\1', ' '.join(CSS_COMMENT_PATTERN.sub('', css).split()))
+
+def minify_js(js):
+    """Strip indentation, blank lines and whole-line comments; line breaks are kept so no statement runs together."""
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+def write_page_assets(directory, minify=False, compress=()):
+    """Write the page stylesheet and script as content-hashed files in directory; returns their names.
+
+    A name only changes with its content, so the files can be served with a far-future cache
+    lifetime and shared by every page exported to the directory. Existing files are left alone.
+    """
+    assets = {}
+    for kind, content in (("css", minify_css(PAGE_CSS) if minify else PAGE_CSS), ("js", minify_js(PAGE_JS) if minify else PAGE_JS)):
+        data = content.encode('utf-8')
+        name = f'oscal-catalog.{hashlib.sha256(data).hexdigest()[:16]}.{kind}'
+        path = os.path.join(directory, name)
+        if not all(os.path.exists(path + suffix) for suffix in [''] + ['.' + method for method in compress]):
+            write_compressed(path, data, compress)
+        assets[kind] = name
+    return assets
+
 def load_catalog(file_path):
-    """Load the OSCAL control catalog from a JSON file."""
+    """Load the OSCAL control catalog from a JSON file, resolving profiles into their catalog."""
     print(f"Loading catalog from {file_path}")
-    with open(file_path, 'r') as f:
-        return json.load(f)
-
-def catalog_to_html(catalog):
-    """Generate an enhanced HTML reference for the OSCAL control catalog."""
-    print("Running catalog_to_html - Version 2023-10-20 Enhanced with Collapsible Sidebar")
-    html = '<h1>Control Catalog Reference</h1>'
-    catalog_title = catalog['catalog']['metadata'].get('title', 'Unnamed Catalog')
-    html += f'<h2>{catalog_title}</h2>'
-
-    # Compliance Dashboard (placeholder data)
-    controls = catalog['catalog'].get('controls', [])
-    groups = catalog['catalog'].get('groups', [])
-    total_controls = sum(len(group.get('controls', [])) for group in groups) + len(controls)
-    html += f'''
-    <div class="compliance-dashboard">
-        <h2>Compliance Dashboard</h2>
-        <p>Total Controls: {total_controls}</p>
-        <p>Implemented: 0 (placeholder)</p>
-        <p>In Progress: 0 (placeholder)</p>
-        <p>Not Applicable: 0 (placeholder)</p>
-    </div>
-    '''
+    return {"catalog": load_catalog_dict(file_path)}
 
-    # Search and Filter Options
-    html += '''
-    <input type="text" id="searchInput" class="search-bar" placeholder="Search controls..." onkeyup="searchControls()">
+def dashboard_html(summary):
+    """Render the compliance dashboard: catalog-wide counts and a per-family breakdown."""
+    total = summary.total
+    html = '<div class="compliance-dashboard">\n<h2>Compliance Dashboard</h2>'
+    html += f'<p>Total Controls: {total.controls} ({total.enhancements} enhancements, {total.params} parameters)</p>'
+    for status, label in STATUSES.items():
+        html += f'<p>{label}: {total.status_count(status)}</p>'
+    html += '<table class="family-summary"><tr><th>Family</th><th>Controls</th><th>Enhancements</th><th>Parameters</th>'
+    html += ''.join(f'<th>{label}</th>' for label in STATUSES.values()) + '</tr>'
+    for family in summary.rows():
+        html += f'<tr><td>{family.title} ({family.id})</td>' if family is not total else '<tr><td><strong>Total</strong></td>'
+        html += f'<td>{family.controls}</td><td>{family.enhancements}</td><td>{family.params}</td>'
+        html += ''.join(f'<td>{family.status_count(status)}</td>' for status in STATUSES) + '</tr>'
+    html += '</table>\n</div>'
+    return html
+
+def catalog_to_html(catalog, summary=None, workers=None, use_processes=None):
+    """Generate an enhanced HTML reference for the OSCAL control catalog.
+
+    summary is a ComplianceSummary of the catalog; one is computed when not given.
+    """
+    html = io.StringIO()
+    for fragments in export_formats.iter_export(catalog['catalog'], [HtmlFormat(page=False)], summary, workers, use_processes):
+        html.write(fragments[0])
+    return html.getvalue()
+
+class HtmlFormat(ExportFormat):
+    """The browsable HTML reference; page=False leaves out the <head> and closing tags.
+
+    minify strips the markup's line breaks and indentation; assets links the stylesheet and
+    script from write_page_assets instead of inlining them.
+    """
+    extension = ".html"
+
+    def __init__(self, page=True, minify=False, assets=None):
+        self.page = page
+        self.minify = minify
+        self.assets = assets
+
+    def markup(self, html):
+        return minify_html(html) if self.minify else html
+
+    def begin(self, catalog, summary):
+        html = '<h1>Control Catalog Reference</h1>'
+        catalog_title = catalog['metadata'].get('title', 'Unnamed Catalog')
+        html += f'<h2>{catalog_title}</h2>'
+
+        # Compliance Dashboard
+        controls = catalog.get('controls', [])
+        groups = catalog.get('groups', [])
+        html += dashboard_html(summary)
+
+        # Search and Filter Options
+        html += '''
+    <input type="text" id="searchInput" class="search-bar" placeholder="Search controls..." oninput="searchControls()">
     <div class="filter-options">
         <label>Filter by Family: </label>
         <select id="familyFilter" onchange="filterControls()">
             <option value="all">All</option>
     '''
-    for group in groups:
-        html += f'<option value="{group["id"]}">{group["title"]} ({group["id"]})</option>'
-    html += '''
+        for group in groups:
+            html += f'<option value="{group["id"]}">{group["title"]} ({group["id"]})</option>'
+        html += '''
         </select>
         <label>Filter by Status: </label>
         <select id="statusFilter" onchange="filterByStatus()">
@@ -86,39 +399,61 @@ def catalog_to_html(catalog):
     </div>
     '''
 
-    # Table of Contents (Collapsible Sidebar)
-    html += '<button id="toggleToc">☰ TOC</button>'
-    html += '<div id="tocSidebar" class="toc-sidebar collapsed">'
-    html += '<h3>Table of Contents</h3><ul class="toc">'
-    for group in groups:
-        html += f'<li><a href="#group-{group["id"]}">{group["title"]} ({group["id"]})</a></li>'
-        for control in group.get('controls', []):
-            html += f'<li style="margin-left: 20px;"><a href="#{control["id"]}">{control["title"]} ({control["id"]})</a></li>'
-    for control in controls:
-        html += f'<li><a href="#{control["id"]}">{control["title"]} ({control["id"]})</a></li>'
-    html += '</ul></div>'
-
-    # Main Content
-    html += '<div id="mainContent" class="main-content expanded">'
-    if groups:
-        html += '<h3>Control Groups</h3>'
+        # Table of Contents (Collapsible Sidebar)
+        html += '<button id="toggleToc">☰ TOC</button>'
+        html += '<div id="tocSidebar" class="toc-sidebar collapsed">'
+        html += '<h3>Table of Contents</h3><ul class="toc">'
         for group in groups:
-            html += f'<div class="group" id="group-{group["id"]}">'
-            html += f'<h4>{group["title"]} ({group["id"]})</h4>'
-            if group["id"] in family_summaries:
-                html += f'<p>{family_summaries[group["id"]]}</p>'
-            if 'class' in group:
-                html += f'<p>Class: {group["class"]}</p>'
-            html += control_details(group.get('controls', []))
-            html += '</div>'
-    html += '<h3>Controls</h3>'
-    html += control_details(controls)
-    html += '</div>'  # Close mainContent
-    return html
+            html += f'<li><a href="#group-{group["id"]}">{group["title"]} ({group["id"]})</a></li>'
+            for control in group.get('controls', []):
+                html += f'<li style="margin-left: 20px;"><a href="#{control["id"]}">{control["title"]} ({control["id"]})</a></li>'
+        for control in controls:
+            html += f'<li><a href="#{control["id"]}">{control["title"]} ({control["id"]})</a></li>'
+        html += '</ul></div>'
+
+        # Main Content
+        html += '<div id="mainContent" class="main-content expanded">'
+        if groups:
+            html += '<h3>Control Groups</h3>'
+        return (page_head(self.assets, self.minify) if self.page else '') + self.markup(html)
+
+    def section(self, group, depth):
+        html = f'<div class="group" id="group-{group["id"]}">'
+        html += f'<h4>{group["title"]} ({group["id"]})</h4>'
+        if group["id"] in family_summaries:
+            html += f'<p>{family_summaries[group["id"]]}</p>'
+        if 'class' in group:
+            html += f'<p>Class: {group["class"]}</p>'
+        return self.markup(html)
+
+    def row(self, control, record, depth):
+        return self.markup(control_html(control, record["status"]))
+
+    def end_section(self, group, depth):
+        return '</div>'
+
+    def top_level(self, catalog):
+        return '<h3>Controls</h3>'
+
+    def end(self, catalog, summary):
+        html = '</div>'  # Close mainContent
+        html += state_script(catalog, summary)
+        return html + (self.markup(HTML_TAIL) if self.page else '')
+
+def state_script(catalog, summary):
+    """The page's client-side state model: [id, family, status] for every control, taken from the summary.
+
+    Saved statuses are keyed on the title and version rather than the uuid, which a resolved profile
+    gets afresh on every resolution (and OSCAL documents change on every revision).
+    """
+    metadata = catalog.get("metadata") or {}
+    model = {"catalog": f"{metadata.get('title', '')}|{metadata.get('version', '')}",
+             "controls": [[control_id, record[0], record[1]] for control_id, record in summary.controls.items()]}
+    data = json_codec.dumps(model, compact=True).replace("</", "<\\/")
+    return f'<script id="controlState" type="application/json">{data}</script>'
 
 def render_part(part, depth=0):
     """Recursively render a part and its nested parts with simplified assessment methods."""
-    print(f"Rendering part: {part.get('name', 'Unnamed')} (Depth: {depth})")
     part_id = part.get("id", "N/A")
     html = f'<li><strong>{part["name"]}</strong> (ID: {part_id})'
     if 'prose' in part:
@@ -150,233 +485,130 @@ def render_part(part, depth=0):
     html += '</li>'
     return html
 
-def control_details(controls):
-    """Generate HTML for a list of controls with enhancements."""
+def control_details(controls, summary=None):
+    """Generate HTML for a list of controls; statuses come from summary when given."""
     html = ''
     for control in controls:
         if "id" not in control:
             print(f"Warning: Control missing 'id' field: {control}")
             continue
-        control_id = control["id"]
-        print(f"Generating control div for: {control_id}")
-        html += f'<div class="control" id="{control_id}" data-family="{control_id.split("-")[0]}" data-original-html="">'
-        html += f'<h4 title="{control["title"]}">{control["title"]} ({control_id})</h4>'
-        if control_id in control_summaries:
-            html += f'<p>{control_summaries[control_id]}</p>'
-        if 'class' in control:
-            html += f'<p><strong>Class:</strong> {control["class"]}</p>'
-
-        # Properties
-        if 'props' in control:
-            html += '<p><strong>Properties:</strong></p><ul>'
-            for prop in control['props']:
-                html += f'<li>{prop["name"]}: {prop["value"]}'
-                if 'class' in prop:
-                    html += f' (class: {prop["class"]})'
-                html += '</li>'
-            html += '</ul>'
+        html += control_html(control, summary.status(control["id"]) if summary else None)
+    return html
 
-        # Implementation Guidance with Example
-        html += '''
-        <p><strong>Implementation Guidance:</strong></p>
-        <div class="implementation-guidance">
-            <p>Example: For access control, configure role-based access using a tool like AWS IAM or Active Directory.</p>
-        </div>
-        '''
-
-        # Status Tracking
-        html += f'''
-        <p><strong>Status:</strong></p>
-        <select class="status-select" onchange="updateStatus(this, '{control_id}')">
-            <option value="not-implemented">Not Implemented</option>
-            <option value="in-progress">In Progress</option>
-            <option value="implemented">Implemented</option>
-            <option value="not-applicable">Not Applicable</option>
-        </select>
-        '''
-
-        # Parameters and Parts
-        if 'params' in control:
-            html += '<details><summary><strong>Parameters</strong></summary><ul>'
-            for param in control['params']:
-                html += f'<li>ID: {param["id"]}'
-                if 'label' in param:
-                    html += f' - Label: {param["label"]}'
-                html += '</li>'
-            html += '</ul></details>'
-        
-        if 'parts' in control:
-            html += '<details><summary><strong>Details</strong></summary><ul>'
-            for part in control['parts']:
-                html += render_part(part)
-            html += '</ul></details>'
-
-        # Related Controls
-        if 'links' in control:
-            related_controls_html = '<p><strong>Related Controls:</strong> '
-            related_controls_html += ', '.join(f'<a href="#{link["href"].lstrip("#")}">{link["href"]}</a>' for link in control['links'] if link.get('rel') == 'related')
-            html += related_controls_html + '</p>'
-
-        html += '</div>'
+def control_html(control, status=None):
+    """Generate the HTML div of one control with its status preselected."""
+    control_id = control["id"]
+    html = f'<div class="control" id="{control_id}" data-family="{control_id.split("-")[0]}">'
+    html += f'<h4 title="{control["title"]}">{control["title"]} ({control_id})</h4>'
+    if control_id in control_summaries:
+        html += f'<p>{control_summaries[control_id]}</p>'
+    if 'class' in control:
+        html += f'<p><strong>Class:</strong> {control["class"]}</p>'
+
+    # Properties
+    if 'props' in control:
+        html += '<p><strong>Properties:</strong></p><ul>'
+        for prop in control['props']:
+            html += f'<li>{prop["name"]}: {prop["value"]}'
+            if 'class' in prop:
+                html += f' (class: {prop["class"]})'
+            html += '</li>'
+        html += '</ul>'
+
+    # Implementation Guidance with Example
+    html += '''
+    <p><strong>Implementation Guidance:</strong></p>
+    <div class="implementation-guidance">
+        <p>Example: For access control, configure role-based access using a tool like AWS IAM or Active Directory.</p>
+    </div>
+    '''
+
+    # Status Tracking
+    html += f'''
+    <p><strong>Status:</strong></p>
+    <select class="status-select">
+    '''
+    for value in ("not-implemented", "in-progress", "implemented", "not-applicable"):
+        selected = ' selected' if value == status else ''
+        html += f'<option value="{value}"{selected}>{STATUSES[value]}</option>'
+    html += '</select>'
+
+    # Parameters and Parts
+    if 'params' in control:
+        html += '<details><summary><strong>Parameters</strong></summary><ul>'
+        for param in control['params']:
+            html += f'<li>ID: {param["id"]}'
+            if 'label' in param:
+                html += f' - Label: {param["label"]}'
+            html += '</li>'
+        html += '</ul></details>'
+    
+    if 'parts' in control:
+        html += '<details><summary><strong>Details</strong></summary><ul>'
+        for part in control['parts']:
+            html += render_part(part)
+        html += '</ul></details>'
+
+    # Related Controls
+    if 'links' in control:
+        related_controls_html = '<p><strong>Related Controls:</strong> '
+        related_controls_html += ', '.join(f'<a href="#{link["href"].lstrip("#")}">{link["href"]}</a>' for link in control['links'] if link.get('rel') == 'related')
+        html += related_controls_html + '</p>'
+
+    html += '</div>'
     return html
 
+# Export formats by name; every requested format is written in the same pass over the catalog
+FORMATS = {"html": HtmlFormat, **export_formats.FORMATS}
+
+def output_paths(base, formats, minify=False, assets=None):
+    """Map each output file, named after base with the format's extension, to its format."""
+    base = os.path.splitext(base)[0]
+    outputs = {}
+    for name in formats:
+        export_format = HtmlFormat(minify=minify, assets=assets) if name == "html" else FORMATS[name]()
+        outputs[base + export_format.extension] = export_format
+    return outputs
+
+def format_for_path(path, default="html"):
+    extension = os.path.splitext(path)[1].lower()
+    return next((name for name, export_format in FORMATS.items() if export_format.extension == extension), default)
+
+def export_catalog(file_path, formats=("html",), output_base=None, workers=None, use_processes=None, progress=None,
+                   minify=False, shared_assets=False, compress=()):
+    """Export a catalog or profile file to each named format next to it (or next to output_base).
+
+    minify and shared_assets apply to HTML; compress names the precompressed siblings ("gz", "br")
+    streamed next to each output. Returns the paths written.
+    """
+    catalog = load_catalog(file_path)['catalog']
+    base = output_base or file_path
+    assets = None
+    if shared_assets and "html" in formats:
+        assets = write_page_assets(os.path.dirname(os.path.abspath(base)), minify, compress)
+    outputs = output_paths(base, formats, minify, assets)
+    return write_exports(catalog, outputs, workers=workers, use_processes=use_processes, progress=progress, compress=compress)
+
+def export_snapshot(snapshot, formats, output_base, events, summary=None, workers=None):
+    """Process entry point for exports started from the GUI.
+
+    Decodes a workspace CatalogSnapshot, exports it and reports on the events queue:
+    ("progress", groups done, total groups) after each group, then ("done", paths) or ("error", message).
+    """
+    try:
+        outputs = output_paths(output_base, formats)
+        paths = write_exports(snapshot.to_dict(), outputs, summary, workers,
+                              progress=lambda done, total: events.put(("progress", done, total)))
+        events.put(("done", paths))
+    except Exception as e:
+        events.put(("error", str(e)))
+
 def select_file():
     """Open file dialog to select the OSCAL catalog JSON file and process it."""
     file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
     if file_path:
         try:
-            catalog = load_catalog(file_path)
-            html_content = catalog_to_html(catalog)
-            output_file = os.path.splitext(file_path)[0] + '.html'
-            with open(output_file, 'w') as f:
-                f.write(f"""
-<html>
-<head>
-<title>OSCAL Control Catalog Reference</title>
-<style>
-body {{ font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }}
-h1, h2, h3, h4 {{ color: #333; }}
-h1 {{ border-bottom: 2px solid #333; padding-bottom: 5px; }}
-h4 {{ margin-top: 20px; color: #555; }}
-.group, .control {{ border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px; background-color: #f9f9f9; }}
-.toc {{ list-style-type: none; padding-left: 0; }}
-.toc li {{ margin: 5px 0; }}
-details {{ margin: 10px 0; }}
-summary {{ cursor: pointer; font-weight: bold; }}
-ul {{ list-style-type: disc; margin-left: 20px; }}
-p {{ margin: 5px 0; }}
-a {{ color: #0066cc; text-decoration: none; }}
-a:hover {{ text-decoration: underline; }}
-.search-bar {{ margin: 20px 0; padding: 5px; width: 100%; }}
-.filter-options {{ margin: 10px 0; }}
-.compliance-dashboard {{ background: #e9f7ef; padding: 15px; border-radius: 5px; }}
-.implementation-guidance {{ background: #f0f8ff; padding: 10px; border-radius: 5px; }}
-.status-select {{ margin-left: 10px; }}
-.toc-sidebar {{
-    position: fixed;
-    top: 0;
-    left: 0;
-    width: 25%;
-    height: 100%;
-    background-color: #f9f9f9;
-    overflow-y: auto;
-    transition: width 0.3s;
-    z-index: 1000;
-}}
-.main-content {{
-    margin-left: 25%;
-    transition: margin-left 0.3s;
-}}
-.toc-sidebar.collapsed {{
-    width: 0;
-}}
-.main-content.expanded {{
-    margin-left: 0;
-}}
-#toggleToc {{
-    position: fixed;
-    top: 10px;
-    left: 10px;
-    z-index: 1001;
-    background-color: #0066cc;
-    color: white;
-    border: none;
-    padding: 5px 10px;
-    cursor: pointer;
-}}
-#toggleToc:hover {{
-    background-color: #0056b3;
-}}
-</style>
-<script>
-// Function to highlight text in text nodes only
-function highlightText(node, searchText, highlightClass) {{
-    if (node.nodeType === 3) {{ // Text node
-        const text = node.nodeValue;
-        const regex = new RegExp(searchText, 'gi');
-        if (text.toLowerCase().includes(searchText.toLowerCase())) {{
-            const span = document.createElement('span');
-            span.innerHTML = text.replace(regex, match => `<span class="${{highlightClass}}">${{match}}</span>`);
-            node.parentNode.replaceChild(span, node);
-        }}
-    }} else if (node.nodeType === 1 && node.nodeName !== 'SCRIPT' && node.nodeName !== 'STYLE') {{ // Element node
-        for (let i = 0; i < node.childNodes.length; i++) {{
-            highlightText(node.childNodes[i], searchText, highlightClass);
-        }}
-    }}
-}}
-
-// Function to restore original HTML and apply highlighting
-function searchControls() {{
-    var input = document.getElementById('searchInput').value;
-    var controls = document.querySelectorAll('.control');
-    
-    controls.forEach(function(control) {{
-        // Restore original HTML if stored
-        if (!control.dataset.originalHtml) {{
-            control.dataset.originalHtml = control.innerHTML;
-        }} else {{
-            control.innerHTML = control.dataset.originalHtml;
-        }}
-
-        var text = control.textContent.toLowerCase();
-        if (input && text.includes(input.toLowerCase())) {{
-            control.style.display = '';
-            highlightText(control, input, 'highlight');
-        }} else {{
-            control.style.display = input ? 'none' : '';
-        }}
-    }});
-}}
-
-function filterControls() {{
-    var family = document.getElementById('familyFilter').value;
-    var controls = document.querySelectorAll('.control');
-    controls.forEach(function(control) {{
-        var controlFamily = control.getAttribute('data-family');
-        control.style.display = (family === 'all' || controlFamily === family) ? '' : 'none';
-    }});
-}}
-
-function filterByStatus() {{
-    var status = document.getElementById('statusFilter').value;
-    var controls = document.querySelectorAll('.control');
-    controls.forEach(function(control) {{
-        var controlStatus = control.querySelector('.status-select').value;
-        control.style.display = (status === 'all' || controlStatus === status) ? '' : 'none';
-    }});
-}}
-
-function updateStatus(select, controlId) {{
-    console.log(`Status of ${{controlId}} updated to: ${{select.value}}`);
-    // Future: Save status to local storage or backend
-}}
-
-document.addEventListener('DOMContentLoaded', function() {{
-    var toggleButton = document.getElementById('toggleToc');
-    if (toggleButton) {{
-        toggleButton.addEventListener('click', function() {{
-            var toc = document.getElementById('tocSidebar');
-            var content = document.getElementById('mainContent');
-            if (toc.classList.contains('collapsed')) {{
-                toc.classList.remove('collapsed');
-                content.classList.remove('expanded');
-            }} else {{
-                toc.classList.add('collapsed');
-                content.classList.add('expanded');
-            }}
-        }});
-    }}
-    // Initial search to apply any default highlighting
-    searchControls();
-}});
-</script>
-</head>
-<body>
-{html_content}
-</body>
-</html>
-""")
+            output_file = export_catalog(file_path)[0]
             messagebox.showinfo("Success", f"HTML exported to {output_file}")
         except Exception as e:
             import traceback
@@ -384,9 +616,45 @@ document.addEventListener('DOMContentLoaded', function() {{
             traceback.print_exc()
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-# Create the main window
-root = tk.Tk()
-root.title("OSCAL Catalog Exporter")
-select_button = tk.Button(root, text="Select OSCAL Catalog JSON", command=select_file)
-select_button.pack(pady=20)
-root.mainloop()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export an OSCAL catalog or profile to HTML, CSV, Markdown, JSON Lines or Excel.")
+    parser.add_argument("path", nargs="?", help="Catalog or profile JSON (opens a file picker when omitted)")
+    parser.add_argument("-f", "--format", action="append", choices=sorted(FORMATS),
+                        help="Output format; repeat for several (default: html)")
+    parser.add_argument("-o", "--output", help="Output file name; the extension is set per format (default: next to the input)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--serial", action="store_true", help="Render every group in this process")
+    parser.add_argument("--parallel", action="store_true", help="Always render groups in worker processes")
+    parser.add_argument("--minify", action="store_true", help="Strip whitespace from the HTML, CSS and JS")
+    parser.add_argument("--shared-assets", action="store_true",
+                        help="Write the HTML's CSS and JS as content-hashed files beside it instead of inlining them")
+    parser.add_argument("--precompress", action="store_true",
+                        help="Also write .gz and .br (when brotli is installed) copies of every text output")
+    args = parser.parse_args(argv)
+
+    if args.path is None:
+        # Create the main window
+        root = tk.Tk()
+        root.title("OSCAL Catalog Exporter")
+        select_button = tk.Button(root, text="Select OSCAL Catalog JSON", command=select_file)
+        select_button.pack(pady=20)
+        root.mainloop()
+        return 0
+    use_processes = False if args.serial else True if args.parallel else None
+    compress = ()
+    if args.precompress:
+        compress = ("gz", "br") if BROTLI_AVAILABLE else ("gz",)
+        if not BROTLI_AVAILABLE:
+            print("Warning: brotli is not installed; writing .gz copies only.")
+    try:
+        start = time.perf_counter()
+        output_files = export_catalog(args.path, args.format or ["html"], args.output, args.workers, use_processes,
+                                      minify=args.minify, shared_assets=args.shared_assets, compress=compress)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: could not export {args.path}: {e}")
+        return 2
+    print(f"Exported {', '.join(output_files)} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,12 @@
 # catalog_manager.py
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from oscal_pydantic.catalog import Catalog, ControlGroup, Control
 import os
+import multiprocessing
+import queue
+import sqlite3
+import threading
 from PIL import Image, ImageTk
 try:
     import darkdetect  # Optional, for better theme detection
@@ -10,16 +14,55 @@ try:
 except ImportError:
     DARKDETECT_AVAILABLE = False
 from details_pane import DetailsPane
+from detail_cache import DetailCache
+from prefetcher import Prefetcher
+from navigation_history import NavigationHistory
+from search_index import SearchIndex
+from virtual_tree import VirtualTree
+from workspace import Workspace, model_size, format_bytes
+from catalog_validator import validate, group_by_item
+from compact_catalog import catalog_dict
+from diff_view import DiffWindow
+from compliance_summary import ComplianceSummary
+from compliance_view import ComplianceWindow
+from catalog_exporter import FORMATS, export_snapshot, format_for_path
+from profile_resolver import catalog_data
 from utils import save_catalog
+from oscal_handler import open_catalog_db
+from json_stream import iter_json
+import json_codec
+
+DEFAULT_CATALOG_PATH = "data/NIST_SP-800-53_rev5_catalog.json"
+
+# Catalogs with more tree nodes than this are shown in a VirtualTree instead of a ttk.Treeview
+VIRTUAL_TREE_THRESHOLD = 5000
 
 class CatalogManager:
-    """Main GUI class for managing the OSCAL catalog with dynamic theming."""
-    def __init__(self, catalog: Catalog, root: tk.Tk):
-        self.catalog = catalog
+    """Main GUI class for managing the OSCAL catalog with dynamic theming.
+
+    Accepts a single Catalog or a Workspace of several catalogs; with a workspace every
+    catalog gets its own top-level tree node and edits apply to the catalog of the selection.
+    """
+    def __init__(self, catalog, root: tk.Tk, detail_cache_size=64, history_size=200, virtual_tree=None):
+        if isinstance(catalog, Workspace):
+            self.workspace = catalog
+        else:
+            self.workspace = Workspace()
+            self.workspace.add(DEFAULT_CATALOG_PATH, catalog, share=False)
+        self.active = self.workspace.entries[0]  # Entry of the catalog being browsed/edited
         self.root = root
         self.root.title("OSCAL Manager")
-        self.history = []
+        self.history = NavigationHistory(history_size)
+        self.tree_items = {}  # (catalog key, object id) -> Treeview item handle
+        self.item_entries = {}  # Treeview item handle -> WorkspaceEntry
+        self.catalog_nodes = {}  # Catalog key -> top-level tree item (multi-catalog workspaces)
         self.images = []
+        self.detail_cache = DetailCache(detail_cache_size)
+        self.prefetcher = Prefetcher(self)
+        self.select_delay = 150  # Idle time (ms) before a selection is fully rendered
+        self.select_timer = None
+        self.keyboard_nav = False
+        self.last_nav_was_keyboard = False
 
         # Detect system theme (dark or light)
         self.is_dark_mode = self.detect_system_theme()
@@ -51,7 +94,39 @@ class CatalogManager:
         style.theme_use('clam')
         self.configure_styles(style)
 
-        self.tree = ttk.Treeview(tree_frame, columns=("ID", "Title"), show="tree headings", height=20)
+        # Search box filtering the tree as the user types
+        self.search_indexes = {entry.key: SearchIndex() for entry in self.workspace.entries}
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(tree_frame, textvariable=self.search_var)
+        self.search_entry.pack(side="top", fill="x", pady=(0, 5))
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+        self.search_timer = None
+        self.hidden_items = set()
+
+        # Validation findings by (catalog key, group/control id); None key for catalog-level ones
+        self.findings = {}
+        self.validation_thread = None
+        self.validation_result = None
+
+        # Compliance summaries by catalog key, built on first use and then updated as controls change
+        self.compliance = {}
+        self.compliance_window = None
+
+        # Background export of a catalog snapshot, reporting per-group progress on export_events
+        self.export_process = None
+        self.export_events = None
+
+        # SQLite databases (see catalog_db.py) by catalog key, opened on the first edit if one exists
+        # next to the catalog; edits are written back to them when the catalog is saved
+        self.databases = {}
+        self.db_edits = {}  # Catalog key -> {("control" | "group", id): group or parent id}
+
+        if virtual_tree is None:
+            node_count = sum(1 + len(group.controls or []) for entry in self.workspace.entries
+                             for group in entry.view_groups())
+            virtual_tree = node_count > VIRTUAL_TREE_THRESHOLD
+        tree_class = VirtualTree if virtual_tree else ttk.Treeview
+        self.tree = tree_class(tree_frame, columns=("ID", "Title"), show="tree headings", height=20)
         self.tree.heading("#0", text="")
         self.tree.heading("ID", text="ID")
         self.tree.heading("Title", text="Title")
@@ -83,16 +158,28 @@ class CatalogManager:
             self.file_img = None
 
         # Populate tree
-        for group in self.catalog.groups or []:
-            group_node = self.tree.insert("", "end", text="", values=(group.id, group.title), 
-                                        tags=("group",), image=self.folder_img, open=False)
-            for control in group.controls or []:
-                self.tree.insert(group_node, "end", text="", values=(control.id, control.title), 
-                                tags=("control",), image=self.file_img)
-
+        for entry in self.workspace.entries:
+            parent = ""
+            if len(self.workspace.entries) > 1:
+                parent = self.tree.insert("", "end", text="", values=(entry.key, entry.title),
+                                          tags=("catalog",), image=self.folder_img, open=True)
+                self.catalog_nodes[entry.key] = parent
+                self.item_entries[parent] = entry
+            for group in entry.view_groups():
+                group_node = self.insert_tree_item(entry, parent, group, "group", self.folder_img)
+                for control in group.controls or []:
+                    self.insert_tree_item(entry, group_node, control, "control", self.file_img)
+            for control in entry.view_controls():
+                self.insert_tree_item(entry, parent, control, "control", self.file_img)
+
+        self.tree.tag_configure("catalog", font=('Helvetica', 11, 'bold'), background=self.theme["group_bg"])
         self.tree.tag_configure("group", font=('Helvetica', 10, 'bold'), background=self.theme["group_bg"])
         self.tree.tag_configure("control", font=('Helvetica', 10), background=self.theme["control_bg"])
+        self.tree.tag_configure("error", foreground="#d00000")
+        self.tree.tag_configure("warning", foreground="#c07000")
         self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        for key in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.tree.bind(key, self.on_tree_key)
 
         # Tooltip setup
         self.tooltip = tk.Toplevel(self.root)
@@ -114,9 +201,42 @@ class CatalogManager:
         self.details_pane.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         self.details_pane.clear()
 
+        # Build the search indexes off the UI thread
+        for entry in self.workspace.entries:
+            self.search_indexes[entry.key].build_async(entry.view())
+        self.root.after(100, self.poll_search_index)
+
         # Bind theme change detection
         self.root.after(1000, self.check_theme_change)
 
+    @property
+    def catalog(self) -> Catalog:
+        return self.active.catalog
+
+    @property
+    def catalog_key(self):
+        return self.active.key
+
+    @property
+    def search_index(self) -> SearchIndex:
+        return self.search_indexes[self.active.key]
+
+    def cache_key(self, item_id):
+        """Key for per-object caches; ids are only unique within one catalog."""
+        return (self.active.key, item_id)
+
+    def insert_tree_item(self, entry, parent, obj, tag, image, index="end"):
+        item = self.tree.insert(parent, index, text="", values=(obj.id, obj.title),
+                                tags=(tag,), image=image, open=False)
+        self.tree_items[(entry.key, obj.id)] = item
+        self.item_entries[item] = entry
+        return item
+
+    def forget_tree_item(self, entry, obj_id):
+        item = self.tree_items.pop((entry.key, obj_id), None)
+        self.item_entries.pop(item, None)
+        self.hidden_items.discard(item)
+
     def detect_system_theme(self):
         """Detect if the system is in dark mode."""
         if DARKDETECT_AVAILABLE:
@@ -144,6 +264,7 @@ class CatalogManager:
             self.theme = self.dark_theme if self.is_dark_mode else self.light_theme
             self.root.configure(bg=self.theme["bg"])
             self.configure_styles(ttk.Style())
+            self.tree.tag_configure("catalog", font=('Helvetica', 11, 'bold'), background=self.theme["group_bg"])
             self.tree.tag_configure("group", font=('Helvetica', 10, 'bold'), background=self.theme["group_bg"])
             self.tree.tag_configure("control", font=('Helvetica', 10), background=self.theme["control_bg"])
             self.tooltip_label.config(background=self.theme["tooltip_bg"], foreground=self.theme["fg"])
@@ -151,6 +272,92 @@ class CatalogManager:
             self.root.update_idletasks()
         self.root.after(1000, self.check_theme_change)
 
+    def poll_search_index(self):
+        if all(index.ready for index in self.search_indexes.values()):
+            if self.search_var.get().strip():
+                self.apply_search()
+        else:
+            self.root.after(100, self.poll_search_index)
+
+    def schedule_search(self):
+        if self.search_timer:
+            self.root.after_cancel(self.search_timer)
+        self.search_timer = self.root.after(120, self.apply_search)
+
+    def apply_search(self):
+        """Show only groups and controls matching the search box, keeping catalog order."""
+        if self.search_timer:
+            self.root.after_cancel(self.search_timer)
+            self.search_timer = None
+        if not all(index.ready for index in self.search_indexes.values()):
+            return  # poll_search_index applies the query once the indexes are built
+        query = self.search_var.get().strip()
+        self.hidden_items = set()
+        for catalog_position, entry in enumerate(self.workspace.entries):
+            matches = self.search_indexes[entry.key].search(query) if query else None
+            parent = self.catalog_nodes.get(entry.key, "")
+            position = self.filter_catalog(entry, parent, matches)
+            if parent:
+                if position:
+                    self.tree.move(parent, "", catalog_position)
+                else:
+                    self.tree.detach(parent)
+                    self.hidden_items.add(parent)
+
+    def filter_catalog(self, entry, parent, matches):
+        """Attach the matching groups and controls of one catalog under parent; return how many top-level rows show."""
+        position = 0
+        for group in entry.view_groups():
+            group_item = self.tree_items.get((entry.key, group.id))
+            if group_item is None:
+                continue
+            controls = group.controls or []
+            control_items = [(control, self.tree_items.get((entry.key, control.id))) for control in controls]
+            if matches is None:
+                visible = controls
+            else:
+                visible = [c for c in controls if c.id in matches]
+                if not visible and group.id in matches:
+                    visible = controls
+            if matches is not None and not visible and group.id not in matches:
+                self.tree.detach(group_item)
+                self.hidden_items.add(group_item)
+                self.hidden_items.update(item for _, item in control_items)
+                continue
+            self.tree.move(group_item, parent, position)
+            position += 1
+            visible_ids = {c.id for c in visible}
+            child_position = 0
+            for control, item in control_items:
+                if item is None:
+                    continue
+                if control.id in visible_ids:
+                    self.tree.move(item, group_item, child_position)
+                    child_position += 1
+                else:
+                    self.tree.detach(item)
+                    self.hidden_items.add(item)
+            if matches is not None and any(c.id in matches for c in controls):
+                self.tree.item(group_item, open=True)
+        # Controls outside any group, as in a profile resolved without "as-is" merging
+        for control in entry.view_controls():
+            item = self.tree_items.get((entry.key, control.id))
+            if item is None:
+                continue
+            if matches is None or control.id in matches:
+                self.tree.move(item, parent, position)
+                position += 1
+            else:
+                self.tree.detach(item)
+                self.hidden_items.add(item)
+        return position
+
+    def reveal(self, item):
+        """Clear the search filter if it is hiding the given tree item."""
+        if item in self.hidden_items:
+            self.search_var.set("")
+            self.apply_search()
+
     def show_tooltip(self, x, y, text):
         self.tooltip_label.config(text=text)
         self.tooltip.geometry(f"+{x+10}+{y+10}")
@@ -177,98 +384,326 @@ class CatalogManager:
     def show_tooltip_for_item(self, item, x, y):
         item_id = self.tree.item(item, "values")[0]
         tags = self.tree.item(item, "tags")
-        if "group" in tags:
-            group = self.find_group_by_id(item_id)
-            if group:
-                text = f"Group: {group.id}\n{group.title}"
+        entry = self.item_entries.get(item) or self.active  # Hovering must not change the active catalog
+        text = ""
+        if "catalog" in tags:
+            if entry.memory is None:
+                entry.memory = model_size(entry.view(), set())
+            text = f"Catalog: {entry.title}\n{entry.path}\nMemory: {format_bytes(entry.memory)}"
+        elif "group" in tags:
+            title = entry.group_title(item_id)
+            if title is not None:
+                text = f"Group: {item_id}\n{title}"
         elif "control" in tags:
-            control = self.find_control_by_id(item_id)
-            if control:
-                statement_part = None
-                for part in control.parts or []:
-                    if hasattr(part, 'name'):
-                        if part.name == "statement":
-                            statement_part = part
-                            break
-                    elif isinstance(part, dict) and part.get("name") == "statement":
-                        statement_part = part
-                        break
-                desc_snippet = statement_part.prose[:100] + "..." if statement_part and statement_part.prose else "No description."
-                text = f"Control: {control.id}\n{control.title}\n{desc_snippet}"
-        else:
-            text = ""
+            summary = entry.control_summary(item_id)
+            if summary:
+                title, prose = summary
+                desc_snippet = prose[:100] + "..." if prose else "No description."
+                text = f"Control: {item_id}\n{title}\n{desc_snippet}"
+        findings = self.findings.get((entry.key, None if "catalog" in tags else item_id))
+        if text and findings:
+            text += "\n" + "\n".join(f"{f.severity.title()}: {f.message}" for f in findings[:5])
+            if len(findings) > 5:
+                text += f"\n... and {len(findings) - 5} more"
         if text:
             self.show_tooltip(x, y, text)
 
+    def validate_catalogs(self):
+        """Validate every open catalog on a background thread; poll_validation annotates the tree."""
+        if self.validation_thread and self.validation_thread.is_alive():
+            return
+        # Snapshots are taken here so the worker never walks models the UI thread may be editing
+        snapshots = [(entry.key, entry.snapshot(resources=True)) for entry in self.workspace.entries]
+
+        def run():
+            try:
+                self.validation_result = {key: validate(snapshot.to_dict()) for key, snapshot in snapshots}
+            except Exception as e:
+                self.validation_result = e
+
+        self.validation_result = None
+        self.details_pane.validate_button.config(state=tk.DISABLED)
+        self.validation_thread = threading.Thread(target=run, daemon=True)
+        self.validation_thread.start()
+        self.root.after(100, self.poll_validation)
+
+    def poll_validation(self):
+        if self.validation_thread.is_alive():
+            self.root.after(100, self.poll_validation)
+            return
+        self.details_pane.validate_button.config(state=tk.NORMAL)
+        result = self.validation_result
+        if isinstance(result, Exception):
+            messagebox.showerror("Error", f"Validation failed: {result}")
+            return
+        self.annotate_tree(result)
+        errors = sum(f.severity == "error" for findings in result.values() for f in findings)
+        warnings = sum(len(findings) for findings in result.values()) - errors
+        messagebox.showinfo("Validation", f"{errors} errors and {warnings} warnings found."
+                            + ("\nHover a highlighted row for details." if errors or warnings else ""))
+
+    def annotate_tree(self, results):
+        """Colour tree rows with findings, clearing the marks left by the previous run."""
+        for key, item_id in self.findings:
+            item = self.catalog_nodes.get(key) if item_id is None else self.tree_items.get((key, item_id))
+            if item and self.tree.exists(item):
+                tags = self.tree.item(item, "tags")
+                self.tree.item(item, tags=[tag for tag in tags if tag not in ("error", "warning")])
+        self.findings = {}
+        for key, findings in results.items():
+            for item_id, item_findings in group_by_item(findings).items():
+                self.findings[(key, item_id)] = item_findings
+                item = self.catalog_nodes.get(key) if item_id is None else self.tree_items.get((key, item_id))
+                if item:
+                    severity = "error" if any(f.severity == "error" for f in item_findings) else "warning"
+                    self.tree.item(item, tags=list(self.tree.item(item, "tags")) + [severity])
+
+    def compare_catalog(self):
+        """Show what changed in the active catalog relative to a catalog file, e.g. the last saved revision."""
+        path = filedialog.askopenfilename(title="Compare with", filetypes=[("JSON files", "*.json")],
+                                          initialfile=os.path.basename(self.active.path))
+        if not path:
+            return
+        try:
+            old_catalog = catalog_data(path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Error", f"Could not load {path}: {e}")
+            return
+        if self.details_pane.is_modified():  # Comparing is read-only; only real form edits are committed
+            self.commit_details()
+        DiffWindow(self, old_catalog, catalog_dict(self.active.view()), os.path.basename(path))
+
+    def compliance_summary(self, entry=None):
+        entry = entry or self.active
+        summary = self.compliance.get(entry.key)
+        if summary is None:
+            summary = self.compliance[entry.key] = ComplianceSummary.from_catalog(catalog_dict(entry.view()))
+        return summary
+
+    def show_compliance(self):
+        """Open (or raise) the compliance summary of the active catalog."""
+        if self.compliance_window is not None and self.compliance_window.entry is self.active:
+            self.compliance_window.lift()
+            return
+        if self.compliance_window is not None:
+            self.compliance_window.close()
+        self.compliance_window = ComplianceWindow(self, self.active, self.compliance_summary())
+
+    def update_compliance(self, entry, change, *args):
+        """Apply one change ("set_status", "add_control", "remove_control", "family", "remove_family")
+        to an entry's summary, if it has been built, and refresh an open summary window."""
+        summary = self.compliance.get(entry.key)
+        if summary is None:
+            return
+        getattr(summary, change)(*args)
+        if self.compliance_window is not None and self.compliance_window.entry is entry:
+            self.compliance_window.refresh()
+
+    def record_edit(self, entry, kind, item_id, parent_id=None, removed=False):
+        """Note an added, changed or removed control or group for export snapshots and the entry's database.
+
+        parent_id is the group of a new or removed control or the parent group of a new group; the
+        latest one given wins, so a control deleted and re-created in another group is written to that
+        group. A removed group is also remembered on its own, so a group re-created under the same id
+        does not inherit the old one's controls. Export snapshots re-serialize only the groups edited here.
+        """
+        entry.mark_changed(kind, item_id, parent_id)
+        if entry.key not in self.databases:
+            self.databases[entry.key] = open_catalog_db(entry.path) if entry.save_path == entry.path else None
+        if self.databases[entry.key] is not None:
+            edits = self.db_edits.setdefault(entry.key, {})
+            if parent_id is not None or (kind, item_id) not in edits:
+                edits[(kind, item_id)] = parent_id
+            if removed and kind == "group":
+                edits[("removed group", item_id)] = None
+
+    def write_back(self, entry):
+        """Apply the entry's recorded edits to its database after the catalog itself has been saved."""
+        db = self.databases.get(entry.key)
+        edits = self.db_edits.pop(entry.key, {})
+        if db is None:
+            return
+        try:
+            # Old subtrees go first, before a group re-created under the same id is written
+            for kind, item_id in edits:
+                if kind == "removed group":
+                    db.delete_group(item_id)
+            for (kind, item_id), parent_id in edits.items():
+                if kind == "removed group":
+                    continue
+                if kind == "control":
+                    control = entry.find_control(item_id)
+                    if control is None:
+                        db.delete_control(item_id)
+                    else:
+                        db.put_control(json_codec.loads("".join(iter_json(control))), parent_id)
+                else:
+                    group = entry.find_group(item_id)
+                    if group is None:
+                        db.delete_group(item_id)
+                    else:
+                        db.put_group(json_codec.loads("".join(iter_json(group.copy(exclude={"controls", "groups"})))),
+                                     parent_id)
+            db.put_shell(json_codec.loads("".join(iter_json(entry.catalog.copy(exclude={"groups", "controls"})))))
+            db.mark_synced(entry.path)
+        except sqlite3.Error as e:
+            # Left stale, the database is rebuilt from the saved catalog the next time it is imported
+            print(f"Could not update catalog database {db.path}: {e}")
+            db.close()
+            self.databases[entry.key] = None
+
+    def export_catalog(self):
+        """Export the active catalog, unsaved edits included, in a background process."""
+        if self.export_process is not None and self.export_process.is_alive():
+            return
+        entry = self.active
+        path = filedialog.asksaveasfilename(
+            title="Export", defaultextension=".html",
+            initialfile=os.path.splitext(os.path.basename(entry.path))[0] + ".html",
+            filetypes=[(f"{name.upper()} files", "*" + export_format.extension) for name, export_format in FORMATS.items()])
+        if not path:
+            return
+        if self.details_pane.is_modified():  # Export unsaved form edits, but never re-save an untouched form
+            self.commit_details()
+        self.export_events = multiprocessing.Queue()
+        self.export_process = multiprocessing.Process(
+            target=export_snapshot,
+            args=(entry.snapshot(), [format_for_path(path)], path, self.export_events, self.compliance.get(entry.key)))
+        self.export_process.start()
+        self.details_pane.show_export_progress(0, 0)
+        self.root.after(100, self.poll_export)
+
+    def poll_export(self):
+        alive = self.export_process.is_alive()
+        finished = None
+        while True:
+            try:
+                event = self.export_events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                self.details_pane.show_export_progress(event[1], event[2])
+            else:
+                finished = event
+        if finished is None and alive:
+            self.root.after(100, self.poll_export)
+            return
+        self.export_process.join()
+        self.details_pane.hide_export_progress()
+        if finished is None:
+            messagebox.showerror("Error", f"Export failed: exit code {self.export_process.exitcode}")
+        elif finished[0] == "error":
+            messagebox.showerror("Error", f"Export failed: {finished[1]}")
+        else:
+            messagebox.showinfo("Success", f"Exported to {', '.join(finished[1])}")
+
+    def on_tree_key(self, event):
+        self.keyboard_nav = True
+        # The selection event a key causes is queued ahead of idle callbacks; clearing the flag once
+        # idle keeps a key that moved nothing (Home on the first row) from marking a later selection
+        self.root.after_idle(self.end_tree_key)
+
+    def end_tree_key(self):
+        self.keyboard_nav = False
+
     def on_tree_select(self, event):
+        """Show a cheap preview now and defer the full render until selection settles."""
+        from_keyboard, self.keyboard_nav = self.keyboard_nav, False
+        self.prefetcher.cancel()
+        if self.select_timer:
+            self.root.after_cancel(self.select_timer)
+            self.select_timer = None
         selected = self.tree.selection()
         if selected:
-            item = self.tree.item(selected[0])
-            tags, item_id = item["tags"], item["values"][0]
-            if "group" in tags:
-                group = self.find_group_by_id(item_id)
-                if group:
-                    self.history.append(("group", item_id))
-                    self.details_pane.show_group(group)
-            elif "control" in tags:
-                control = self.find_control_by_id(item_id)
-                if control:
-                    self.history.append(("control", item_id))
-                    self.details_pane.show_control(control)
-            self.update_back_button_state()
+            item = selected[0]
+            self.set_active(item)
+            values = self.tree.item(item, "values")
+            self.details_pane.show_preview(values[0], values[1] if len(values) > 1 else "")
+            self.select_timer = self.root.after(self.select_delay, lambda: self.render_selection(item, from_keyboard))
         else:
             self.details_pane.clear()
 
+    def render_selection(self, item, from_keyboard=False):
+        """Render the full details for a tree item once selection has settled."""
+        self.select_timer = None
+        if not self.tree.exists(item):
+            return
+        tree_item = self.tree.item(item)
+        tags, item_id = tree_item["tags"], tree_item["values"][0]
+        entry = None
+        if "group" in tags:
+            group = self.find_group_by_id(item_id)
+            if group:
+                entry = ("group", item_id)
+                self.details_pane.show_group(group)
+        elif "control" in tags:
+            control = self.find_control_by_id(item_id)
+            if control:
+                entry = ("control", item_id)
+                self.details_pane.show_control(control)
+                model = self.detail_cache.peek(self.cache_key(control.id))
+                if model:
+                    self.prefetcher.schedule(item, model)
+        if entry:
+            # Consecutive arrow-key moves collapse into a single history entry
+            if from_keyboard and self.last_nav_was_keyboard:
+                self.history.replace(item)
+            else:
+                self.history.push(item)
+            self.last_nav_was_keyboard = from_keyboard
+        self.update_history_buttons()
+
+    def set_active(self, item):
+        """Make the catalog owning a tree item the one lookups and edits apply to."""
+        entry = self.item_entries.get(item)
+        if entry is not None:
+            self.active = entry
+
     def find_group_by_id(self, group_id: str) -> ControlGroup:
-        return next((g for g in self.catalog.groups or [] if g.id == group_id), None)
+        return self.active.find_group(group_id)
 
     def find_control_by_id(self, control_id: str) -> Control:
-        for group in self.catalog.groups or []:
-            for control in group.controls or []:
-                if control.id == control_id:
-                    return control
-        return None
+        return self.active.find_control(control_id)
 
     def find_tree_item_by_id(self, target_id):
-        for item in self.tree.get_children():
-            if self.tree.item(item, "values")[0] == target_id:
-                return item
-            for child in self.tree.get_children(item):
-                if self.tree.item(child, "values")[0] == target_id:
-                    return child
-        return None
+        return self.tree_items.get((self.active.key, target_id))
 
     def get_control_title_by_id(self, control_id):
-        control = self.find_control_by_id(control_id)
-        return control.title if control else None
+        summary = self.active.control_summary(control_id)
+        return summary[0] if summary else None
 
     def get_resource_title_by_uuid(self, uuid):
-        if hasattr(self.catalog, 'back_matter') and self.catalog.back_matter:
-            for resource in self.catalog.back_matter.resources or []:
-                if resource.uuid == uuid:
-                    return resource.title
-        return None
+        return self.active.resource_title(uuid)
 
     def select_control_by_id(self, control_id, from_link=False):
         item = self.find_tree_item_by_id(control_id)
         if item:
+            self.reveal(item)
             self.tree.selection_set(item)
             self.tree.see(item)
         else:
             messagebox.showinfo("Not Found", f"Control {control_id} not found.")
 
     def go_back(self):
-        if len(self.history) > 1:
-            self.history.pop()
-            tag, item_id = self.history[-1]
-            item = self.find_tree_item_by_id(item_id)
-            if item:
-                self.tree.selection_set(item)
-                self.tree.see(item)
-            self.update_back_button_state()
-
-    def update_back_button_state(self):
-        self.details_pane.back_button.config(state=tk.NORMAL if len(self.history) > 1 else tk.DISABLED)
+        self.navigate(self.history.back)
+
+    def go_forward(self):
+        self.navigate(self.history.forward)
+
+    def navigate(self, step):
+        """Move through the history, skipping entries whose tree items were deleted."""
+        item = step()
+        while item is not None and not self.tree.exists(item):
+            item = step()
+        if item is not None:
+            self.reveal(item)
+            self.tree.selection_set(item)
+            self.tree.see(item)
+        self.update_history_buttons()
+
+    def update_history_buttons(self):
+        self.details_pane.back_button.config(state=tk.NORMAL if self.history.can_go_back() else tk.DISABLED)
+        self.details_pane.forward_button.config(state=tk.NORMAL if self.history.can_go_forward() else tk.DISABLED)
 
     def is_control_id_unique(self, control_id):
         for group in self.catalog.groups or []:
@@ -298,8 +733,12 @@ class CatalogManager:
                             new_control = Control(id=new_id, title="New Control")
                             group.controls = group.controls or []
                             group.controls.append(new_control)
-                            control_node = self.tree.insert(selected[0], "end", text="", values=(new_id, "New Control"), 
-                                                          tags=("control",), image=self.file_img)
+                            self.detail_cache.bump()
+                            self.active.dirty = True
+                            self.update_compliance(self.active, "add_control", new_id, group_id)
+                            self.record_edit(self.active, "control", new_id, group_id)
+                            control_node = self.insert_tree_item(self.active, selected[0], new_control, "control", self.file_img)
+                            self.search_index.update(new_id, new_control)
                             self.tree.selection_set(control_node)
                             self.tree.see(control_node)
                             self.details_pane.show_control(new_control)
@@ -319,8 +758,12 @@ class CatalogManager:
                 new_group = ControlGroup(id=new_id, title="New Group")
                 self.catalog.groups = self.catalog.groups or []
                 self.catalog.groups.append(new_group)
-                group_node = self.tree.insert("", "end", text="", values=(new_id, "New Group"), 
-                                            tags=("group",), image=self.folder_img, open=False)
+                self.active.dirty = True
+                self.update_compliance(self.active, "family", new_id, new_group.title)
+                self.record_edit(self.active, "group", new_id)
+                parent = self.catalog_nodes.get(self.active.key, "")
+                group_node = self.insert_tree_item(self.active, parent, new_group, "group", self.folder_img)
+                self.search_index.update(new_id, new_group)
                 self.tree.selection_set(group_node)
                 self.tree.see(group_node)
                 self.details_pane.show_group(new_group)
@@ -339,10 +782,19 @@ class CatalogManager:
                 control = self.find_control_by_id(control_id)
                 if control:
                     if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete control '{control_id}'?"):
+                        group_id = None
                         for group in self.catalog.groups or []:
                             if control in group.controls:
                                 group.controls.remove(control)
+                                group_id = group.id
                                 break
+                        self.detail_cache.bump()
+                        self.active.dirty = True
+                        for removed in [control] + list(control.controls or []):
+                            self.update_compliance(self.active, "remove_control", removed.id)
+                        self.record_edit(self.active, "control", control_id, group_id)
+                        self.forget_tree_item(self.active, control_id)
+                        self.search_index.remove(control_id)
                         self.tree.delete(selected[0])
                         self.details_pane.clear()
             else:
@@ -361,6 +813,15 @@ class CatalogManager:
                 if group:
                     if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete group '{group_id}' and all its controls?"):
                         self.catalog.groups.remove(group)
+                        self.detail_cache.bump()
+                        self.active.dirty = True
+                        self.update_compliance(self.active, "remove_family", group_id)
+                        self.record_edit(self.active, "group", group_id, removed=True)
+                        self.forget_tree_item(self.active, group_id)
+                        self.search_index.remove(group_id)
+                        for control in group.controls or []:
+                            self.forget_tree_item(self.active, control.id)
+                            self.search_index.remove(control.id)
                         self.tree.delete(selected[0])
                         self.details_pane.clear()
             else:
@@ -368,20 +829,27 @@ class CatalogManager:
         else:
             messagebox.showwarning("Warning", "Please select a group to delete.")
 
+    def commit_details(self):
+        """Write the open form into its model, mark the owning catalog dirty and refresh its tree label."""
+        obj = self.details_pane.current_object
+        if obj is None:
+            return
+        self.details_pane.save_current()
+        entry = self.details_pane.current_entry or self.active
+        entry.dirty = True
+        item = self.tree_items.get((entry.key, obj.id))
+        if item:
+            self.tree.item(item, values=(obj.id, obj.title))
+
     def save_changes(self):
         try:
-            self.details_pane.save_current()
-            save_catalog(self.catalog, "data/NIST_SP-800-53_rev5_catalog.json")
-            if isinstance(self.details_pane.current_object, ControlGroup):
-                group = self.details_pane.current_object
-                item = self.find_tree_item_by_id(group.id)
-                if item:
-                    self.tree.item(item, values=(group.id, group.title))
-            elif isinstance(self.details_pane.current_object, Control):
-                control = self.details_pane.current_object
-                item = self.find_tree_item_by_id(control.id)
-                if item:
-                    self.tree.item(item, values=(control.id, control.title))
+            self.commit_details()
+            for dirty_entry in self.workspace.entries:
+                if dirty_entry.dirty:
+                    save_catalog(dirty_entry.catalog, dirty_entry.save_path)
+                    self.write_back(dirty_entry)
+                    dirty_entry.dirty = False
+                    dirty_entry.memory = None
             messagebox.showinfo("Success", "Changes saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save: {str(e)}")
@@ -0,0 +1,130 @@
+# catalog_store.py
+import json_codec
+import mmap
+import os
+import struct
+from array import array
+from compact_catalog import CompactCatalog, CompactControl, CompactGroup
+from profile_resolver import ProfileResolver
+
+MAGIC = b"OSCALST1"
+HEADER = struct.Struct("<8sQQQQ")  # Magic, string count, offsets position, index position, index length
+STORE_VERSION = 2
+
+def store_path_for(json_path):
+    return os.path.splitext(json_path)[0] + ".ostore"
+
+def source_stamp(paths):
+    """Size and mtime of every file a store was built from; a resolved profile lists its imports too."""
+    stamp = []
+    for path in paths:
+        stat = os.stat(path)
+        stamp.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return stamp
+
+def stamp_is_current(stamp, json_path):
+    if not stamp or stamp[0][0] != os.path.abspath(json_path):
+        return False
+    try:
+        return source_stamp([path for path, _, _ in stamp]) == stamp
+    except OSError:
+        return False
+
+class MappedStrings:
+    """String table read straight out of a memory-mapped store; strings are decoded per access."""
+    __slots__ = ("mapping", "offsets")
+
+    def __init__(self, mapping, offsets):
+        self.mapping = mapping
+        self.offsets = offsets  # count + 1 native uint64 positions; string i spans offsets[i]:offsets[i + 1]
+
+    def get(self, position):
+        if position < 0:
+            return None
+        return self.mapping[self.offsets[position]:self.offsets[position + 1]].decode("utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+def control_entry(record):
+    return [record.id, record.title, record.class_, record.status, record.statement, record.props,
+            record.links, record.params, [control_entry(child) for child in record.controls], record.source]
+
+def control_record(entry):
+    id, title, class_, status, statement, props, links, params, controls, source = entry
+    return CompactControl(id, title, class_, status, statement, tuple(map(tuple, props)),
+                          tuple(map(tuple, links)), tuple(params), [control_record(child) for child in controls], source)
+
+def write_store(compact: CompactCatalog, store_path, stamp=None):
+    """Write a compact catalog's string table and records to a store file.
+
+    The string table is laid out back to back, followed by its offset table and a JSON index
+    of group, control and back-matter records that point into it. The file is written under a
+    temporary name and renamed so readers never see a partial store.
+    """
+    index = {
+        "version": STORE_VERSION,
+        "source": stamp,
+        "title": compact.title,
+        "shell": compact.shell,
+        "groups": [[group.id, group.title, group.class_, group.source, [control_entry(c) for c in group.controls]]
+                   for group in compact.groups],
+        "controls": [control_entry(control) for control in compact.controls],
+        "resources": [[uuid, compact.resource_titles.get(uuid), position]
+                      for uuid, position in compact.resource_sources.items()],
+    }
+    temp_path = store_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        offsets = array("Q", [HEADER.size])
+        for value in compact.strings.strings:
+            f.write(value.encode("utf-8"))
+            offsets.append(f.tell())
+        offsets_position = f.tell()
+        offsets.tofile(f)
+        index_position = f.tell()
+        index_bytes = json_codec.dumps(index, compact=True).encode("utf-8")
+        f.write(index_bytes)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(offsets) - 1, offsets_position, index_position, len(index_bytes)))
+    os.replace(temp_path, store_path)
+    return store_path
+
+def open_store(store_path, json_path=None):
+    """Map a store file and rebuild its records; returns None if it is missing, foreign or stale."""
+    try:
+        with open(store_path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, offsets_position, index_position, index_length = HEADER.unpack_from(mapping)
+        index = json_codec.loads(mapping[index_position:index_position + index_length]) if magic == MAGIC else {}
+    except (OSError, ValueError, struct.error):
+        return None
+    if index.get("version") != STORE_VERSION or (json_path and not stamp_is_current(index.get("source"), json_path)):
+        return None
+    offsets = memoryview(mapping)[offsets_position:offsets_position + (count + 1) * 8].cast("Q")
+
+    compact = CompactCatalog()
+    compact.strings = MappedStrings(mapping, offsets)
+    compact.title = index["title"]
+    compact.shell = index["shell"]
+    for id, title, class_, source, controls in index["groups"]:
+        group = CompactGroup(id, title, class_, [control_record(entry) for entry in controls], source)
+        compact.groups.append(group)
+        compact.groups_by_id[id] = group
+    compact.controls = [control_record(entry) for entry in index["controls"]]
+    for control in [c for group in compact.groups for c in group.controls] + compact.controls:
+        compact.controls_by_id[control.id] = control
+    for uuid, title, position in index["resources"]:
+        compact.resource_titles[uuid] = title
+        compact.resource_sources[uuid] = position
+    return compact
+
+def build_store(json_path, store_path=None):
+    """Convert an OSCAL catalog or profile into a store next to it, unless an up-to-date one exists."""
+    store_path = store_path or store_path_for(json_path)
+    if open_store(store_path, json_path) is None:
+        resolver = ProfileResolver()
+        compact = CompactCatalog.from_dict(resolver.catalog_data(json_path))
+        sources = [json_path] + [path for path in resolver.documents if path != os.path.abspath(json_path)]
+        write_store(compact, store_path, source_stamp(sources))
+    return store_path
@@ -0,0 +1,187 @@
+# catalog_validator.py
+import argparse
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from group_pool import map_groups
+from profile_resolver import catalog_data
+
+# Parameter ids in NIST catalogs contain dots and dashes (e.g. ac-02_odp.01)
+PARAM_INSERT_PATTERN = re.compile(r"\{\{\s*insert:\s*param,\s*([\w.-]+)\s*\}\}")
+
+# item_id is the group or top-level control the problem belongs to, i.e. the tree row to annotate
+Finding = namedtuple("Finding", "severity item_id kind message")
+
+class CatalogIndex:
+    """Every id, param id and back-matter uuid in a catalog, gathered in one pass."""
+    def __init__(self, catalog):
+        self.ids = Counter()
+        self.params = {}  # Param id -> owning tree row id
+        self.control_count = 0
+        self.resources = {r["uuid"] for r in (catalog.get("back-matter") or {}).get("resources") or []}
+        for param in catalog.get("params") or []:
+            self.ids[param["id"]] += 1
+            self.params.setdefault(param["id"], None)
+        for group in catalog.get("groups") or []:
+            self.add_group(group)
+        for control in catalog.get("controls") or []:
+            self.add_object(control, control["id"])
+
+    def add_group(self, group):
+        if group.get("id"):
+            self.ids[group["id"]] += 1
+        for param in group.get("params") or []:
+            self.ids[param["id"]] += 1
+            self.params.setdefault(param["id"], group.get("id"))
+        for part in group.get("parts") or []:
+            self.add_part(part)
+        for control in group.get("controls") or []:
+            self.add_object(control, control["id"])
+        for subgroup in group.get("groups") or []:
+            self.add_group(subgroup)
+
+    def add_object(self, control, owner):
+        self.control_count += 1
+        self.ids[control["id"]] += 1
+        for param in control.get("params") or []:
+            self.ids[param["id"]] += 1
+            self.params.setdefault(param["id"], owner)
+        for part in control.get("parts") or []:
+            self.add_part(part)
+        for child in control.get("controls") or []:
+            self.add_object(child, owner)
+
+    def add_part(self, part):
+        if part.get("id"):
+            self.ids[part["id"]] += 1
+        for sub_part in part.get("parts") or []:
+            self.add_part(sub_part)
+
+    def resolves(self, href):
+        target = href[1:]
+        return target in self.ids or target in self.resources
+
+def check_links(obj, owner, label, index, findings):
+    for link in obj.get("links") or []:
+        href = link.get("href", "")
+        if href.startswith("#") and not index.resolves(href):
+            # Related controls left out of a tailored baseline are expected, so only warn about those
+            severity = "warning" if link.get("rel") == "related" else "error"
+            findings.append(Finding(severity, owner, "broken-link", f"{label}: link {href} does not resolve"))
+
+def check_text(text, owner, label, index, findings, used):
+    for param_id in PARAM_INSERT_PATTERN.findall(text):
+        used.add(param_id)
+        if param_id not in index.params:
+            findings.append(Finding("error", owner, "unknown-param", f"{label}: inserts undefined parameter {param_id}"))
+
+def check_id(obj_id, owner, label, index, findings):
+    if obj_id and index.ids[obj_id] > 1:
+        findings.append(Finding("error", owner, "duplicate-id", f"{label}: id {obj_id} is used {index.ids[obj_id]} times"))
+
+def check_part(part, owner, index, findings, used):
+    label = part.get("id") or part.get("name", "part")
+    check_id(part.get("id"), owner, label, index, findings)
+    check_text(part.get("prose") or "", owner, label, index, findings, used)
+    check_links(part, owner, label, index, findings)
+    for sub_part in part.get("parts") or []:
+        check_part(sub_part, owner, index, findings, used)
+
+def check_params(obj, owner, index, findings, used):
+    for param in obj.get("params") or []:
+        check_id(param["id"], owner, param["id"], index, findings)
+        check_links(param, owner, param["id"], index, findings)
+        for choice in (param.get("select") or {}).get("choice") or []:
+            check_text(choice, owner, param["id"], index, findings, used)
+        for guideline in param.get("guidelines") or []:
+            check_text(guideline.get("prose") or "", owner, param["id"], index, findings, used)
+
+def check_control(control, owner, index, findings, used):
+    check_id(control["id"], owner, control["id"], index, findings)
+    check_links(control, owner, control["id"], index, findings)
+    check_params(control, owner, index, findings, used)
+    for part in control.get("parts") or []:
+        check_part(part, owner, index, findings, used)
+    for child in control.get("controls") or []:
+        check_control(child, owner, index, findings, used)
+
+def check_group(group, index):
+    """Check one group and its controls; returns (findings, ids of the params its text inserts)."""
+    findings, used = [], set()
+    owner = group.get("id")
+    check_id(owner, owner, owner, index, findings)
+    check_links(group, owner, owner, index, findings)
+    check_params(group, owner, index, findings, used)
+    for part in group.get("parts") or []:
+        check_part(part, owner, index, findings, used)
+    for control in group.get("controls") or []:
+        check_control(control, control["id"], index, findings, used)
+    for subgroup in group.get("groups") or []:
+        sub_findings, sub_used = check_group(subgroup, index)
+        findings.extend(sub_findings)
+        used |= sub_used
+    return findings, used
+
+def validate(catalog, workers=None, use_processes=None):
+    """Validate a catalog dict; returns findings sorted by severity and tree row.
+
+    Groups are checked in parallel worker processes on large catalogs. The index is built
+    first and handed to the workers once, so each group is checked without re-scanning the
+    rest of the catalog.
+    """
+    index = CatalogIndex(catalog)
+    groups = catalog.get("groups") or []
+    results = list(map_groups(check_group, groups, (index,), index.control_count, workers, use_processes))
+
+    findings, used = [], set()
+    for group_findings, group_used in results:
+        findings.extend(group_findings)
+        used |= group_used
+    top_level = {"controls": catalog.get("controls") or [], "params": catalog.get("params") or [], "id": None}
+    top_findings, top_used = check_group(top_level, index)
+    findings.extend(top_findings)
+    used |= top_used
+
+    for param_id, owner in index.params.items():
+        if param_id not in used:
+            findings.append(Finding("warning", owner, "unused-param", f"{param_id}: parameter is never inserted"))
+    findings.sort(key=lambda f: (f.severity != "error", f.item_id or "", f.kind))
+    return findings
+
+def group_by_item(findings):
+    by_item = {}
+    for finding in findings:
+        by_item.setdefault(finding.item_id, []).append(finding)
+    return by_item
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check OSCAL catalogs for broken links, undefined or unused parameters and duplicate ids.")
+    parser.add_argument("paths", nargs="+", help="Catalog or profile JSON files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--parallel", action="store_true", help="Always check groups in worker processes")
+    parser.add_argument("--warnings", action="store_true", help="Also list warnings")
+    args = parser.parse_args(argv)
+
+    error_count = 0
+    for path in args.paths:
+        try:
+            catalog = catalog_data(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: could not load {path}: {e}")
+            error_count += 1
+            continue
+        start = time.perf_counter()
+        findings = validate(catalog, args.workers, True if args.parallel else None)
+        elapsed = time.perf_counter() - start
+        errors = [f for f in findings if f.severity == "error"]
+        warnings = len(findings) - len(errors)
+        error_count += len(errors)
+        print(f"{path}: {len(errors)} errors, {warnings} warnings ({elapsed:.2f}s)")
+        for finding in findings:
+            if finding.severity == "error" or args.warnings:
+                print(f"  {finding.severity:7} {finding.item_id or '(catalog)':12} {finding.message}")
+    return 1 if error_count else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
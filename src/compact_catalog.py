@@ -0,0 +1,256 @@
+# compact_catalog.py
+import json_codec
+import sys
+from oscal_pydantic.catalog import Catalog, Control, ControlGroup, Resource
+
+# Keys whose string values are worth searching; hrefs, uuids and namespaces are not
+TEXT_KEYS = {"id", "title", "prose", "label", "usage", "name", "value"}
+PART_KEYS = {"title", "prose"}
+
+class StringTable:
+    """Append-only table of de-duplicated strings referenced by integer index."""
+    __slots__ = ("strings", "index")
+
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def add(self, value):
+        if value is None:
+            return -1
+        position = self.index.get(value)
+        if position is None:
+            position = len(self.strings)
+            self.strings.append(value)
+            self.index[value] = position
+        return position
+
+    def get(self, position):
+        return self.strings[position] if position >= 0 else None
+
+class CompactControl:
+    """Read-only view of a control: interned ids, (name, value) props and string-table prose."""
+    __slots__ = ("id", "title", "class_", "status", "statement", "props", "links", "params", "controls", "source")
+
+    def __init__(self, id, title, class_, status, statement, props, links, params, controls, source):
+        self.id = id
+        self.title = title
+        self.class_ = class_
+        self.status = status
+        self.statement = statement  # String-table index of the statement prose, or -1
+        self.props = props  # Tuple of (name, value)
+        self.links = links  # Tuple of (rel, href)
+        self.params = params  # Tuple of parameter ids
+        self.controls = controls  # Enhancements, as CompactControl records
+        self.source = source  # String-table index of the control's JSON; -1 for enhancements
+
+class CompactGroup:
+    """Read-only view of a group; source holds the group's JSON without its controls."""
+    __slots__ = ("id", "title", "class_", "controls", "source")
+
+    def __init__(self, id, title, class_, controls, source):
+        self.id = id
+        self.title = title
+        self.class_ = class_
+        self.controls = controls
+        self.source = source
+
+def dict_text(data, out, keys=TEXT_KEYS):
+    """Collect searchable strings from a raw OSCAL dict, skipping links and back-matter."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in ("links", "back-matter"):
+                continue
+            if isinstance(value, str):
+                if key in keys:
+                    out.append(value)
+            else:
+                # Like document_text, parts only contribute their title and prose
+                dict_text(value, out, PART_KEYS if key == "parts" else keys)
+    elif isinstance(data, list):
+        for value in data:
+            if isinstance(value, str):
+                out.append(value)
+            else:
+                dict_text(value, out, keys)
+    return out
+
+class CompactCatalog:
+    """Memory-lean catalog for the tree, tooltips, search and export.
+
+    Built straight from the OSCAL JSON without pydantic validation. Controls and groups are
+    converted to pydantic models only when they are opened for editing (materialize_*), and
+    to_catalog() assembles a full Catalog around the already-materialized objects for saving.
+    """
+    def __init__(self):
+        self.strings = StringTable()
+        self.title = ""
+        self.shell = -1  # Catalog JSON without groups, controls and back-matter resources
+        self.groups = []
+        self.controls = []  # Controls that sit directly under the catalog
+        self.controls_by_id = {}
+        self.groups_by_id = {}
+        self.resource_titles = {}
+        self.resource_sources = {}  # Back-matter uuid -> string-table index of the resource JSON
+        self.models = {}  # Materialized pydantic controls by id
+        self.group_models = {}
+        self.shell_model = None
+
+    @classmethod
+    def from_dict(cls, data, intern=sys.intern):
+        """Build from the "catalog" object of an OSCAL catalog document."""
+        compact = cls()
+        compact.title = data.get("metadata", {}).get("title", "")
+        shell = {key: value for key, value in data.items() if key not in ("groups", "controls")}
+        if "back-matter" in shell:
+            shell["back-matter"] = {key: value for key, value in shell["back-matter"].items() if key != "resources"}
+        compact.shell = compact.strings.add(json_codec.dumps(shell, compact=True))
+        for resource in (data.get("back-matter") or {}).get("resources") or []:
+            compact.resource_titles[resource["uuid"]] = resource.get("title")
+            compact.resource_sources[resource["uuid"]] = compact.strings.add(json_codec.dumps(resource, compact=True))
+        for group in data.get("groups") or []:
+            compact.groups.append(compact.add_group(group, intern))
+        compact.controls = [compact.add_control(control, intern) for control in data.get("controls") or []]
+        return compact
+
+    @classmethod
+    def from_catalog(cls, catalog: Catalog):
+        return cls.from_dict(json_codec.loads(catalog.json(by_alias=True, exclude_none=True)))
+
+    def add_group(self, data, intern):
+        shell = {key: value for key, value in data.items() if key != "controls"}
+        controls = [self.add_control(control, intern) for control in data.get("controls") or []]
+        group = CompactGroup(intern(data.get("id") or ""), data.get("title", ""), data.get("class"), controls,
+                             self.strings.add(json_codec.dumps(shell, compact=True)))
+        self.groups_by_id[group.id] = group
+        return group
+
+    def add_control(self, data, intern, nested=False):
+        props = tuple((intern(prop["name"]), intern(prop.get("value", ""))) for prop in data.get("props") or [])
+        statement = next((part.get("prose") for part in data.get("parts") or [] if part.get("name") == "statement"), None)
+        control = CompactControl(
+            intern(data["id"]), data.get("title", ""), data.get("class"),
+            next((value for name, value in props if name == "implementation-status"), None),
+            self.strings.add(statement),
+            props,
+            tuple((intern(link.get("rel") or ""), link["href"]) for link in data.get("links") or []),
+            tuple(intern(param["id"]) for param in data.get("params") or []),
+            [self.add_control(child, intern, nested=True) for child in data.get("controls") or []],
+            -1 if nested else self.strings.add(json_codec.dumps(data, compact=True)),
+        )
+        if not nested:
+            self.controls_by_id[control.id] = control
+        return control
+
+    def reintern(self, intern):
+        """Re-point ids and prop names at a shared intern table (after loading in another process)."""
+        stack = list(self.groups) + list(self.controls)
+        while stack:
+            record = stack.pop()
+            record.id = intern(record.id)
+            if isinstance(record, CompactControl):
+                record.props = tuple((intern(name), intern(value)) for name, value in record.props)
+            stack.extend(record.controls)
+        self.controls_by_id = {control.id: control for control in self.controls_by_id.values()}
+        self.groups_by_id = {group.id: group for group in self.groups}
+
+    # Raw access for read paths
+
+    def statement(self, record):
+        return self.strings.get(record.statement)
+
+    def control_json(self, record):
+        """The full JSON text of a top-level control, including edits made to its materialized model."""
+        model = self.models.get(record.id)
+        if model is not None:
+            return model.json(by_alias=True, exclude_none=True)
+        return self.strings.get(record.source)
+
+    def control_dict(self, record):
+        """Decode the full JSON of a top-level control, including edits made to its materialized model."""
+        return json_codec.loads(self.control_json(record))
+
+    def group_json(self, record):
+        """The JSON text of a group without its controls."""
+        model = self.group_models.get(record.id)
+        if model is not None:
+            return model.json(by_alias=True, exclude_none=True, exclude={"controls"})
+        return self.strings.get(record.source)
+
+    def group_dict(self, record, with_controls=False):
+        data = json_codec.loads(self.group_json(record))
+        if with_controls and record.controls:
+            data["controls"] = [self.control_dict(control) for control in record.controls]
+        return data
+
+    def to_dict(self):
+        """Decode the whole catalog back into the plain JSON object it was built from."""
+        data = json_codec.loads(self.strings.get(self.shell))
+        if self.groups:
+            data["groups"] = [self.group_dict(group, with_controls=True) for group in self.groups]
+        if self.controls:
+            data["controls"] = [self.control_dict(control) for control in self.controls]
+        if self.resource_sources:
+            data.setdefault("back-matter", {})["resources"] = [json_codec.loads(self.strings.get(position))
+                                                               for position in self.resource_sources.values()]
+        return data
+
+    def resource_dict(self, uuid):
+        position = self.resource_sources.get(uuid)
+        return json_codec.loads(self.strings.get(position)) if position is not None else None
+
+    def search_documents(self):
+        """Yield (id, text) for every group and top-level control."""
+        for group in self.groups:
+            yield group.id, " ".join(dict_text(self.group_dict(group), []))
+            for control in group.controls:
+                yield control.id, " ".join(dict_text(self.control_dict(control), []))
+        for control in self.controls:
+            yield control.id, " ".join(dict_text(self.control_dict(control), []))
+
+    # Conversion to pydantic
+
+    def materialize_control(self, control_id) -> Control:
+        model = self.models.get(control_id)
+        if model is None:
+            record = self.controls_by_id.get(control_id)
+            if record is None:
+                return None
+            model = Control.parse_raw(self.strings.get(record.source))
+            self.models[control_id] = model
+        return model
+
+    def materialize_group(self, group_id) -> ControlGroup:
+        model = self.group_models.get(group_id)
+        if model is None:
+            record = self.groups_by_id.get(group_id)
+            if record is None:
+                return None
+            model = ControlGroup.parse_raw(self.strings.get(record.source))
+            model.controls = [self.materialize_control(control.id) for control in record.controls] or None
+            self.group_models[group_id] = model
+        return model
+
+    def params(self):
+        return self.catalog_shell().params or []
+
+    def catalog_shell(self) -> Catalog:
+        if self.shell_model is None:
+            self.shell_model = Catalog.parse_raw(self.strings.get(self.shell))
+        return self.shell_model
+
+    def to_catalog(self) -> Catalog:
+        """Assemble a full pydantic Catalog, reusing every control already materialized."""
+        catalog = self.catalog_shell()
+        catalog.groups = [self.materialize_group(group.id) for group in self.groups] or None
+        catalog.controls = [self.materialize_control(control.id) for control in self.controls] or None
+        if self.resource_sources:
+            catalog.back_matter.resources = [Resource.parse_raw(self.strings.get(position))
+                                             for position in self.resource_sources.values()]
+        return catalog
+
+def catalog_dict(source):
+    """Plain JSON for a CompactCatalog or a pydantic Catalog, for code that works on raw OSCAL."""
+    if isinstance(source, CompactCatalog):
+        return source.to_dict()
+    return json_codec.loads(source.json(by_alias=True, exclude_none=True))
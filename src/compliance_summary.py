@@ -0,0 +1,142 @@
+# compliance_summary.py
+from collections import Counter
+
+# Dashboard statuses, in display order, with their labels
+STATUSES = {
+    "implemented": "Implemented",
+    "in-progress": "In Progress",
+    "not-applicable": "Not Applicable",
+    "not-implemented": "Not Implemented",
+}
+# OSCAL implementation-status values and common spellings folded into the dashboard statuses
+STATUS_ALIASES = {
+    "partial": "in-progress",
+    "partially-implemented": "in-progress",
+    "planned": "in-progress",
+    "alternative": "implemented",
+    "n/a": "not-applicable",
+    "": "not-implemented",
+}
+
+def normalize_status(value):
+    status = (value or "").strip().lower().replace("_", "-").replace(" ", "-")
+    return STATUS_ALIASES.get(status, status)
+
+def control_status(control):
+    """The implementation-status prop of a control dict, normalized."""
+    for prop in control.get("props") or []:
+        if prop.get("name") == "implementation-status":
+            return normalize_status(prop.get("value"))
+    return normalize_status(None)
+
+class FamilySummary:
+    """Counts for one control family (a top-level group) or the whole catalog."""
+    __slots__ = ("id", "title", "controls", "enhancements", "params", "statuses")
+
+    def __init__(self, id, title):
+        self.id = id
+        self.title = title
+        self.controls = 0
+        self.enhancements = 0
+        self.params = 0
+        self.statuses = Counter()  # Over controls and enhancements
+
+    def status_count(self, status):
+        return self.statuses.get(status, 0)
+
+class ComplianceSummary:
+    """Per-family and catalog-wide status, parameter and enhancement counts.
+
+    Built in one pass over a catalog dict and then kept current with set_status, add_control and
+    remove_control as controls are edited, so no view of it ever rescans the catalog.
+    """
+    def __init__(self):
+        self.families = {}  # Family id -> FamilySummary, in document order
+        self.total = FamilySummary("", "All families")
+        self.controls = {}  # Control id -> [family id, status, is enhancement, param count]
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        summary = cls()
+        summary.total.params += len(catalog.get("params") or [])
+        for group in catalog.get("groups") or []:
+            family = summary.family(group.get("id") or "", group.get("title") or "")
+            summary.add_group(group, family)
+        for control in catalog.get("controls") or []:
+            family_id = control["id"].split("-")[0]
+            summary.add_tree(control, summary.family(family_id, family_id.upper()), False)
+        return summary
+
+    def family(self, family_id, title):
+        family = self.families.get(family_id)
+        if family is None:
+            family = self.families[family_id] = FamilySummary(family_id, title)
+        return family
+
+    def add_group(self, group, family):
+        params = len(group.get("params") or [])
+        family.params += params
+        self.total.params += params
+        for control in group.get("controls") or []:
+            self.add_tree(control, family, False)
+        for subgroup in group.get("groups") or []:
+            self.add_group(subgroup, family)
+
+    def add_tree(self, control, family, enhancement):
+        self.add_control(control["id"], family.id, control_status(control), enhancement, len(control.get("params") or []))
+        for child in control.get("controls") or []:
+            self.add_tree(child, family, True)
+
+    def add_control(self, control_id, family_id, status="not-implemented", enhancement=False, params=0):
+        """Count a new control (or enhancement) in a family; the family is created if needed."""
+        family = self.family(family_id, family_id)
+        self.controls[control_id] = [family_id, status, enhancement, params]
+        for counts in (family, self.total):
+            if enhancement:
+                counts.enhancements += 1
+            else:
+                counts.controls += 1
+            counts.params += params
+            counts.statuses[status] += 1
+
+    def remove_control(self, control_id):
+        record = self.controls.pop(control_id, None)
+        if record is None:
+            return
+        family_id, status, enhancement, params = record
+        for counts in (self.families[family_id], self.total):
+            if enhancement:
+                counts.enhancements -= 1
+            else:
+                counts.controls -= 1
+            counts.params -= params
+            counts.statuses[status] -= 1
+
+    def remove_family(self, family_id):
+        """Forget a deleted group with its controls, enhancements and parameters."""
+        for control_id in [key for key, record in self.controls.items() if record[0] == family_id]:
+            self.remove_control(control_id)
+        family = self.families.pop(family_id, None)
+        if family is not None:
+            self.total.params -= family.params
+
+    def set_status(self, control_id, value):
+        """Move one control between status counts; returns False if the control is not tracked."""
+        record = self.controls.get(control_id)
+        if record is None:
+            return False
+        status = normalize_status(value)
+        if status != record[1]:
+            for counts in (self.families[record[0]], self.total):
+                counts.statuses[record[1]] -= 1
+                counts.statuses[status] += 1
+            record[1] = status
+        return True
+
+    def status(self, control_id):
+        record = self.controls.get(control_id)
+        return record[1] if record else None
+
+    def rows(self):
+        """Each family's counts followed by the catalog-wide total."""
+        return list(self.families.values()) + [self.total]
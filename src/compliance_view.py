@@ -0,0 +1,55 @@
+# compliance_view.py
+import tkinter as tk
+from tkinter import ttk
+from compliance_summary import STATUSES
+
+class ComplianceWindow(tk.Toplevel):
+    """Per-family implementation status of the active catalog, refreshed as controls are saved."""
+    def __init__(self, manager, entry, summary):
+        super().__init__(manager.root)
+        self.manager = manager
+        self.entry = entry
+        self.summary = summary
+        self.title(f"Compliance - {entry.title}")
+        self.configure(bg=manager.theme["bg"])
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.total_label = tk.Label(self, anchor="w", bg=manager.theme["bg"], fg=manager.theme["fg"])
+        self.total_label.pack(fill="x", padx=10, pady=5)
+
+        frame = ttk.Frame(self)
+        frame.pack(fill="both", expand=True, padx=10)
+        columns = ("Family", "Controls", "Enhancements", "Parameters") + tuple(STATUSES.values())
+        self.table = ttk.Treeview(frame, columns=columns, show="headings", height=22)
+        for column in columns:
+            self.table.heading(column, text=column)
+            self.table.column(column, width=220 if column == "Family" else 95, anchor="w" if column == "Family" else "e")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
+        self.table.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.table.tag_configure("total", font=("Helvetica", 10, "bold"))
+
+        buttons = ttk.Frame(self)
+        buttons.pack(fill="x", padx=10, pady=5)
+        tk.Button(buttons, text="Close", command=self.close).pack(side="right")
+        self.refresh()
+
+    def refresh(self):
+        """Redraw from the summary's running counts; nothing is recomputed from the catalog."""
+        self.table.delete(*self.table.get_children())
+        total = self.summary.total
+        for family in self.summary.rows():
+            name = "Total" if family is total else f"{family.id}: {family.title}"
+            self.table.insert("", "end", tags=("total",) if family is total else (),
+                              values=(name, family.controls, family.enhancements, family.params)
+                              + tuple(family.status_count(status) for status in STATUSES))
+        tracked = total.controls + total.enhancements
+        implemented = total.status_count("implemented")
+        percent = f"{100 * implemented / tracked:.1f}%" if tracked else "n/a"
+        self.total_label.config(text=f"{implemented} of {tracked} controls and enhancements implemented ({percent})")
+
+    def close(self):
+        if self.manager.compliance_window is self:
+            self.manager.compliance_window = None
+        self.destroy()
@@ -2,8 +2,8 @@
 import tkinter as tk
 from tkinter import ttk
 import webbrowser
-import re
-from oscal_pydantic.catalog import Control, Part
+from oscal_pydantic.catalog import Control, Part, Property
+from catalog_validator import PARAM_INSERT_PATTERN
 
 class ControlDetails(ttk.Frame):
     """Handles display and editing of control details."""
@@ -49,7 +49,10 @@ class ControlDetails(ttk.Frame):
         tk.Label(self, text="Related Links:").grid(row=8, column=0, sticky="ne", padx=5, pady=5)
         self.links_frame = ttk.Frame(self)
         self.links_frame.grid(row=8, column=1, pady=5, sticky="w")
-        self.link_labels = []
+        self.link_labels = []  # Pool of link labels, reused across loads
+        self.link_targets = []  # (link_type, target) shown by each pooled label
+        self.visible_links = 0
+        self.loaded_state = None  # form_state() right after load, to tell real edits from a re-save
 
         tk.Label(self, text="Enhancements:").grid(row=9, column=0, sticky="ne", padx=5, pady=5)
         self.enhancements_text = tk.Text(self, height=3, width=80)
@@ -79,15 +82,14 @@ class ControlDetails(ttk.Frame):
             label.configure(bg=theme["bg"], fg="#00b7eb" if self.manager.is_dark_mode else "blue")
 
     def parse_prose(self, prose, control_params, catalog_params):
-        pattern = r"(\{\{\s*insert:\s*param,\s*(\w+)\s*\}\})"
-        parts = re.split(pattern, prose)
+        parts = PARAM_INSERT_PATTERN.split(prose)
         result = []
-        for i in range(0, len(parts), 3):
+        for i in range(0, len(parts), 2):
             text = parts[i]
             if text:
                 result.append((text, "normal"))
             if i + 1 < len(parts):
-                param_id = parts[i + 2]
+                param_id = parts[i + 1]
                 param = next((p for p in control_params if p.id == param_id), None)
                 if not param:
                     param = next((p for p in catalog_params if p.id == param_id), None)
@@ -98,38 +100,32 @@ class ControlDetails(ttk.Frame):
                     result.append((f"[Unknown param: {param_id}]", "param"))
         return result
 
-    def load(self, control: Control):
-        self.id_var.set(control.id or "No ID")
-        self.title_var.set(control.title or "")
-        self.desc_text.delete("1.0", tk.END)
+    def build_model(self, control: Control):
+        """Compute everything load() displays for a control as plain strings and tuples."""
+        model = {"id": control.id or "No ID", "title": control.title or ""}
+        catalog_params = self.manager.active.params()
+        segments = []
         for part in control.parts or []:
             if hasattr(part, 'name'):
                 if part.name == "statement" and part.prose:
-                    segments = self.parse_prose(part.prose, control.params or [], self.manager.catalog.params or [])
-                    for text, tag in segments:
-                        self.desc_text.insert(tk.END, text, tag)
-                    self.desc_text.insert(tk.END, "\n")
+                    segments.extend(self.parse_prose(part.prose, control.params or [], catalog_params))
+                    segments.append(("\n", "normal"))
             else:
                 if part.get("name") == "statement" and part.get("prose"):
-                    segments = self.parse_prose(part["prose"], control.params or [], self.manager.catalog.params or [])
-                    for text, tag in segments:
-                        self.desc_text.insert(tk.END, text, tag)
-                    self.desc_text.insert(tk.END, "\n")
+                    segments.extend(self.parse_prose(part["prose"], control.params or [], catalog_params))
+                    segments.append(("\n", "normal"))
+        model["segments"] = segments
 
         props = "\n".join(f"{prop.name}: {prop.value}" for prop in control.props or [])
-        self.props_text.delete("1.0", tk.END)
-        self.props_text.insert("1.0", props or "No properties.")
+        model["props"] = props or "No properties."
 
         items = "\n".join(part.prose for part in control.parts or [] if part.name == "item")
-        self.items_text.delete("1.0", tk.END)
-        self.items_text.insert("1.0", items or "No statement items.")
+        model["items"] = items or "No statement items."
 
         roles = "\n".join(link.role_id for link in control.links or [] if link.rel == "responsible-role")
-        self.roles_text.delete("1.0", tk.END)
-        self.roles_text.insert("1.0", roles or "No responsible roles.")
+        model["roles"] = roles or "No responsible roles."
 
-        status = next((prop.value for prop in control.props or [] if prop.name == "implementation-status"), "")
-        self.status_var.set(status)
+        model["status"] = next((prop.value for prop in control.props or [] if prop.name == "implementation-status"), "")
 
         refs = []
         for link in control.links or []:
@@ -141,94 +137,164 @@ class ControlDetails(ttk.Frame):
                     refs.append(f"{control_title or 'Unknown'} ({target_id})")
                 else:
                     refs.append(href)
-        self.refs_text.delete("1.0", tk.END)
-        self.refs_text.insert("1.0", "\n".join(refs) or "No references.")
+        model["refs"] = "\n".join(refs) or "No references."
 
-        for label in self.link_labels:
-            label.destroy()
-        self.link_labels = []
+        links = []
         for link in control.links or []:
             if link.rel == "related":
                 href = link.href
                 link_type = "Internal" if href.startswith("#") else "External"
                 display_text = href if link_type == "External" else f"{self.manager.get_control_title_by_id(href[1:]) or 'Unknown'} ({href[1:]})"
-                lbl = tk.Label(self.links_frame, text=f"{display_text} ({link_type})", cursor="hand2")
-                lbl.pack(anchor="w")
-                if link_type == "External":
-                    lbl.bind("<Button-1>", lambda e, url=href: webbrowser.open(url))
-                else:
-                    lbl.bind("<Button-1>", lambda e, tid=href[1:]: self.manager.select_control_by_id(tid, from_link=True))
-                self.link_labels.append(lbl)
+                links.append((f"{display_text} ({link_type})", link_type, href if link_type == "External" else href[1:]))
+        model["links"] = links
 
         enhancements = "\n".join(f"{ctrl.id}: {ctrl.title}" for ctrl in control.controls or [])
-        self.enhancements_text.delete("1.0", tk.END)
-        self.enhancements_text.insert("1.0", enhancements or "No enhancements.")
+        model["enhancements"] = enhancements or "No enhancements."
 
         params_info = ""
         referenced_param_ids = set()
         for part in control.parts or []:
             if part.name == "statement" and part.prose:
-                matches = re.findall(r"\{\{\s*insert:\s*param,\s*(\w+)\s*\}\}", part.prose)
+                matches = PARAM_INSERT_PATTERN.findall(part.prose)
                 referenced_param_ids.update(matches)
-        all_params = (control.params or []) + (self.manager.catalog.params or [])
+        all_params = (control.params or []) + catalog_params
         displayed_params = set()
         for param_id in referenced_param_ids:
             param = next((p for p in all_params if p.id == param_id), None)
             if param and param.id not in displayed_params:
-                params_info += f"ID: {param.id}\n"
-                if param.label:
-                    params_info += f"Label: {param.label}\n"
-                if param.usage:
-                    params_info += f"Usage: {param.usage}\n"
-                if param.constraints:
-                    params_info += "Constraints:\n"
-                    for constraint in param.constraints:
-                        params_info += f" - {constraint.description}\n"
-                params_info += "\n"
+                params_info += self.format_param(param)
                 displayed_params.add(param.id)
         for param in control.params or []:
             if param.id not in displayed_params:
-                params_info += f"ID: {param.id}\n"
-                if param.label:
-                    params_info += f"Label: {param.label}\n"
-                if param.usage:
-                    params_info += f"Usage: {param.usage}\n"
-                if param.constraints:
-                    params_info += "Constraints:\n"
-                    for constraint in param.constraints:
-                        params_info += f" - {constraint.description}\n"
-                params_info += "\n"
+                params_info += self.format_param(param)
                 displayed_params.add(param.id)
+        model["params"] = params_info or "No parameters."
+        return model
+
+    def format_param(self, param):
+        info = f"ID: {param.id}\n"
+        if param.label:
+            info += f"Label: {param.label}\n"
+        if param.usage:
+            info += f"Usage: {param.usage}\n"
+        if param.constraints:
+            info += "Constraints:\n"
+            for constraint in param.constraints:
+                info += f" - {constraint.description}\n"
+        return info + "\n"
+
+    def get_model(self, control: Control):
+        """Return the detail model for a control, building and caching it on a miss."""
+        cache = self.manager.detail_cache
+        key = self.manager.cache_key(control.id)
+        model = cache.get(key)
+        if model is None:
+            model = self.build_model(control)
+            cache.put(key, model)
+        return model
+
+    def load(self, control: Control):
+        model = self.get_model(control)
+        self.manager.detail_cache.log_stats()
+        self.id_var.set(model["id"])
+        self.title_var.set(model["title"])
+        self.desc_text.delete("1.0", tk.END)
+        for text, tag in model["segments"]:
+            self.desc_text.insert(tk.END, text, tag)
+
+        self.props_text.delete("1.0", tk.END)
+        self.props_text.insert("1.0", model["props"])
+        self.items_text.delete("1.0", tk.END)
+        self.items_text.insert("1.0", model["items"])
+        self.roles_text.delete("1.0", tk.END)
+        self.roles_text.insert("1.0", model["roles"])
+        self.status_var.set(model["status"])
+        self.refs_text.delete("1.0", tk.END)
+        self.refs_text.insert("1.0", model["refs"])
+
+        for index, (text, link_type, target) in enumerate(model["links"]):
+            self.get_link_label(index).configure(text=text)
+            self.link_targets[index] = (link_type, target)
+        self.show_link_labels(len(model["links"]))
+
+        self.enhancements_text.delete("1.0", tk.END)
+        self.enhancements_text.insert("1.0", model["enhancements"])
         self.params_text.delete("1.0", tk.END)
-        self.params_text.insert("1.0", params_info or "No parameters.")
+        self.params_text.insert("1.0", model["params"])
+        self.loaded_state = self.form_state()
 
         self.update_colors()
 
+    def form_state(self):
+        """The editable fields as the form shows them."""
+        return {"title": self.title_var.get(), "desc": self.desc_text.get("1.0", tk.END).strip(),
+                "props": self.props_text.get("1.0", tk.END).strip(), "status": self.status_var.get()}
+
+    def is_modified(self):
+        return self.loaded_state is not None and self.form_state() != self.loaded_state
+
+    def get_link_label(self, index):
+        """Return the pooled link label at index, creating it on first use."""
+        if index < len(self.link_labels):
+            return self.link_labels[index]
+        lbl = tk.Label(self.links_frame, cursor="hand2")
+        lbl.bind("<Button-1>", lambda e, i=index: self.on_link_click(i))
+        self.link_labels.append(lbl)
+        self.link_targets.append(None)
+        return lbl
+
+    def show_link_labels(self, count):
+        """Map the first count pooled labels and unmap the rest, keeping their order."""
+        for lbl in self.link_labels[count:self.visible_links]:
+            lbl.pack_forget()
+        for lbl in self.link_labels[self.visible_links:count]:
+            lbl.pack(anchor="w")
+        self.visible_links = count
+
+    def on_link_click(self, index):
+        if index >= self.visible_links or not self.link_targets[index]:
+            return
+        link_type, target = self.link_targets[index]
+        if link_type == "External":
+            webbrowser.open(target)
+        else:
+            self.manager.select_control_by_id(target, from_link=True)
+
     def save(self, control: Control):
         control.title = self.title_var.get()
-        for part in control.parts or []:
-            if part.name == "statement":
-                part.prose = self.desc_text.get("1.0", tk.END).strip()
-                break
-        else:
-            control.parts = control.parts or []
-            control.parts.append(Part(name="statement", prose=self.desc_text.get("1.0", tk.END).strip()))
+        desc = self.desc_text.get("1.0", tk.END).strip()
+        # The description shows parameter inserts as [label]; only an edited one replaces the prose
+        if self.loaded_state is None or desc != self.loaded_state["desc"]:
+            for part in control.parts or []:
+                if part.name == "statement":
+                    part.prose = desc
+                    break
+            else:
+                control.parts = control.parts or []
+                control.parts.append(Part(name="statement", prose=desc))
+        # Props may be shared between catalogs in a workspace, so they are replaced, never mutated
+        existing = {(prop.name, prop.value): prop for prop in control.props or []}
         props_text = self.props_text.get("1.0", tk.END).strip()
+        props = []
         if props_text and props_text != "No properties.":
-            control.props = []
             for line in props_text.split("\n"):
                 if ": " in line:
-                    name, value = line.split(": ", 1)
-                    control.props.append({"name": name.strip(), "value": value.strip()})
-        else:
-            control.props = []
+                    name, value = (text.strip() for text in line.split(": ", 1))
+                    props.append(existing.get((name, value)) or Property(name=name, value=value))
         status = self.status_var.get()
         if status:
-            if not control.props:
-                control.props = []
-            for prop in control.props:
+            for index, prop in enumerate(props):
                 if prop.name == "implementation-status":
-                    prop.value = status
+                    if prop.value != status:
+                        props[index] = Property(name="implementation-status", value=status)
                     break
             else:
-                control.props.append({"name": "implementation-status", "value": status})
+                props.append(Property(name="implementation-status", value=status))
+        control.props = props or None
+        entry = self.manager.details_pane.current_entry or self.manager.active
+        status = next((prop.value for prop in props if prop.name == "implementation-status"), None)
+        self.manager.update_compliance(entry, "set_status", control.id, status)
+        self.manager.record_edit(entry, "control", control.id)
+        self.manager.detail_cache.bump()
+        self.manager.search_index.update(control.id, control)
+        self.loaded_state = self.form_state()
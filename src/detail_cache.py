@@ -0,0 +1,53 @@
+# detail_cache.py
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DetailCache:
+    """LRU cache of rendered detail models keyed by (object id, catalog revision)."""
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self.revision = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, item_id):
+        key = (item_id, self.revision)
+        model = self.entries.get(key)
+        if model is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return model
+
+    def put(self, item_id, model):
+        self.entries[(item_id, self.revision)] = model
+        self.entries.move_to_end((item_id, self.revision))
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def peek(self, item_id):
+        """Return a cached model without touching recency or hit statistics."""
+        return self.entries.get((item_id, self.revision))
+
+    def contains(self, item_id):
+        return (item_id, self.revision) in self.entries
+
+    def bump(self):
+        """Invalidate every cached model after the catalog has been edited."""
+        self.revision += 1
+        self.entries.clear()
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {"size": len(self.entries), "max_size": self.max_size, "revision": self.revision,
+                "hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate(), 3)}
+
+    def log_stats(self):
+        logger.debug("Detail cache: %s", self.stats())
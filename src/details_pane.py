@@ -15,6 +15,8 @@ class DetailsPane(ttk.Frame):
         self.nav_frame.pack(fill="x", pady=5)
         self.back_button = tk.Button(self.nav_frame, text="Back", command=self.manager.go_back, state=tk.DISABLED)
         self.back_button.pack(side="left", padx=5)
+        self.forward_button = tk.Button(self.nav_frame, text="Forward", command=self.manager.go_forward, state=tk.DISABLED)
+        self.forward_button.pack(side="left", padx=5)
         self.new_control_button = tk.Button(self.nav_frame, text="New Control", command=self.manager.new_control)
         self.new_control_button.pack(side="left", padx=5)
         self.new_group_button = tk.Button(self.nav_frame, text="New Group", command=self.manager.new_group)
@@ -25,6 +27,18 @@ class DetailsPane(ttk.Frame):
         self.delete_group_button.pack(side="left", padx=5)
         self.save_button = tk.Button(self.nav_frame, text="Save Changes", command=self.manager.save_changes)
         self.save_button.pack(side="left", padx=5)
+        self.validate_button = tk.Button(self.nav_frame, text="Validate", command=self.manager.validate_catalogs)
+        self.validate_button.pack(side="left", padx=5)
+        self.compare_button = tk.Button(self.nav_frame, text="Compare...", command=self.manager.compare_catalog)
+        self.compare_button.pack(side="left", padx=5)
+        self.compliance_button = tk.Button(self.nav_frame, text="Compliance", command=self.manager.show_compliance)
+        self.compliance_button.pack(side="left", padx=5)
+        self.export_button = tk.Button(self.nav_frame, text="Export...", command=self.manager.export_catalog)
+        self.export_button.pack(side="left", padx=5)
+        self.export_progress = ttk.Progressbar(self.nav_frame, length=120, mode="determinate")
+
+        self.preview_label = tk.Label(self, text="", anchor="w", font=("Helvetica", 11, "bold"))
+        self.preview_label.pack(fill="x", padx=5)
 
         self.canvas = tk.Canvas(self)
         self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
@@ -41,6 +55,7 @@ class DetailsPane(ttk.Frame):
         self.no_selection_label.pack(pady=5)
         self.current_details = None
         self.current_object = None
+        self.current_entry = None  # Workspace entry owning current_object
 
         self.update_colors()
 
@@ -50,18 +65,43 @@ class DetailsPane(ttk.Frame):
         self.canvas.configure(bg=theme["bg"])
         self.scrollable_frame.configure(style="TFrame")
         self.no_selection_label.configure(bg=theme["bg"], fg=theme["fg"])
-        for button in [self.back_button, self.new_control_button, self.new_group_button, 
-                       self.delete_control_button, self.delete_group_button, self.save_button]:
+        self.preview_label.configure(bg=theme["bg"], fg=theme["fg"])
+        for button in [self.back_button, self.forward_button, self.new_control_button, self.new_group_button, 
+                       self.delete_control_button, self.delete_group_button, self.save_button, self.validate_button,
+                       self.compare_button, self.compliance_button, self.export_button]:
             button.configure(bg=theme["button_bg"], fg=theme["fg"], disabledforeground=theme["disabled_fg"])
         self.group_details.update_colors()
         self.control_details.update_colors()
 
+    def show_export_progress(self, done, total):
+        """Show the export bar next to the Export button; total is 0 until the first group is done."""
+        self.export_button.config(state=tk.DISABLED)
+        if not self.export_progress.winfo_ismapped():
+            self.export_progress.pack(side="left", padx=5)
+        if total:
+            self.export_progress.stop()
+            self.export_progress.config(mode="determinate", maximum=total, value=done)
+        elif self.export_progress.cget("mode") != "indeterminate":
+            self.export_progress.config(mode="indeterminate")
+            self.export_progress.start(50)
+
+    def hide_export_progress(self):
+        self.export_progress.stop()
+        self.export_progress.pack_forget()
+        self.export_button.config(state=tk.NORMAL)
+
+    def show_preview(self, item_id, title):
+        """Cheaply show the id and title of a selection whose details are still pending."""
+        self.preview_label.config(text=f"{item_id}: {title}")
+
     def show_group(self, group: ControlGroup):
+        self.preview_label.config(text=f"{group.id}: {group.title}")
         self.control_details.pack_forget()
         self.group_details.pack(fill="both", expand=True, padx=5, pady=5)
         self.group_details.load(group)
         self.current_details = self.group_details
         self.current_object = group
+        self.current_entry = self.manager.active
         self.no_selection_label.pack_forget()
         self.new_control_button.config(state=tk.NORMAL)
         self.new_group_button.config(state=tk.NORMAL)
@@ -70,11 +110,13 @@ class DetailsPane(ttk.Frame):
         self.update_colors()
 
     def show_control(self, control: Control):
+        self.preview_label.config(text=f"{control.id}: {control.title}")
         self.group_details.pack_forget()
         self.control_details.pack(fill="both", expand=True, padx=5, pady=5)
         self.control_details.load(control)
         self.current_details = self.control_details
         self.current_object = control
+        self.current_entry = self.manager.active
         self.no_selection_label.pack_forget()
         self.new_control_button.config(state=tk.DISABLED)
         self.new_group_button.config(state=tk.NORMAL)
@@ -86,14 +128,20 @@ class DetailsPane(ttk.Frame):
         self.group_details.pack_forget()
         self.control_details.pack_forget()
         self.no_selection_label.pack()
+        self.preview_label.config(text="")
         self.current_details = None
         self.current_object = None
+        self.current_entry = None
         self.new_control_button.config(state=tk.DISABLED)
         self.new_group_button.config(state=tk.NORMAL)
         self.delete_control_button.config(state=tk.DISABLED)
         self.delete_group_button.config(state=tk.DISABLED)
         self.update_colors()
 
+    def is_modified(self):
+        """Whether the open form differs from the group or control it was loaded from."""
+        return bool(self.current_details and self.current_object and self.current_details.is_modified())
+
     def save_current(self):
         if self.current_details and self.current_object:
             self.current_details.save(self.current_object)
@@ -0,0 +1,79 @@
+# diff_view.py
+import json
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from catalog_diff import index_catalog, diff_indexes, summarize, diff_report_html, diff_report_json
+
+class DiffWindow(tk.Toplevel):
+    """Lists the changes between a catalog file and the catalog being edited."""
+    def __init__(self, manager, old_catalog, new_catalog, old_label):
+        super().__init__(manager.root)
+        self.manager = manager
+        self.old_catalog = old_catalog
+        self.new_catalog = new_catalog
+        self.old_index = index_catalog(old_catalog)
+        self.new_index = index_catalog(new_catalog)
+        self.changes = diff_indexes(self.old_index, self.new_index)
+        self.title(f"Changes since {old_label}")
+        self.configure(bg=manager.theme["bg"])
+
+        summary = ", ".join(f"{count} {name}" for name, count in summarize(self.changes).items()) or "No changes"
+        tk.Label(self, text=summary, anchor="w", bg=manager.theme["bg"], fg=manager.theme["fg"]).pack(fill="x", padx=10, pady=5)
+
+        frame = ttk.Frame(self)
+        frame.pack(fill="both", expand=True, padx=10)
+        self.list = ttk.Treeview(frame, columns=("Change", "Kind", "ID", "Where", "Fields"), show="headings", height=20)
+        for column, width in (("Change", 80), ("Kind", 70), ("ID", 140), ("Where", 160), ("Fields", 260)):
+            self.list.heading(column, text=column)
+            self.list.column(column, width=width)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.list.yview)
+        self.list.configure(yscrollcommand=scrollbar.set)
+        self.list.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        for position, change in enumerate(self.changes):
+            if change.change == "moved" and change.old_parent != change.new_parent:
+                where = f"{change.old_parent or '(catalog)'} → {change.new_parent or '(catalog)'}"
+            else:
+                where = (change.old_parent if change.change == "removed" else change.new_parent) or "(catalog)"
+            self.list.insert("", "end", iid=str(position), tags=(change.change,),
+                             values=(change.change, change.kind, change.id or "(catalog)", where, ", ".join(change.fields)))
+        self.list.tag_configure("added", foreground="#2e7d32")
+        self.list.tag_configure("removed", foreground="#c62828")
+        self.list.tag_configure("modified", foreground="#ef6c00")
+        self.list.tag_configure("moved", foreground="#1565c0")
+        self.list.bind("<Double-Button-1>", self.on_double_click)
+
+        buttons = ttk.Frame(self)
+        buttons.pack(fill="x", padx=10, pady=5)
+        tk.Button(buttons, text="Save Report...", command=self.save_report).pack(side="left")
+        tk.Button(buttons, text="Close", command=self.destroy).pack(side="right")
+
+    def on_double_click(self, event):
+        """Select the group or control that contains the change in the main tree."""
+        selected = self.list.selection()
+        if not selected:
+            return
+        change = self.changes[int(selected[0])]
+        index = self.new_index if change.id in self.new_index else self.old_index
+        key = change.id
+        while key and index[key].kind not in ("group", "control"):
+            key = index[key].parent
+        # Enhancements are not tree rows; show their top-level control instead
+        while key and index[key].kind == "control" and index.get(index[key].parent) and index[index[key].parent].kind == "control":
+            key = index[key].parent
+        if key and self.manager.find_tree_item_by_id(key):
+            self.manager.select_control_by_id(key)
+
+    def save_report(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".html",
+                                            filetypes=[("HTML report", "*.html"), ("JSON report", "*.json")])
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                if path.lower().endswith(".json"):
+                    json.dump(diff_report_json(self.old_catalog, self.new_catalog, self.changes), f, indent=2)
+                else:
+                    f.write(diff_report_html(self.old_catalog, self.new_catalog, self.changes))
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write report: {e}", parent=self)
@@ -0,0 +1,333 @@
+# export_formats.py
+import csv
+import gzip
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+import json_codec
+from catalog_validator import PARAM_INSERT_PATTERN
+from compliance_summary import ComplianceSummary, STATUSES, control_status
+from group_pool import map_groups
+try:
+    import brotli  # Optional, for .br precompressed copies
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Quality 11 is about 70 times slower than 9 on multi-megabyte pages for roughly 20% smaller output,
+# so streamed exports use 9 and only the small shared assets get 11
+BROTLI_STREAM_QUALITY = 9
+
+XML_ILLEGAL_PATTERN = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# One row per control or enhancement, shared by the tabular formats
+ROW_COLUMNS = ("family", "group", "id", "parent", "label", "title", "class", "status",
+               "parameters", "statement", "guidance", "related")
+
+def prop_value(item, name):
+    for prop in item.get("props") or []:
+        if prop.get("name") == name:
+            return prop.get("value")
+    return None
+
+def part_text(part, params):
+    """Prose of a part and its sub-parts, with parameter inserts replaced by their labels."""
+    texts = []
+    if part.get("prose"):
+        prose = PARAM_INSERT_PATTERN.sub(lambda match: f"[{params.get(match.group(1), match.group(1))}]", part["prose"])
+        label = prop_value(part, "label")
+        texts.append(f"{label} {prose}" if label else prose)
+    for sub_part in part.get("parts") or []:
+        texts.extend(part_text(sub_part, params))
+    return texts
+
+def control_record(control, parent, group, summary):
+    """The ROW_COLUMNS values of one control, computed once and handed to every format."""
+    params = {param["id"]: param.get("label") or param["id"] for param in control.get("params") or []}
+    statement, guidance = [], []
+    for part in control.get("parts") or []:
+        if part.get("name") == "statement":
+            statement.extend(part_text(part, params))
+        elif part.get("name") == "guidance":
+            guidance.extend(part_text(part, params))
+    status = summary.status(control["id"]) if summary else None
+    return {
+        "family": control["id"].split("-")[0],
+        "group": group.get("id", "") if group else "",
+        "id": control["id"],
+        "parent": parent["id"] if parent else "",
+        "label": prop_value(control, "label") or "",
+        "title": control.get("title", ""),
+        "class": control.get("class", ""),
+        "status": status or control_status(control),
+        "parameters": "; ".join(f"{param_id}: {label}" for param_id, label in params.items()),
+        "statement": "\n".join(statement),
+        "guidance": "\n".join(guidance),
+        "related": ", ".join(link["href"].lstrip("#") for link in control.get("links") or []
+                             if link.get("rel") == "related"),
+    }
+
+def control_events(control, group, summary, parent=None, depth=0):
+    yield "row", control, control_record(control, parent, group, summary), depth
+    for child in control.get("controls") or []:
+        yield from control_events(child, group, summary, control, depth + 1)
+
+def group_events(group, summary, depth=0):
+    """Section and row events for a group and everything under it, in document order."""
+    yield "section", group, None, depth
+    for control in group.get("controls") or []:
+        if "id" not in control:
+            print(f"Warning: Control missing 'id' field: {control}")
+            continue
+        yield from control_events(control, group, summary)
+    for subgroup in group.get("groups") or []:
+        yield from group_events(subgroup, summary, depth + 1)
+    yield "end_section", group, None, depth
+
+def render_fragment(events, formats):
+    """Feed one stream of events to every format; returns each format's text for it."""
+    fragments = [[] for _ in formats]
+    for kind, item, record, depth in events:
+        for fragment, export_format in zip(fragments, formats):
+            if kind == "row":
+                fragment.append(export_format.row(item, record, depth))
+            else:
+                fragment.append(getattr(export_format, kind)(item, depth))
+    return ["".join(fragment) for fragment in fragments]
+
+def render_group(group, formats, summary):
+    return render_fragment(group_events(group, summary), formats)
+
+def iter_export(catalog, formats, summary=None, workers=None, use_processes=None, progress=None):
+    """Yield each format's text for a catalog dict, one list of fragments at a time in document order.
+
+    The catalog is walked once whatever the number of formats. On large catalogs the groups are
+    rendered in parallel worker processes, and each group's fragments are yielded as soon as it
+    and every group before it are done. progress(done, total) is called after each group.
+    """
+    groups = catalog.get("groups") or []
+    summary = summary or ComplianceSummary.from_catalog(catalog)
+    yield [export_format.begin(catalog, summary) for export_format in formats]
+    fragments = map_groups(render_group, groups, (formats, summary), len(summary.controls), workers, use_processes)
+    for done, fragment in enumerate(fragments, 1):
+        yield fragment
+        if progress:
+            progress(done, len(groups))
+
+    def top_level_events():
+        for control in catalog.get("controls") or []:
+            if "id" in control:
+                yield from control_events(control, None, summary)
+    yield [export_format.top_level(catalog) + fragment for export_format, fragment
+           in zip(formats, render_fragment(top_level_events(), formats))]
+    yield [export_format.end(catalog, summary) for export_format in formats]
+
+def write_exports(catalog, outputs, summary=None, workers=None, use_processes=None, progress=None, compress=()):
+    """Write a catalog dict to several files in one pass; outputs maps each path to its format.
+
+    compress lists precompressed siblings ("gz", "br") to stream alongside each text output.
+    """
+    formats = list(outputs.values())
+    sinks = []
+    try:
+        for path, export_format in outputs.items():
+            sink = export_format.open(path)
+            sinks.append(CompressedSink(sink, path, compress) if compress and export_format.compressible else sink)
+        for fragments in iter_export(catalog, formats, summary, workers, use_processes, progress):
+            for sink, fragment in zip(sinks, fragments):
+                if fragment:
+                    sink.write(fragment)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return list(outputs)
+
+class CompressedSink:
+    """Passes text through to a sink and streams the same bytes into .gz and .br siblings of its file."""
+    def __init__(self, sink, path, compress):
+        self.sink = sink
+        self.gzip = gzip.GzipFile(path + ".gz", "wb", compresslevel=9, mtime=0) if "gz" in compress else None
+        self.brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=BROTLI_STREAM_QUALITY) if "br" in compress else None
+        self.brotli_file = open(path + ".br", "wb") if self.brotli else None
+
+    def write(self, text):
+        self.sink.write(text)
+        data = text.encode("utf-8")
+        if self.gzip:
+            self.gzip.write(data)
+        if self.brotli:
+            self.brotli_file.write(self.brotli.process(data))
+
+    def close(self):
+        self.sink.close()
+        if self.gzip:
+            self.gzip.close()
+        if self.brotli:
+            self.brotli_file.write(self.brotli.finish())
+            self.brotli_file.close()
+
+def write_compressed(path, data, compress=()):
+    """Write bytes to path, plus the precompressed siblings named in compress."""
+    with open(path, "wb") as f:
+        f.write(data)
+    if "gz" in compress:
+        with gzip.GzipFile(path + ".gz", "wb", compresslevel=9, mtime=0) as f:
+            f.write(data)
+    if "br" in compress:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, mode=brotli.MODE_TEXT))
+
+class ExportFormat:
+    """Text for each traversal event; subclasses override the events they render.
+
+    Formats are pickled to worker processes, so they hold options only, never output state.
+    """
+    extension = ""
+    compressible = True  # False for formats that are already compressed
+
+    def open(self, path):
+        return open(path, "w", encoding="utf-8", newline="")
+
+    def begin(self, catalog, summary):
+        return ""
+
+    def section(self, group, depth):
+        return ""
+
+    def row(self, control, record, depth):
+        return ""
+
+    def end_section(self, group, depth):
+        return ""
+
+    def top_level(self, catalog):
+        return ""
+
+    def end(self, catalog, summary):
+        return ""
+
+class CsvFormat(ExportFormat):
+    extension = ".csv"
+
+    def line(self, values):
+        out = io.StringIO()
+        csv.writer(out).writerow(values)
+        return out.getvalue()
+
+    def begin(self, catalog, summary):
+        return self.line(ROW_COLUMNS)
+
+    def row(self, control, record, depth):
+        return self.line(record.values())
+
+class JsonLinesFormat(ExportFormat):
+    extension = ".jsonl"
+
+    def row(self, control, record, depth):
+        return json_codec.dumps(record, compact=True) + "\n"
+
+class MarkdownFormat(ExportFormat):
+    extension = ".md"
+
+    def begin(self, catalog, summary):
+        title = catalog.get("metadata", {}).get("title", "Unnamed Catalog")
+        lines = [f"# {title}", "", "| Family | Controls | Enhancements | Parameters | "
+                 + " | ".join(STATUSES.values()) + " |", "|---" * (4 + len(STATUSES)) + "|"]
+        for family in summary.rows():
+            name = "**Total**" if family is summary.total else f"{family.title} ({family.id})"
+            counts = [family.controls, family.enhancements, family.params] + [family.status_count(s) for s in STATUSES]
+            lines.append(f"| {name} | " + " | ".join(str(count) for count in counts) + " |")
+        return "\n".join(lines) + "\n\n"
+
+    def section(self, group, depth):
+        return f"{'#' * min(depth + 2, 6)} {group.get('title', '')} ({group.get('id', '')})\n\n"
+
+    def row(self, control, record, depth):
+        text = f"{'#' * min(depth + 3, 6)} {record['label'] or record['id']} {record['title']}\n\n"
+        text += f"**Status:** {STATUSES.get(record['status'], record['status'])}\n\n"
+        if record["statement"]:
+            text += record["statement"].replace("\n", "\n\n") + "\n\n"
+        if record["parameters"]:
+            text += "".join(f"- {param}\n" for param in record["parameters"].split("; ")) + "\n"
+        if record["guidance"]:
+            text += f"*Guidance:* {record['guidance']}\n\n"
+        if record["related"]:
+            text += f"Related: {record['related']}\n\n"
+        return text
+
+    def top_level(self, catalog):
+        return "## Controls\n\n" if catalog.get("controls") else ""
+
+class XlsxSink:
+    """Streams worksheet XML into the sheet member of a minimal .xlsx package."""
+    PARTS = {
+        "[Content_Types].xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '</Types>',
+        "_rels/.rels": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>',
+        "xl/workbook.xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Controls" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        "xl/_rels/workbook.xml.rels": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>',
+    }
+
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        for name, content in self.PARTS.items():
+            self.archive.writestr(name, content)
+        self.sheet = self.archive.open("xl/worksheets/sheet1.xml", "w")
+
+    def write(self, text):
+        self.sheet.write(text.encode("utf-8"))
+
+    def close(self):
+        self.sheet.close()
+        self.archive.close()
+
+class XlsxFormat(ExportFormat):
+    """One worksheet of ROW_COLUMNS with inline strings, written with zipfile alone."""
+    extension = ".xlsx"
+    compressible = False
+    MAX_CELL = 32767  # Excel's limit on characters in a cell
+
+    def open(self, path):
+        return XlsxSink(path)
+
+    def line(self, values):
+        cells = "".join(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(xml_text(value)[:self.MAX_CELL])}</t></is></c>'
+                        for value in values)
+        return f"<row>{cells}</row>"
+
+    def begin(self, catalog, summary):
+        return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + self.line(ROW_COLUMNS))
+
+    def row(self, control, record, depth):
+        return self.line(record.values())
+
+    def end(self, catalog, summary):
+        return "</sheetData></worksheet>"
+
+def xml_text(value):
+    """Drop the control characters XML 1.0 cannot carry."""
+    return XML_ILLEGAL_PATTERN.sub("", str(value))
+
+FORMATS = {
+    "csv": CsvFormat,
+    "md": MarkdownFormat,
+    "jsonl": JsonLinesFormat,
+    "xlsx": XlsxFormat,
+}
@@ -0,0 +1,382 @@
+# findings_store.py
+import argparse
+import hashlib
+import os
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+import json_codec
+try:
+    import numpy  # Optional, vectorizes queries; the store itself only needs the array module
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Column name -> array typecode; dictionary-encoded columns hold codes into the dictionaries in meta.json
+COLUMNS = {
+    "scan_time": "q",
+    "asset": "I",
+    "qid": "I",
+    "os": "H",
+    "category": "H",
+    "status": "H",
+    "severity": "b",
+    "first_detected": "q",
+    "last_detected": "q",
+}
+DICTIONARY_COLUMNS = ("asset", "qid", "os", "category", "status")
+TIME_COLUMNS = ("scan_time", "first_detected", "last_detected")
+FIXED_STATUSES = ("Fixed", "Mitigated")
+BUCKETS = ("day", "week", "month")
+DAY = 86400
+
+def parse_time(value):
+    """Epoch seconds of an ISO-8601 timestamp, or 0 when missing or unparseable."""
+    if not value:
+        return 0
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def bucket_index(seconds, bucket):
+    """Integer index of the day, week (from Monday) or month containing each timestamp; works on ints and arrays."""
+    days = seconds // DAY
+    if bucket == "day":
+        return days
+    if bucket == "week":
+        return (days + 3) // 7  # 1970-01-01 was a Thursday
+    if NUMPY_AVAILABLE and isinstance(seconds, numpy.ndarray):
+        return seconds.astype("datetime64[s]").astype("datetime64[M]").astype(numpy.int64)
+    moment = datetime.fromtimestamp(seconds, timezone.utc)
+    return (moment.year - 1970) * 12 + moment.month - 1
+
+def bucket_label(index, bucket):
+    if bucket == "month":
+        return f"{1970 + index // 12:04d}-{index % 12 + 1:02d}"
+    days = index * 7 - 3 if bucket == "week" else index
+    return datetime.fromtimestamp(days * DAY, timezone.utc).strftime("%Y-%m-%d")
+
+class FindingsStore:
+    """Append-only columnar history of Qualys detections, one row per detection per scan.
+
+    Each column is a flat binary file of fixed-width values; asset, QID, OS, category and status
+    are dictionary-encoded. meta.json holds the dictionaries and the committed row count, and is
+    replaced last on every append so a crash mid-append never exposes partial rows.
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        try:
+            meta = json_codec.load(self.meta_path())
+        except (OSError, json_codec.DecodeError):
+            meta = {}
+        self.rows = meta.get("rows", 0)
+        self.scans = meta.get("scans", [])  # [scan_time, row count] per append, in row order
+        self.digests = meta.get("digests", [])  # Payload digests of scans appended without a scan time
+        self.dictionaries = {name: meta.get("dictionaries", {}).get(name, []) for name in DICTIONARY_COLUMNS}
+        self.codes = {name: {value: code for code, value in enumerate(values)}
+                      for name, values in self.dictionaries.items()}
+        self.cache = {}
+
+    def meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    def column_path(self, name):
+        return os.path.join(self.path, f"{name}.col")
+
+    def encode(self, name, value):
+        codes = self.codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.dictionaries[name].append(value)
+        return code
+
+    def append(self, vulnerabilities, scan_time=None):
+        """Add one scan's detections; returns the number of rows written, or None if the scan is
+        already stored (converting the same export twice must not double its counts).
+
+        A scan is identified by its time, or without one by a digest of its detections; it is then
+        stored at the time of the append.
+        """
+        scan_seconds = parse_time(scan_time)
+        digest = None
+        if not scan_seconds:
+            payload = json_codec.dumps(vulnerabilities, compact=True).encode("utf-8")
+            digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+            if digest in self.digests:
+                return None
+            scan_seconds = int(datetime.now(timezone.utc).timestamp())
+        elif any(stored == scan_seconds for stored, _ in self.scans):
+            return None
+        columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        encode = self.encode
+        for vuln in vulnerabilities:
+            columns["scan_time"].append(scan_seconds)
+            columns["asset"].append(encode("asset", str(vuln.get("asset_id", "Unknown"))))
+            columns["qid"].append(encode("qid", str(vuln.get("vuln_id", "Unknown"))))
+            columns["os"].append(encode("os", vuln.get("os", "Unknown")))
+            columns["category"].append(encode("category", vuln.get("category", "Unknown")))
+            columns["status"].append(encode("status", vuln.get("status", "Active")))
+            columns["severity"].append(vuln.get("severity") if isinstance(vuln.get("severity"), int) else 0)
+            columns["first_detected"].append(parse_time(vuln.get("first_detected")))
+            columns["last_detected"].append(parse_time(vuln.get("last_detected")))
+        added = len(columns["scan_time"])
+        for name, values in columns.items():
+            with open(self.column_path(name), "ab") as f:
+                f.truncate(self.rows * values.itemsize)  # Drop rows left by an interrupted append
+                values.tofile(f)
+        self.rows += added
+        self.scans.append([scan_seconds, added])
+        if digest is not None:
+            self.digests.append(digest)
+        temp_path = self.meta_path() + ".tmp"
+        json_codec.dump({"rows": self.rows, "scans": self.scans, "digests": self.digests,
+                         "dictionaries": self.dictionaries}, temp_path, compact=True)
+        os.replace(temp_path, self.meta_path())
+        self.cache.clear()
+        return added
+
+    def column(self, name):
+        """The committed values of a column, as a numpy array when numpy is installed."""
+        values = self.cache.get(name)
+        if values is None:
+            typecode = COLUMNS[name]
+            if not os.path.exists(self.column_path(name)):
+                values = numpy.zeros(0, typecode) if NUMPY_AVAILABLE else array(typecode)
+            elif NUMPY_AVAILABLE:
+                values = numpy.fromfile(self.column_path(name), dtype=typecode, count=self.rows)
+            else:
+                values = array(typecode)
+                with open(self.column_path(name), "rb") as f:
+                    values.fromfile(f, self.rows)
+            self.cache[name] = values
+        return values
+
+    def filter_codes(self, name, value):
+        """The stored values matching a filter value (or list of values) on a column."""
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        if name in DICTIONARY_COLUMNS:
+            codes = self.codes[name]
+            return [codes[str(item)] for item in values if str(item) in codes]
+        return [int(item) for item in values]
+
+    def mask(self, filters):
+        """Row selection for {column: value or values}; None selects every row."""
+        if not filters:
+            return None
+        if NUMPY_AVAILABLE:
+            selected = None
+            for name, value in filters.items():
+                codes = self.filter_codes(name, value)
+                column = self.column(name)
+                matches = column == codes[0] if len(codes) == 1 else numpy.isin(column, numpy.array(codes, dtype=column.dtype))
+                selected = matches if selected is None else selected & matches
+            return selected
+        columns = [(self.column(name), set(self.filter_codes(name, value))) for name, value in filters.items()]
+        return [row for row in range(self.rows) if all(column[row] in wanted for column, wanted in columns)]
+
+    def scan_buckets(self, bucket):
+        """Bucket index of every row's scan_time, expanded from the per-append scan runs."""
+        runs = numpy.array(self.scans, dtype=numpy.int64).reshape(-1, 2)
+        return numpy.repeat(bucket_index(runs[:, 0], bucket), runs[:, 1])
+
+    def time_buckets(self, times, bucket):
+        """Bucket indexes for an array of epoch seconds; months go through a per-day lookup table."""
+        days = times // DAY
+        if bucket == "day":
+            return days
+        if bucket == "week":
+            return (days + 3) // 7
+        if not len(days):
+            return days
+        low = int(days.min())
+        table = bucket_index(numpy.arange(low, int(days.max()) + 1, dtype=numpy.int64) * DAY, "month")
+        return table[days - low]
+
+    def key_columns(self, by, bucket, time_column, selected):
+        """Selected rows of each grouping column, with the time column replaced by bucket indexes."""
+        keys = []
+        for name in by:
+            values = self.column(name)
+            if NUMPY_AVAILABLE:
+                keys.append(values if selected is None else values[selected])
+            else:
+                keys.append(values if selected is None else [values[row] for row in selected])
+        if bucket:
+            if NUMPY_AVAILABLE:
+                if time_column == "scan_time" and sum(count for _, count in self.scans) == self.rows:
+                    times = self.scan_buckets(bucket)
+                    keys.append(times if selected is None else times[selected])
+                else:
+                    times = self.column(time_column)
+                    keys.append(self.time_buckets(times if selected is None else times[selected], bucket))
+            else:
+                times = self.column(time_column)
+                times = times if selected is None else [times[row] for row in selected]
+                keys.append([bucket_index(value, bucket) for value in times])
+        return keys
+
+    def bounds(self, by, keys):
+        """(low, radix) per key array; dictionary columns are bounded by their dictionary, others are scanned."""
+        result = []
+        for position, values in enumerate(keys):
+            name = by[position] if position < len(by) else None
+            if name in DICTIONARY_COLUMNS:
+                result.append((0, max(len(self.dictionaries[name]), 1)))
+            else:
+                low = int(values.min())
+                result.append((low, int(values.max()) - low + 1))
+        return result
+
+    def labels(self, by, bucket, digits):
+        """Decode grouped key arrays column by column into result key tuples."""
+        columns = []
+        for position, values in enumerate(digits):
+            values = values.tolist()
+            if position == len(by):
+                names = {value: bucket_label(value, bucket) for value in set(values)}
+                columns.append([names[value] for value in values])
+            elif by[position] in DICTIONARY_COLUMNS:
+                dictionary = self.dictionaries[by[position]]
+                columns.append([dictionary[value] for value in values])
+            elif by[position] in TIME_COLUMNS:
+                columns.append([datetime.fromtimestamp(value, timezone.utc).isoformat() for value in values])
+            else:
+                columns.append(values)
+        return zip(*columns)
+
+    def decode_key(self, by, bucket, key):
+        labels = [self.dictionaries[name][code] if name in DICTIONARY_COLUMNS else
+                  datetime.fromtimestamp(code, timezone.utc).isoformat() if name in TIME_COLUMNS else code
+                  for name, code in zip(by, key)]
+        if bucket:
+            labels.append(bucket_label(key[-1], bucket))
+        return tuple(labels)
+
+    def count_by(self, *by, bucket=None, time_column="scan_time", **filters):
+        """Count rows grouped by columns and, optionally, a day/week/month bucket of time_column.
+
+        Filters are column=value or column=[values], e.g. status="Active", severity=[4, 5].
+        Returns {(group values..., bucket label): count}.
+        """
+        selected = self.mask(filters)
+        keys = self.key_columns(by, bucket, time_column, selected)
+        if not keys:
+            total = self.rows if selected is None else int(numpy.count_nonzero(selected)) if NUMPY_AVAILABLE else len(selected)
+            return {(): total} if total else {}
+        if NUMPY_AVAILABLE:
+            if not len(keys[0]):
+                return {}
+            digits, counts = grouped(keys, self.bounds(by, keys))
+            return dict(zip(self.labels(by, bucket, digits), counts.tolist()))
+        counts = Counter(zip(*keys))
+        return {self.decode_key(by, bucket, key): count for key, count in counts.items()}
+
+    def mean_time_to_fix(self, *by, **filters):
+        """Mean days from first to last detection of fixed findings, grouped by columns.
+
+        A finding is an (asset, QID) pair; only its latest fixed row counts, so findings reported
+        in many scans are not weighted by how often they were scanned.
+        """
+        filters.setdefault("status", [status for status in FIXED_STATUSES if status in self.codes["status"]])
+        selected = self.mask(filters)
+        columns = ["asset", "qid", "first_detected", "last_detected"] + list(by)
+        if NUMPY_AVAILABLE:
+            rows = numpy.flatnonzero(selected)
+            if not len(rows):
+                return {}
+            # Latest row per finding: sort (finding, row) packed into one int64 and keep each run's last entry
+            row_bits = max(int(self.rows).bit_length(), 1)
+            finding_count = max(len(self.dictionaries["asset"]), 1) * max(len(self.dictionaries["qid"]), 1)
+            findings = self.column("asset")[rows].astype(numpy.int64) * max(len(self.dictionaries["qid"]), 1)
+            findings += self.column("qid")[rows]
+            if finding_count.bit_length() + row_bits <= 63:
+                packed = (findings << row_bits) | rows
+                packed.sort()
+                findings, rows = packed >> row_bits, packed & ((1 << row_bits) - 1)
+            else:
+                order = numpy.lexsort((rows, findings))
+                findings, rows = findings[order], rows[order]
+            rows = rows[numpy.append(findings[1:] != findings[:-1], True)]
+            first, final = self.column("first_detected")[rows], self.column("last_detected")[rows]
+            valid = (first > 0) & (final >= first)
+            rows, durations = rows[valid], (final - first)[valid]
+            if not len(durations):
+                return {}
+            if not by:
+                return {(): float(durations.mean()) / DAY}
+            keys = [self.column(name)[rows] for name in by]
+            bounds = self.bounds(by, keys)
+            digits, sums = grouped(keys, bounds, durations)
+            _, counts = grouped(keys, bounds)
+            return dict(zip(self.labels(by, None, digits), (sums / counts / DAY).tolist()))
+        latest = {}
+        values = {name: self.column(name) for name in columns}
+        for row in selected:
+            latest[(values["asset"][row], values["qid"][row])] = row
+        sums, counts = Counter(), Counter()
+        for row in latest.values():
+            first, final = values["first_detected"][row], values["last_detected"][row]
+            if first > 0 and final >= first:
+                key = tuple(values[name][row] for name in by)
+                sums[key] += final - first
+                counts[key] += 1
+        return {self.decode_key(by, None, key): sums[key] / counts[key] / DAY for key in counts}
+
+def grouped(keys, bounds, weights=None):
+    """Count (or sum weights) per distinct combination of integer key arrays.
+
+    The keys are folded into one mixed-radix code and counted with bincount; only combinations
+    too sparse for a dense count table fall back to sorting. Returns the key arrays of each
+    combination present and the matching totals.
+    """
+    combined, size = None, 1
+    for values, (low, radix) in zip(keys, bounds):
+        digits = values.astype(numpy.int64)
+        if low:
+            digits -= low
+        combined = digits if combined is None else combined * radix + digits
+        size *= radix
+    if size <= 1 << 24:
+        counts = numpy.bincount(combined, minlength=size)
+        codes = numpy.flatnonzero(counts)
+        totals = (counts if weights is None else numpy.bincount(combined, weights=weights, minlength=size))[codes]
+    else:  # Sparse combinations: sort instead of allocating a huge count table
+        codes, inverse = numpy.unique(combined, return_inverse=True)
+        totals = numpy.bincount(inverse, weights=weights)
+    digits = []
+    for low, radix in reversed(bounds):
+        codes, digit = numpy.divmod(codes, radix)
+        digits.append(digit + low)
+    return digits[::-1], totals
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the findings history written by ohdf_from_qualys_vmdr --store.")
+    parser.add_argument("store", help="Findings store directory")
+    parser.add_argument("--by", nargs="*", default=[], choices=list(COLUMNS), help="Columns to group by")
+    parser.add_argument("--bucket", choices=BUCKETS, help="Also group by scan day, week or month")
+    parser.add_argument("--status", nargs="*", help="Only these Qualys statuses, e.g. Active")
+    parser.add_argument("--severity", nargs="*", type=int, help="Only these severities (1-5)")
+    parser.add_argument("--mttr", action="store_true", help="Mean days to fix instead of counts")
+    args = parser.parse_args(argv)
+
+    store = FindingsStore(args.store)
+    filters = {name: value for name, value in (("status", args.status), ("severity", args.severity)) if value}
+    if args.mttr:
+        rows = store.mean_time_to_fix(*args.by, **filters)
+        for key, days in sorted(rows.items()):
+            print(f"{' '.join(map(str, key)) or 'all'}: {days:.1f} days")
+    else:
+        rows = store.count_by(*args.by, bucket=args.bucket, **filters)
+        for key, count in sorted(rows.items()):
+            print(f"{' '.join(map(str, key)) or 'all'}: {count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,6 +30,7 @@ class GroupDetails(ttk.Frame):
         tk.Label(self, text="Controls:").grid(row=4, column=0, sticky="ne", padx=5, pady=5)
         self.controls_text = tk.Text(self, height=5, width=80)
         self.controls_text.grid(row=4, column=1, pady=5)
+        self.loaded_title = None  # Title shown right after load; save() writes only the title
 
         self.update_colors()
 
@@ -60,6 +61,13 @@ class GroupDetails(ttk.Frame):
         controls = "\n".join(f"{control.id}: {control.title}" for control in group.controls or [])
         self.controls_text.delete("1.0", tk.END)
         self.controls_text.insert("1.0", controls or "No controls.")
+        self.loaded_title = self.title_var.get()
+
+    def is_modified(self):
+        return self.loaded_title is not None and self.title_var.get() != self.loaded_title
 
     def save(self, group: ControlGroup):
         group.title = self.title_var.get()
+        self.manager.record_edit(self.manager.details_pane.current_entry or self.manager.active, "group", group.id)
+        self.manager.search_index.update(group.id, group)
+        self.loaded_title = group.title
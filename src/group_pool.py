@@ -0,0 +1,37 @@
+# group_pool.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Measured with 2 workers against serial runs (1 CPU, so the difference is pure pool cost): start-up is
+# 10-13 ms plus 4.5-6 us per control to fork and return results, while the work itself is 5-8 us
+# (validation) or ~11 us (HTML) per control. On 4-8 cores the pool only wins from roughly 3,200-7,000
+# controls; an SP 800-53-sized catalog (~1,500 controls and enhancements) takes 8-17 ms serially.
+PARALLEL_THRESHOLD = 4000
+
+shared_job = None
+
+def set_shared_job(function, groups, args):
+    global shared_job
+    shared_job = (function, groups, args)
+
+def run_shared_group(position):
+    function, groups, args = shared_job
+    return function(groups[position], *args)
+
+def map_groups(function, groups, args=(), control_count=0, workers=None, use_processes=None):
+    """Yield function(group, *args) for each group in order, in worker processes on large catalogs.
+
+    function must be a module-level function. The groups and args are handed to each worker once
+    when it starts (inherited copy-on-write where processes fork), so only positions are sent per
+    task. use_processes=None decides from control_count and PARALLEL_THRESHOLD.
+    """
+    if use_processes is None:
+        use_processes = control_count >= PARALLEL_THRESHOLD
+    workers = workers or min(len(groups), os.cpu_count() or 1)
+    if use_processes and workers > 1 and len(groups) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_shared_job,
+                                 initargs=(function, groups, args)) as executor:
+            yield from executor.map(run_shared_group, range(len(groups)))
+    else:
+        for group in groups:
+            yield function(group, *args)
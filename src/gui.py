@@ -1,13 +1,11 @@
 # gui.py
+import sys
 import tkinter as tk
-import json
-from oscal_pydantic.catalog import Catalog
 from catalog_manager import CatalogManager
+from workspace import Workspace
 
 if __name__ == "__main__":
-    with open("data/NIST_SP-800-53_rev5_catalog.json", "r") as f:
-        catalog_data = json.load(f)
-    catalog = Catalog(**catalog_data)
+    workspace = Workspace.open(sys.argv[1:] or ["data/NIST_SP-800-53_rev5_catalog.json"], mapped=True)
     root = tk.Tk()
-    app = CatalogManager(catalog, root)
+    app = CatalogManager(workspace, root)
     root.mainloop()
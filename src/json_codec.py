@@ -0,0 +1,123 @@
+# json_codec.py
+import json
+import os
+import sys
+import time
+try:
+    import orjson  # Optional, fastest encoder/decoder
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import ujson  # Optional, faster than stdlib where orjson is unavailable
+    UJSON_AVAILABLE = True
+except ImportError:
+    UJSON_AVAILABLE = False
+
+class StdlibBackend:
+    name = "json"
+    DecodeError = json.JSONDecodeError
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj, compact=False):
+        if compact:
+            return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        return json.dumps(obj, indent=2)
+
+class OrjsonBackend:
+    name = "orjson"
+    DecodeError = orjson.JSONDecodeError if ORJSON_AVAILABLE else None
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj, compact=False):
+        return orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2).decode("utf-8")
+
+class UjsonBackend:
+    name = "ujson"
+    DecodeError = ujson.JSONDecodeError if UJSON_AVAILABLE else None
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, obj, compact=False):
+        if compact:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+        return ujson.dumps(obj, indent=2, escape_forward_slashes=False)
+
+BACKENDS = {"orjson": OrjsonBackend, "ujson": UjsonBackend, "json": StdlibBackend}
+
+def available_backends():
+    """Names of the usable backends, fastest first."""
+    names = []
+    if ORJSON_AVAILABLE:
+        names.append("orjson")
+    if UJSON_AVAILABLE:
+        names.append("ujson")
+    names.append("json")
+    return names
+
+def select_backend(name=None):
+    """Pick a backend by name, OSCAL_JSON_BACKEND, or the fastest one installed."""
+    name = name or os.environ.get("OSCAL_JSON_BACKEND")
+    if name and name not in available_backends():
+        print(f"JSON backend {name} is not available; using {available_backends()[0]}")
+        name = None
+    return BACKENDS[name or available_backends()[0]]()
+
+backend = select_backend()
+DecodeError = backend.DecodeError
+
+def use_backend(name):
+    """Switch the process-wide backend (e.g. for benchmarks or a deployment override)."""
+    global backend, DecodeError
+    backend = select_backend(name)
+    DecodeError = backend.DecodeError
+    return backend
+
+def loads(data):
+    """Decode JSON from str or bytes."""
+    return backend.loads(data)
+
+def dumps(obj, compact=False):
+    """Encode to a str; indented by two spaces unless compact."""
+    return backend.dumps(obj, compact)
+
+def load(file_path):
+    with open(file_path, "rb") as f:
+        return backend.loads(f.read())
+
+def dump(obj, file_path, compact=False):
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(backend.dumps(obj, compact))
+
+def benchmark(file_path, repeat=3):
+    """Time decoding and encoding a JSON file with every installed backend; best of `repeat` runs."""
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    results = {}
+    for name in available_backends():
+        codec = BACKENDS[name]()
+        timings = {"load": [], "dump": [], "dump_compact": []}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = codec.loads(raw)
+            timings["load"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            codec.dumps(data)
+            timings["dump"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            codec.dumps(data, compact=True)
+            timings["dump_compact"].append(time.perf_counter() - start)
+        results[name] = {key: min(values) for key, values in timings.items()}
+    return results
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/NIST_SP-800-53_rev5_catalog.json"
+    print(f"Benchmarking {path} ({os.path.getsize(path) / 1e6:.1f} MB), best of 3; active backend: {backend.name}")
+    print(f"{'backend':8} {'load':>9} {'dump':>9} {'compact':>9}")
+    for name, timing in benchmark(path).items():
+        print(f"{name:8} {timing['load'] * 1000:7.1f}ms {timing['dump'] * 1000:7.1f}ms {timing['dump_compact'] * 1000:7.1f}ms")
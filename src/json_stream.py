@@ -0,0 +1,94 @@
+# json_stream.py
+import datetime
+import enum
+from json.encoder import encode_basestring_ascii
+from pydantic import BaseModel
+
+CHUNK_SIZE = 64 * 1024  # Characters buffered before each write to the file
+
+def model_items(model: BaseModel):
+    """Yield (alias, value) for the set fields of a model in declaration order, skipping None."""
+    values = model.__dict__
+    for name, field in model.__fields__.items():
+        value = values.get(name)
+        if value is not None:
+            yield field.alias, value
+
+def iter_json(value, indent=None, level=0):
+    """Yield the JSON text of a pydantic model (or plain JSON data) piece by piece.
+
+    Produces the same document as model.json(by_alias=True, exclude_none=True): fields appear
+    in declaration order, None fields are omitted, and no intermediate dict or full string is built.
+    """
+    if isinstance(value, BaseModel):
+        if "__root__" in value.__fields__:
+            yield from iter_json(value.__root__, indent, level)
+            return
+        items = model_items(value)
+    elif isinstance(value, dict):
+        items = ((key, item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        yield from iter_array(value, indent, level)
+        return
+    else:
+        yield encode_scalar(value)
+        return
+
+    if indent is None:
+        separator, opening, closing, colon = ",", "{", "}", ":"
+    else:
+        inner = "\n" + " " * (indent * (level + 1))
+        separator, opening, closing, colon = "," + inner, "{" + inner, "\n" + " " * (indent * level) + "}", ": "
+    first = True
+    for key, item in items:
+        yield opening if first else separator
+        first = False
+        yield encode_basestring_ascii(key)
+        yield colon
+        yield from iter_json(item, indent, level + 1)
+    yield "{}" if first else closing
+
+def iter_array(values, indent, level):
+    if not values:
+        yield "[]"
+        return
+    if indent is None:
+        separator, opening, closing = ",", "[", "]"
+    else:
+        inner = "\n" + " " * (indent * (level + 1))
+        separator, opening, closing = "," + inner, "[" + inner, "\n" + " " * (indent * level) + "]"
+    yield opening
+    for position, item in enumerate(values):
+        if position:
+            yield separator
+        yield from iter_json(item, indent, level + 1)
+    yield closing
+
+def encode_scalar(value):
+    if isinstance(value, str):  # Also constrained strings and URLs
+        return encode_basestring_ascii(value)
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    if isinstance(value, enum.Enum):
+        return encode_scalar(value.value)
+    if isinstance(value, (int, float)):
+        return repr(value) if isinstance(value, float) else str(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return encode_basestring_ascii(value.isoformat())
+    return encode_basestring_ascii(str(value))  # UUID, Decimal and other pydantic-coerced types
+
+def write_json(value, f, indent=None):
+    """Stream value as JSON to a text file handle, writing in CHUNK_SIZE batches."""
+    buffer, size = [], 0
+    for piece in iter_json(value, indent):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            f.write("".join(buffer))
+            buffer, size = [], 0
+    if buffer:
+        f.write("".join(buffer))
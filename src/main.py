@@ -1,9 +1,21 @@
 from gui import CatalogManager
-from oscal_handler import load_catalog
+from workspace import Workspace, format_bytes
+import logging
+import os
+import sys
 import tkinter as tk
 
 if __name__ == "__main__":
-    catalog = load_catalog("data/NIST_SP-800-53_rev5_catalog.json")
+    logging.basicConfig(level=os.environ.get("OSCAL_MANAGER_LOG_LEVEL", "WARNING"))
+    # Any number of catalogs can be opened together: python src/main.py a.json b.json ...
+    paths = sys.argv[1:] or ["data/NIST_SP-800-53_rev5_catalog.json"]
+    workspace = Workspace.open(paths, mapped=True)
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        report = workspace.memory_report()
+        for item in report["catalogs"]:
+            logging.info("Loaded %s (%s): %s", item["key"], item["path"], format_bytes(item["bytes"]))
+        logging.info("Workspace total: %s (%s shared)", format_bytes(report["total_bytes"]),
+                     format_bytes(report["shared_bytes"]))
     root = tk.Tk()
-    app = CatalogManager(catalog, root)
+    app = CatalogManager(workspace, root)
     root.mainloop()
@@ -0,0 +1,67 @@
+# navigation_history.py
+
+class NavigationHistory:
+    """Fixed-capacity ring buffer of visited tree items with back/forward support."""
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.start = 0  # Physical slot of the oldest entry
+        self.length = 0
+        self.position = -1  # Logical index of the current entry
+
+    def __len__(self):
+        return self.length
+
+    def _slot(self, index):
+        return (self.start + index) % self.capacity
+
+    def current(self):
+        return self.slots[self._slot(self.position)] if self.length else None
+
+    def push(self, entry):
+        """Record a visit, dropping any forward entries; repeats of the current entry are ignored."""
+        if self.length and self.current() == entry:
+            return
+        # Anything after the current position is no longer reachable by "forward"
+        for index in range(self.position + 1, self.length):
+            self.slots[self._slot(index)] = None
+        self.length = self.position + 1
+        if self.length == self.capacity:
+            self.slots[self.start] = None
+            self.start = self._slot(1)
+            self.length -= 1
+        self.slots[self._slot(self.length)] = entry
+        self.length += 1
+        self.position = self.length - 1
+
+    def replace(self, entry):
+        """Overwrite the current entry, e.g. while the user is arrowing through the tree."""
+        if not self.length:
+            self.push(entry)
+            return
+        if self.position > 0 and self.slots[self._slot(self.position - 1)] == entry:
+            # Arrowing back onto the previous entry collapses into it
+            for index in range(self.position, self.length):
+                self.slots[self._slot(index)] = None
+            self.length = self.position
+            self.position -= 1
+            return
+        self.slots[self._slot(self.position)] = entry
+
+    def can_go_back(self):
+        return self.position > 0
+
+    def can_go_forward(self):
+        return self.position < self.length - 1
+
+    def back(self):
+        if not self.can_go_back():
+            return None
+        self.position -= 1
+        return self.current()
+
+    def forward(self):
+        if not self.can_go_forward():
+            return None
+        self.position += 1
+        return self.current()
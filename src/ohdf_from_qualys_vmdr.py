@@ -1,6 +1,9 @@
-import json
+import argparse
+import json_codec
 from datetime import datetime
-import uuid
+import hashlib
+from findings_store import FindingsStore
+from qid_mapping import QidMapping, ControlTally, catalog_controls
 
 def map_severity(qualys_severity):
     """Map Qualys severity (1–5) to HDF severity categories."""
@@ -14,6 +17,14 @@ def map_severity(qualys_severity):
         return "critical"
     return "unknown"
 
+SUMMARY_SEVERITIES = ("critical", "high", "medium", "low")
+
+def adjust_summary(summary, result, count=1):
+    """Add (or with a negative count, remove) one HDF result's contribution to the executive summary."""
+    summary["total_findings"] += count
+    if result["severity"] in SUMMARY_SEVERITIES:
+        summary[result["severity"]] += count
+
 def map_status(qualys_status):
     """Map Qualys status to HDF status."""
     if qualys_status.lower() == "active":
@@ -22,79 +33,123 @@ def map_status(qualys_status):
         return "pass"
     return "other"
 
-def qualys_to_hdf(qualys_data):
-    """Convert Qualys VMDR JSON to OASIS Heimdall Data Format."""
+def result_id(vuln):
+    """The QID, or for records without one a stable id derived from the asset and finding."""
+    if "vuln_id" in vuln:
+        return vuln["vuln_id"]
+    identity = "\x1f".join(str(vuln.get(key, "")) for key in ("asset_id", "ip_address", "title", "category"))
+    return f"QID_{hashlib.blake2b(identity.encode('utf-8'), digest_size=8).hexdigest()}"
+
+def vuln_to_result(vuln, mapping=None):
+    """Build the HDF result for one Qualys detection, tagged with NIST ids when a mapping is given."""
+    result = {
+        "id": result_id(vuln),
+        "title": vuln.get("title", "Unknown Vulnerability"),
+        "description": f"{vuln.get('title', 'Unknown')} ({vuln.get('category', 'Unknown')})",
+        "severity": map_severity(vuln.get("severity", 1)),
+        "status": map_status(vuln.get("status", "Active")),
+        "start_time": vuln.get("first_detected", ""),
+        "found_time": vuln.get("last_detected", ""),  # Custom field for last detection
+        "targets": [vuln.get("ip_address", "Unknown")],
+        "tags": {
+            "os": vuln.get("os", "Unknown"),
+            "asset_id": vuln.get("asset_id", "Unknown")
+        },
+        "code": {
+            "qid": vuln.get("vuln_id", "Unknown"),
+            "category": vuln.get("category", "Unknown")
+        }
+    }
+    if mapping is not None:
+        control_ids = mapping.controls_for(vuln.get("vuln_id"), vuln.get("category"))
+        if control_ids:
+            result["tags"]["nist"] = list(control_ids)
+    return result
+
+def qualys_to_hdf(qualys_data, mapping=None):
+    """Convert Qualys VMDR JSON to OASIS Heimdall Data Format.
+
+    With a QidMapping, each result is tagged with its NIST control ids and per-control
+    pass/fail counts are gathered in the same pass.
+    """
     vulnerabilities = qualys_data.get("response", {}).get("vulnerabilities", [])
     hdf_results = []
+    tally = ControlTally()
+    # Counted from the mapped results, as qualys_delta does, so both paths agree on defaults
+    summary = {"tool": "Qualys VMDR", "scan_time": datetime.utcnow().isoformat() + "Z", "total_findings": 0,
+               "critical": 0, "high": 0, "medium": 0, "low": 0}
 
     for vuln in vulnerabilities:
-        result = {
-            "id": vuln.get("vuln_id", f"QID_{uuid.uuid4()}"),  # Fallback to UUID if no QID
-            "title": vuln.get("title", "Unknown Vulnerability"),
-            "description": f"{vuln.get('title', 'Unknown')} ({vuln.get('category', 'Unknown')})",
-            "severity": map_severity(vuln.get("severity", 1)),
-            "status": map_status(vuln.get("status", "Active")),
-            "start_time": vuln.get("first_detected", ""),
-            "found_time": vuln.get("last_detected", ""),  # Custom field for last detection
-            "targets": [vuln.get("ip_address", "Unknown")],
-            "tags": {
-                "os": vuln.get("os", "Unknown"),
-                "asset_id": vuln.get("asset_id", "Unknown")
-            },
-            "code": {
-                "qid": vuln.get("vuln_id", "Unknown"),
-                "category": vuln.get("category", "Unknown")
-            }
-        }
+        result = vuln_to_result(vuln, mapping)
+        adjust_summary(summary, result)
+        if "nist" in result["tags"]:
+            tally.add(result["tags"]["nist"], result["status"])
         hdf_results.append(result)
 
     # Construct HDF structure
     hdf_output = {
         "version": "1.0",  # HDF version
-        "executive_summary": {
-            "tool": "Qualys VMDR",
-            "scan_time": datetime.utcnow().isoformat() + "Z",
-            "total_findings": len(vulnerabilities),
-            "critical": sum(1 for v in vulnerabilities if v.get("severity") == 5),
-            "high": sum(1 for v in vulnerabilities if v.get("severity") == 4),
-            "medium": sum(1 for v in vulnerabilities if v.get("severity") == 3),
-            "low": sum(1 for v in vulnerabilities if v.get("severity") in [1, 2])
-        },
+        "executive_summary": summary,
         "results": hdf_results,
         "passthrough": {
             "raw_qualys_data": qualys_data  # Store original data for reference
         },
-        "controls": [],  # Empty, as no compliance controls are mapped
-        "nist_controls": []  # Optional NIST mapping (not implemented)
+        "controls": tally.controls(mapping.titles if mapping is not None else None),  # Per-control pass/fail counts
+        "nist_controls": tally.nist_controls()  # Control ids with at least one mapped result
     }
 
     return hdf_output
 
-def convert_qualys_to_hdf(input_file, output_file):
-    """Read Qualys JSON, convert to HDF, and write to output file."""
+def load_mapping(mapping_file, catalog_file=None):
+    """Load a QID mapping table, dropping (and reporting) ids that are not in the catalog."""
+    mapping = QidMapping.from_file(mapping_file)
+    if catalog_file:
+        unknown = mapping.validate(catalog_controls(catalog_file))
+        if unknown:
+            print(f"Warning: {len(unknown)} mapped control ids are not in {catalog_file}: {', '.join(unknown)}")
+    return mapping
+
+def convert_qualys_to_hdf(input_file, output_file, compact=True, mapping_file=None, catalog_file=None, store_dir=None):
+    """Read Qualys JSON, convert to HDF, and write to output file (single-line JSON unless compact is False).
+
+    With store_dir, the detections are also appended to that findings history store.
+    """
     try:
+        mapping = load_mapping(mapping_file, catalog_file) if mapping_file else None
+
         # Read Qualys JSON
-        with open(input_file, "r") as f:
-            qualys_data = json.load(f)
+        qualys_data = json_codec.load(input_file)
 
         # Convert to HDF
-        hdf_data = qualys_to_hdf(qualys_data)
+        hdf_data = qualys_to_hdf(qualys_data, mapping)
 
         # Write HDF JSON
-        with open(output_file, "w") as f:
-            json.dump(hdf_data, f, indent=2)
+        json_codec.dump(hdf_data, output_file, compact)
+
+        if store_dir:
+            response = qualys_data.get("response", {})
+            # Without generated_at the store recognizes a re-converted export by its detections instead
+            scan_time = response.get("metadata", {}).get("generated_at")
+            if FindingsStore(store_dir).append(response.get("vulnerabilities", []), scan_time) is None:
+                print(f"Scan {'from ' + scan_time if scan_time else 'with identical findings'} is already in {store_dir}; "
+                      "not added again.")
 
         print(f"Conversion successful! HDF output written to {output_file}")
 
-    except FileNotFoundError:
-        print(f"Error: Input file {input_file} not found.")
-    except json.JSONDecodeError:
+    except FileNotFoundError as e:
+        print(f"Error: Input file {e.filename} not found.")
+    except json_codec.DecodeError:
         print("Error: Invalid JSON format in input file.")
     except Exception as e:
         print(f"Error during conversion: {str(e)}")
 
-# Example usage
 if __name__ == "__main__":
-    input_file = "qualys_vmdr_data.json"  # Input Qualys JSON file
-    output_file = "qualys_hdf_output.json"  # Output HDF JSON file
-    convert_qualys_to_hdf(input_file, output_file)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Convert a Qualys VMDR export to Heimdall Data Format.")
+    parser.add_argument("input", nargs="?", default="qualys_vmdr_data.json", help="Qualys JSON file")
+    parser.add_argument("output", nargs="?", default="qualys_hdf_output.json", help="HDF JSON file to write")
+    parser.add_argument("--mapping", help="QID/category to NIST control mapping table (.json or .csv)")
+    parser.add_argument("--catalog", help="Catalog or profile used to validate the mapped control ids")
+    parser.add_argument("--indent", action="store_true", help="Write indented JSON instead of a single line")
+    parser.add_argument("--store", help="Also append the detections to this findings history directory")
+    args = parser.parse_args()
+    convert_qualys_to_hdf(args.input, args.output, not args.indent, args.mapping, args.catalog, args.store)
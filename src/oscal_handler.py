@@ -1,15 +1,55 @@
 # src/oscal_handler.py
 from oscal_pydantic.catalog import Catalog
-import json
+from compact_catalog import CompactCatalog
+from catalog_store import build_store, open_store
+from catalog_db import db_path_for, open_db
+from profile_resolver import ProfileResolver, catalog_data
+import os
+from json_stream import write_json
 
 def load_catalog(file_path):
-    """Load an OSCAL catalog from a JSON file."""
-    with open(file_path, 'r') as f:
-        data = json.load(f)  # Load the full JSON
-        catalog_data = data["catalog"]  # Extract the "catalog" object
-    return Catalog.parse_obj(catalog_data)  # Parse only the "catalog" part
-
-def save_catalog(catalog, file_path):
-    """Save an OSCAL catalog to a JSON file."""
-    with open(file_path, 'w') as f:
-        f.write(catalog.json(indent=2))  # Use .json() for Pydantic v1
+    """Load an OSCAL catalog from a JSON file; profiles are resolved into their catalog."""
+    return Catalog.parse_obj(catalog_data(file_path))  # Parse only the "catalog" part
+
+def load_catalog_dict(file_path):
+    """Load an OSCAL catalog or profile as plain JSON (the "catalog" object) without pydantic validation."""
+    return catalog_data(file_path)
+
+def save_catalog(catalog, file_path, indent=2):
+    """Save an OSCAL catalog to a JSON file, wrapped in {"catalog": ...} so load_catalog can read it back.
+
+    The JSON is streamed from the model to the file rather than built as one string, and is
+    written to a temporary file first so a failed save never truncates the original.
+    """
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        write_json({"catalog": catalog}, f, indent)
+        f.write("\n")
+    os.replace(temp_path, file_path)
+
+def load_compact_catalog(file_path):
+    """Load an OSCAL catalog or profile into a CompactCatalog without pydantic validation."""
+    return CompactCatalog.from_dict(catalog_data(file_path))
+
+def prepare_catalog_store(file_path):
+    """Build or refresh the memory-mapped store for a catalog; returns its path, or None if it can't be written."""
+    try:
+        return build_store(file_path)
+    except OSError as e:
+        print(f"Could not write catalog store for {file_path}: {e}")
+        return None
+
+def load_mapped_catalog(file_path, store_path=None):
+    """Open a catalog from its memory-mapped store, falling back to an in-memory CompactCatalog."""
+    store_path = store_path or prepare_catalog_store(file_path)
+    compact = open_store(store_path, file_path) if store_path else None
+    return compact or load_compact_catalog(file_path)
+
+def open_catalog_db(file_path):
+    """The catalog's SQLite database if one exists and matches the file on disk, else None."""
+    return open_db(db_path_for(file_path), file_path)
+
+def load_profiles(file_paths, workers=None, use_processes=True):
+    """Resolve several profiles in parallel against shared catalogs; returns pydantic Catalogs."""
+    resolver = ProfileResolver()
+    return [Catalog.parse_obj(data) for data in resolver.resolve_many(file_paths, workers, use_processes)]
@@ -0,0 +1,57 @@
+# prefetcher.py
+from collections import deque
+
+class Prefetcher:
+    """Builds detail models for likely-next controls while the UI is idle."""
+    def __init__(self, manager, limit=8):
+        self.manager = manager
+        self.limit = limit  # Maximum number of controls prepared per selection
+        self.queue = deque()
+        self.job = None
+
+    def schedule(self, item, model):
+        """Queue the siblings of a rendered tree item and the targets of its related links."""
+        self.cancel()
+        tree = self.manager.tree
+        candidates = []
+        next_item = tree.next(item)
+        if next_item:
+            candidates.append(next_item)
+            if tree.next(next_item):
+                candidates.append(tree.next(next_item))
+        if tree.prev(item):
+            candidates.append(tree.prev(item))
+        ids = [tree.item(candidate, "values")[0] for candidate in candidates]
+        ids.extend(target for _, link_type, target in model["links"] if link_type == "Internal")
+        seen = set()
+        for control_id in ids:
+            if control_id not in seen:
+                seen.add(control_id)
+                self.queue.append(control_id)
+            if len(self.queue) >= self.limit:
+                break
+        if self.queue:
+            self.job = self.manager.root.after_idle(self.step)
+
+    def step(self):
+        """Prepare one queued control, then yield back to the event loop."""
+        self.job = None
+        cache = self.manager.detail_cache
+        details = self.manager.details_pane.control_details
+        while self.queue:
+            control_id = self.queue.popleft()
+            key = self.manager.cache_key(control_id)
+            if cache.contains(key):
+                continue
+            control = self.manager.find_control_by_id(control_id)
+            if control:
+                cache.put(key, details.build_model(control))
+                break
+        if self.queue:
+            self.job = self.manager.root.after_idle(self.step)
+
+    def cancel(self):
+        if self.job:
+            self.manager.root.after_cancel(self.job)
+            self.job = None
+        self.queue.clear()
@@ -0,0 +1,378 @@
+# profile_resolver.py
+import hashlib
+import json
+import json_codec
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from urllib.parse import urlparse, unquote
+
+LIST_KEYS = ("params", "props", "links", "parts")
+
+def copy_json(data):
+    """Deep-copy plain JSON data; faster than copy.deepcopy for dicts of strings."""
+    return json_codec.loads(json_codec.dumps(data, compact=True))
+
+def canonical(data):
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+class ProfileResolver:
+    """Resolves OSCAL profiles into catalogs, working on the raw JSON.
+
+    Every document is read and parsed once per resolver and keyed by the SHA-256 of its
+    bytes; the controls an import selects are memoized by (document hash, selection), so
+    baselines that import the same catalog share one parse and one selection pass.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.documents = {}  # Absolute path -> (content hash, parsed JSON)
+        self.by_hash = {}  # Content hash -> parsed JSON, so copies of a file are parsed once
+        self.imports = {}  # (content hash, selection JSON) -> selected catalog
+        self.resolved = {}  # Profile content hash -> resolved catalog
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    def load_document(self, path):
+        path = os.path.abspath(path)
+        with self.lock:
+            if path not in self.documents:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                digest = hashlib.sha256(raw).hexdigest()
+                data = self.by_hash.get(digest)
+                if data is None:
+                    data = self.by_hash[digest] = json_codec.loads(raw)
+                self.documents[path] = (digest, data)
+            return self.documents[path]
+
+    def catalog_data(self, path):
+        """Return the catalog object of a catalog file, resolving it first if it is a profile."""
+        digest, data = self.load_document(path)
+        if "catalog" in data:
+            return data["catalog"]
+        if "profile" in data:
+            return self.resolve(path)
+        if "uuid" in data and "metadata" in data:
+            return data  # A bare catalog object, as earlier versions of save_catalog wrote it
+        raise ValueError(f"{path} is neither an OSCAL catalog nor a profile")
+
+    # Resolution
+
+    def resolve(self, profile_path):
+        """Resolve a profile file into a catalog dict; the result is memoized and must not be mutated."""
+        digest, data = self.load_document(profile_path)
+        with self.lock:
+            if digest in self.resolved:
+                return self.resolved[digest]
+        profile = data["profile"]
+        base_dir = os.path.dirname(os.path.abspath(profile_path))
+        imported = [self.resolve_import(item, profile, base_dir) for item in profile.get("imports") or []]
+        catalog = self.merge(profile, imported)
+        self.modify(catalog, profile.get("modify") or {})
+        catalog["uuid"] = str(uuid.uuid4())
+        catalog["metadata"] = self.metadata(profile, profile_path)
+        with self.lock:
+            self.resolved[digest] = catalog
+        return catalog
+
+    def resolve_import(self, item, profile, base_dir):
+        path = self.import_path(item["href"], profile, base_dir)
+        source = self.catalog_data(path)
+        key = (self.load_document(path)[0], canonical({k: v for k, v in item.items() if k != "href"}))
+        with self.lock:
+            if key in self.imports:
+                return self.imports[key]
+        selected = self.select(source, item)
+        with self.lock:
+            self.imports[key] = selected
+        return selected
+
+    def import_path(self, href, profile, base_dir):
+        """Map an import href (relative path, file URL or #uuid of a back-matter resource) to a file."""
+        if href.startswith("#"):
+            resource = next((r for r in (profile.get("back-matter") or {}).get("resources") or []
+                             if r.get("uuid") == href[1:]), None)
+            rlinks = (resource or {}).get("rlinks") or []
+            if not rlinks:
+                raise ValueError(f"Import {href} does not point at a back-matter resource with an rlink")
+            json_links = [link for link in rlinks if link.get("href", "").endswith(".json")]
+            href = (json_links or rlinks)[0]["href"]
+        url = urlparse(href)
+        if url.scheme in ("http", "https"):
+            raise ValueError(f"Remote imports are not supported; download {href} and import it by path")
+        path = unquote(url.path) if url.scheme == "file" else href
+        return os.path.normpath(os.path.join(base_dir, path))
+
+    def select(self, catalog, item):
+        """Apply an import's include/exclude rules, keeping the catalog's group structure."""
+        if "include-all" in item or "include-controls" not in item:
+            included = None
+        else:
+            included = self.matching_ids(catalog, item["include-controls"])
+        excluded = self.matching_ids(catalog, item.get("exclude-controls") or [])
+
+        def keep(control_id):
+            return (included is None or control_id in included) and control_id not in excluded
+
+        groups = []
+        for group in catalog.get("groups") or []:
+            pruned = self.prune_group(group, keep)
+            if pruned is not None:
+                groups.append(pruned)
+        return {
+            "groups": groups,
+            "controls": self.prune_controls(catalog.get("controls") or [], keep),
+            "params": catalog.get("params") or [],
+            "resources": (catalog.get("back-matter") or {}).get("resources") or [],
+        }
+
+    def matching_ids(self, catalog, calls):
+        """Collect the control ids selected by include-controls/exclude-controls entries."""
+        ids = set()
+        if not calls:
+            return ids
+        for control, _ in iter_controls(catalog):
+            for call in calls:
+                with_ids = call.get("with-ids") or []
+                patterns = [m.get("pattern", "") for m in call.get("matching") or []]
+                if control["id"] in with_ids or any(fnmatchcase(control["id"], p) for p in patterns):
+                    ids.add(control["id"])
+                    if call.get("with-child-controls") == "yes":
+                        ids.update(child["id"] for child, _ in iter_controls({"controls": control.get("controls") or []}))
+        return ids
+
+    def prune_group(self, group, keep):
+        controls = self.prune_controls(group.get("controls") or [], keep)
+        groups = [g for g in (self.prune_group(g, keep) for g in group.get("groups") or []) if g is not None]
+        if not controls and not groups:
+            return None
+        pruned = {key: value for key, value in group.items() if key not in ("controls", "groups")}
+        if controls:
+            pruned["controls"] = controls
+        if groups:
+            pruned["groups"] = groups
+        return pruned
+
+    def prune_controls(self, controls, keep):
+        """Drop unselected controls; selected enhancements of an unselected control move up a level."""
+        result = []
+        for control in controls:
+            children = self.prune_controls(control.get("controls") or [], keep)
+            if keep(control["id"]):
+                pruned = {key: value for key, value in control.items() if key != "controls"}
+                if children:
+                    pruned["controls"] = children
+                result.append(pruned)
+            else:
+                result.extend(children)
+        return result
+
+    def merge(self, profile, imported):
+        """Combine the selected imports into one catalog following the profile's merge directive.
+
+        "as-is" keeps the source groups; anything else produces a flat list of controls. Controls
+        selected by more than one import are kept once (use-first).
+        """
+        merge = profile.get("merge") or {}
+        if "custom" in merge:
+            print("Custom grouping in profile merge is not supported; keeping the source structure.")
+        as_is = merge.get("as-is") or "custom" in merge
+        seen = set()
+        groups, controls, params, resources = [], [], [], {}
+
+        def first_use(control_list):
+            result = []
+            for control in control_list:
+                if control["id"] not in seen:
+                    seen.add(control["id"])
+                    result.append(control)
+            return result
+
+        for selection in imported:
+            if as_is:
+                for group in selection["groups"]:
+                    existing = next((g for g in groups if g.get("id") and g.get("id") == group.get("id")), None)
+                    group_controls = first_use(group.get("controls") or [])
+                    if existing is not None:
+                        existing.setdefault("controls", []).extend(group_controls)
+                    elif group_controls or group.get("groups"):
+                        group = {key: value for key, value in group.items() if key != "controls"}
+                        if group_controls:
+                            group["controls"] = group_controls
+                        groups.append(group)
+            else:
+                for group in selection["groups"]:
+                    controls.extend(first_use([c for c, _ in iter_controls({"groups": [group]}, nested=False)]))
+            controls.extend(first_use(selection["controls"]))
+            params.extend(p for p in selection["params"] if p["id"] not in {q["id"] for q in params})
+            for resource in selection["resources"]:
+                resources.setdefault(resource["uuid"], resource)
+        for resource in (profile.get("back-matter") or {}).get("resources") or []:
+            resources.setdefault(resource["uuid"], resource)
+
+        # Selections are shared between profiles through the memo, so modify a private copy
+        catalog = copy_json({"groups": groups, "controls": controls, "params": params})
+        for key in ("groups", "controls", "params"):
+            if not catalog[key]:
+                del catalog[key]
+        if resources:
+            catalog["back-matter"] = {"resources": list(resources.values())}
+        return catalog
+
+    def modify(self, catalog, modify):
+        params = {}
+        for control, _ in iter_controls(catalog):
+            for param in control.get("params") or []:
+                params[param["id"]] = param
+        for param in catalog.get("params") or []:
+            params.setdefault(param["id"], param)
+        for setting in modify.get("set-parameters") or []:
+            param = params.get(setting["param-id"])
+            if param is None:
+                print(f"set-parameter: no parameter {setting['param-id']} in the resolved catalog")
+                continue
+            for key, value in setting.items():
+                if key == "param-id":
+                    continue
+                if key in ("props", "links"):
+                    param.setdefault(key, []).extend(value)
+                else:
+                    param[key] = value
+
+        controls = {control["id"]: control for control, _ in iter_controls(catalog)}
+        for alter in modify.get("alters") or []:
+            control = controls.get(alter["control-id"])
+            if control is None:
+                print(f"alter: no control {alter['control-id']} in the resolved catalog")
+                continue
+            for removal in alter.get("removes") or []:
+                remove_matching(control, removal)
+            for addition in alter.get("adds") or []:
+                add_to_control(control, addition)
+
+    def metadata(self, profile, profile_path):
+        metadata = copy_json(profile["metadata"])
+        metadata["last-modified"] = datetime.now(timezone.utc).isoformat()
+        metadata.setdefault("links", []).append({"href": os.path.basename(profile_path), "rel": "source-profile"})
+        return metadata
+
+    # Batch resolution
+
+    def resolve_many(self, profile_paths, workers=None, use_processes=True):
+        """Resolve several profiles in parallel against catalogs parsed once up front.
+
+        Imported documents are loaded here before the pool starts, so forked workers share them
+        copy-on-write and thread workers share them directly.
+        """
+        profile_paths = list(profile_paths)
+        for path in profile_paths:
+            self.preload(path)
+        workers = workers or min(len(profile_paths), os.cpu_count() or 1)
+        if len(profile_paths) <= 1 or workers == 1:
+            return [self.resolve(path) for path in profile_paths]
+        if use_processes:
+            with ProcessPoolExecutor(max_workers=workers, initializer=set_shared_resolver, initargs=(self,)) as executor:
+                return list(executor.map(resolve_shared, profile_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.resolve, profile_paths))
+
+    def preload(self, path):
+        """Parse a profile and, recursively, every document it imports."""
+        digest, data = self.load_document(path)
+        profile = data.get("profile")
+        if profile is None:
+            return
+        base_dir = os.path.dirname(os.path.abspath(path))
+        for item in profile.get("imports") or []:
+            self.preload(self.import_path(item["href"], profile, base_dir))
+
+def iter_controls(container, nested=True):
+    """Yield (control, ancestor ids) for every control in a catalog or group dict, depth first."""
+    stack = [(group, None) for group in reversed(container.get("groups") or [])]
+    stack.extend((control, ()) for control in reversed(container.get("controls") or []))
+    while stack:
+        obj, ancestors = stack.pop()
+        if ancestors is None:  # A group: visit its controls, then its subgroups
+            stack.extend((group, None) for group in reversed(obj.get("groups") or []))
+            stack.extend((control, ()) for control in reversed(obj.get("controls") or []))
+            continue
+        yield obj, ancestors
+        if nested:
+            stack.extend((child, ancestors + (obj["id"],)) for child in reversed(obj.get("controls") or []))
+
+def removal_matches(item, kind, removal):
+    checks = (("by-name", item.get("name")), ("by-class", item.get("class")), ("by-id", item.get("id")),
+              ("by-ns", item.get("ns")), ("by-item-name", kind))
+    return all(removal[key] == value for key, value in checks if key in removal)
+
+def remove_matching(obj, removal):
+    for key in LIST_KEYS:
+        items = obj.get(key)
+        if not items:
+            continue
+        kind = key[:-1]  # params -> param, props -> prop, ...
+        kept = [item for item in items if not removal_matches(item, kind, removal)]
+        if kept:
+            obj[key] = kept
+        else:
+            del obj[key]
+    for part in obj.get("parts") or []:
+        remove_matching(part, removal)
+
+def find_target(obj, target_id, parent=None, parent_key=None):
+    """Find the part or param with target_id inside obj; returns (target, parent, list key)."""
+    for key in ("params", "parts"):
+        for item in obj.get(key) or []:
+            if item.get("id") == target_id:
+                return item, obj, key
+            if key == "parts":
+                found = find_target(item, target_id, obj, key)
+                if found[0] is not None:
+                    return found
+    return None, None, None
+
+def add_to_control(control, addition):
+    position = addition.get("position", "ending")
+    target, parent, key = control, None, None
+    if addition.get("by-id") and addition["by-id"] != control["id"]:
+        target, parent, key = find_target(control, addition["by-id"])
+        if target is None:
+            print(f"alter: no part or parameter {addition['by-id']} in control {control['id']}")
+            return
+    if "title" in addition:
+        target["title"] = addition["title"]
+    for list_key in LIST_KEYS:
+        items = copy_json(addition.get(list_key) or [])
+        if not items:
+            continue
+        if position in ("before", "after") and parent is not None and list_key == key:
+            siblings = parent[key]
+            index = siblings.index(target) + (1 if position == "after" else 0)
+            siblings[index:index] = items
+        elif position in ("starting", "before"):
+            target[list_key] = items + (target.get(list_key) or [])
+        else:
+            target[list_key] = (target.get(list_key) or []) + items
+
+shared_resolver = None
+
+def set_shared_resolver(resolver):
+    global shared_resolver
+    shared_resolver = resolver
+
+def resolve_shared(profile_path):
+    return shared_resolver.resolve(profile_path)
+
+def catalog_data(file_path):
+    """Return the catalog object of an OSCAL catalog or resolved profile file."""
+    return ProfileResolver().catalog_data(file_path)
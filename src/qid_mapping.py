@@ -0,0 +1,119 @@
+# qid_mapping.py
+import csv
+import re
+import json_codec
+from profile_resolver import catalog_data, iter_controls
+
+ENHANCEMENT_PATTERN = re.compile(r"^([a-z]{2}-\d+)\s*\((\d+)\)$")
+
+def catalog_id(control_id):
+    """Normalize a NIST control id as written in mapping tables ("SI-2", "SI-2(1)", "si-2.1") to catalog form."""
+    control_id = control_id.strip().lower()
+    match = ENHANCEMENT_PATTERN.match(control_id)
+    return f"{match.group(1)}.{match.group(2)}" if match else control_id
+
+def catalog_controls(file_path):
+    """Map every control id in a catalog or profile file to its title."""
+    return {control["id"]: control.get("title", "") for control, _ in iter_controls(catalog_data(file_path))}
+
+class QidMapping:
+    """QID and category lookups to NIST control ids, precomputed as hash tables.
+
+    A QID entry takes precedence over its category's entry; records matching neither get the
+    default controls. Every lookup is a dict hit, so tagging costs the same for any table size.
+    """
+    def __init__(self, qids=None, categories=None, default=()):
+        self.qids = {str(qid): self.control_tuple(ids) for qid, ids in (qids or {}).items()}
+        self.categories = {category.lower(): self.control_tuple(ids) for category, ids in (categories or {}).items()}
+        self.default = self.control_tuple(default)
+        self.titles = {}
+
+    @staticmethod
+    def control_tuple(ids):
+        if isinstance(ids, str):
+            ids = re.split(r"[;,\s]+", ids)
+        return tuple(dict.fromkeys(catalog_id(control_id) for control_id in ids if control_id.strip()))
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Load a mapping table from JSON ({"qids": {...}, "categories": {...}, "default": [...]})
+        or CSV (columns qid, category, controls; one of qid/category per row, controls separated by ;)."""
+        if file_path.lower().endswith(".csv"):
+            qids, categories = {}, {}
+            with open(file_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    controls = row.get("controls") or ""
+                    if (row.get("qid") or "").strip():
+                        qids[row["qid"].strip()] = controls
+                    elif (row.get("category") or "").strip():
+                        categories[row["category"].strip()] = controls
+            return cls(qids, categories)
+        table = json_codec.load(file_path)
+        return cls(table.get("qids"), table.get("categories"), table.get("default") or ())
+
+    def all_ids(self):
+        ids = set(self.default)
+        for controls in self.qids.values():
+            ids.update(controls)
+        for controls in self.categories.values():
+            ids.update(controls)
+        return ids
+
+    def validate(self, controls):
+        """Drop ids missing from a catalog's {control id: title} map and return them, sorted.
+
+        Checked once against the table rather than per record; titles are kept for the HDF controls list.
+        """
+        unknown = sorted(self.all_ids() - controls.keys())
+        if unknown:
+            missing = set(unknown)
+            for table in (self.qids, self.categories):
+                for key, ids in table.items():
+                    table[key] = tuple(control_id for control_id in ids if control_id not in missing)
+            self.default = tuple(control_id for control_id in self.default if control_id not in missing)
+        self.titles = controls
+        return unknown
+
+    def controls_for(self, qid, category):
+        if qid is not None:
+            ids = self.qids.get(str(qid))
+            if ids is not None:
+                return ids
+        if category:
+            ids = self.categories.get(category.lower())
+            if ids is not None:
+                return ids
+        return self.default
+
+class ControlTally:
+    """Per-control pass/fail/other counts gathered while results are converted."""
+    def __init__(self):
+        self.counts = {}  # Control id -> [passed, failed, other]
+
+    @classmethod
+    def from_controls(cls, controls):
+        """Resume counting from the controls section of an earlier HDF document."""
+        tally = cls()
+        for entry in controls:
+            tally.counts[entry["id"]] = [entry.get("passed", 0), entry.get("failed", 0), entry.get("other", 0)]
+        return tally
+
+    def add(self, control_ids, status, count=1):
+        column = 0 if status == "pass" else 1 if status == "fail" else 2
+        counts = self.counts
+        for control_id in control_ids:
+            row = counts.get(control_id)
+            if row is None:
+                row = counts[control_id] = [0, 0, 0]
+            row[column] += count
+
+    def controls(self, titles=None):
+        """HDF controls entries, one per control with at least one mapped result."""
+        titles = titles or {}
+        return [{"id": control_id, "title": titles.get(control_id, ""),
+                 "status": "failed" if failed else "passed" if passed else "other",
+                 "passed": passed, "failed": failed, "other": other}
+                for control_id, (passed, failed, other) in sorted(self.counts.items()) if passed or failed or other]
+
+    def nist_controls(self):
+        return sorted(control_id for control_id, row in self.counts.items() if any(row))
@@ -0,0 +1,192 @@
+# qualys_delta.py
+import argparse
+import hashlib
+import os
+import sys
+from datetime import datetime
+import json_codec
+from ohdf_from_qualys_vmdr import adjust_summary, load_mapping, qualys_to_hdf, result_id, vuln_to_result
+from qid_mapping import ControlTally
+
+# Re-detection timestamps change every scan without the finding changing
+FINGERPRINT_IGNORE = {"last_detected"}
+
+def finding_key(vuln):
+    return f"{vuln.get('asset_id', 'Unknown')}|{result_id(vuln)}"
+
+def result_key(result):
+    return f"{result['tags'].get('asset_id', 'Unknown')}|{result['id']}"
+
+def fingerprint(vuln):
+    """Digest of the fields that affect a finding's HDF result, independent of key order."""
+    content = json_codec.dumps({key: value for key, value in sorted(vuln.items()) if key not in FINGERPRINT_IGNORE},
+                               compact=True)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=12).hexdigest()
+
+def fingerprint_path_for(cumulative_path):
+    return os.path.splitext(cumulative_path)[0] + ".fingerprints.json"
+
+class FingerprintStore:
+    """Persisted {(asset, QID) key: fingerprint} of the findings in a cumulative HDF document."""
+    def __init__(self, path, fingerprints=None):
+        self.path = path
+        self.fingerprints = fingerprints or {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            return cls(path, json_codec.load(path))
+        except (OSError, json_codec.DecodeError):
+            return cls(path)
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        json_codec.dump(self.fingerprints, temp_path, compact=True)
+        os.replace(temp_path, self.path)
+
+def diff_scan(vulnerabilities, fingerprints):
+    """Split a scan into new and changed detections plus the keys of resolved ones.
+
+    Unchanged detections are only hashed, never converted; returns (new, changed, resolved, current)
+    where current is the fingerprint map for this scan.
+    """
+    new, changed, current = [], [], {}
+    for vuln in vulnerabilities:
+        key = finding_key(vuln)
+        if key in current:  # Repeated detection of the same finding in one export
+            continue
+        digest = fingerprint(vuln)
+        current[key] = digest
+        previous = fingerprints.get(key)
+        if previous is None:
+            new.append(vuln)
+        elif previous != digest:
+            changed.append(vuln)
+    resolved = [key for key in fingerprints if key not in current]
+    return new, changed, resolved, current
+
+def apply_delta(cumulative, new_results, changed_results, resolved, mapping=None):
+    """Update a cumulative HDF document in place and return the results removed as resolved.
+
+    Summary and control counts are adjusted by each result's old and new contribution, not recounted.
+    """
+    summary = cumulative["executive_summary"]
+    titles = {entry["id"]: entry.get("title", "") for entry in cumulative["controls"]}
+    if mapping is not None:
+        titles.update(mapping.titles)
+    tally = ControlTally.from_controls(cumulative["controls"])
+    results = cumulative["results"]
+    positions = {result_key(result): position for position, result in enumerate(results)}
+
+    def account(result, count):
+        adjust_summary(summary, result, count)
+        if "nist" in result["tags"]:
+            tally.add(result["tags"]["nist"], result["status"], count)
+
+    appended = list(new_results)
+    for result in changed_results:
+        position = positions.get(result_key(result))
+        if position is None:  # The store and document disagree; keep the finding rather than fail
+            appended.append(result)
+            continue
+        account(results[position], -1)
+        account(result, 1)
+        results[position] = result
+    removed = []
+    for key in resolved:
+        position = positions.get(key)
+        if position is not None:
+            account(results[position], -1)
+            removed.append(results[position])
+            results[position] = None
+    for result in appended:
+        account(result, 1)
+        results.append(result)
+    if removed:
+        results[:] = [result for result in results if result is not None]
+    summary["scan_time"] = datetime.utcnow().isoformat() + "Z"
+    cumulative["controls"] = tally.controls(titles)
+    cumulative["nist_controls"] = tally.nist_controls()
+    return removed
+
+def convert_delta(qualys_data, cumulative_path, mapping=None):
+    """Convert only what changed since the last scan and fold it into the cumulative HDF file.
+
+    Returns the delta document: new and changed results (tagged delta=new/changed) and the
+    resolved findings. The first run, or a run without a fingerprint store, converts everything.
+    """
+    store = FingerprintStore.load(fingerprint_path_for(cumulative_path))
+    if not os.path.exists(cumulative_path):
+        store.fingerprints = {}
+    vulnerabilities = qualys_data.get("response", {}).get("vulnerabilities", [])
+    new, changed, resolved_keys, current = diff_scan(vulnerabilities, store.fingerprints)
+    if not (new or changed or resolved_keys) and store.fingerprints:
+        return delta_document(datetime.utcnow().isoformat() + "Z", [], [], [], len(current))
+
+    cumulative = None
+    if store.fingerprints:
+        try:
+            cumulative = json_codec.load(cumulative_path)
+        except json_codec.DecodeError:
+            new, changed, resolved_keys, current = diff_scan(vulnerabilities, {})
+    if cumulative is None:
+        cumulative = qualys_to_hdf({}, mapping)
+    cumulative["passthrough"] = {}  # Raw exports are not accumulated
+
+    new_results = [vuln_to_result(vuln, mapping) for vuln in new]
+    changed_results = [vuln_to_result(vuln, mapping) for vuln in changed]
+    removed = apply_delta(cumulative, new_results, changed_results, resolved_keys, mapping)
+    resolved = [{"id": result["id"], "asset_id": result["tags"].get("asset_id"), "title": result["title"]}
+                for result in removed]
+
+    temp_path = cumulative_path + ".tmp"
+    json_codec.dump(cumulative, temp_path, compact=True)
+    os.replace(temp_path, cumulative_path)
+    store.fingerprints = current
+    store.save()
+    return delta_document(cumulative["executive_summary"]["scan_time"], new_results, changed_results, resolved,
+                          len(current) - len(new_results) - len(changed_results))
+
+def delta_document(scan_time, new_results, changed_results, resolved, unchanged):
+    return {
+        "version": "1.0",
+        "executive_summary": {
+            "tool": "Qualys VMDR",
+            "scan_time": scan_time,
+            "new": len(new_results),
+            "changed": len(changed_results),
+            "resolved": len(resolved),
+            "unchanged": unchanged
+        },
+        "results": [dict(result, tags=dict(result["tags"], delta="new")) for result in new_results]
+                   + [dict(result, tags=dict(result["tags"], delta="changed")) for result in changed_results],
+        "resolved": resolved
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fold a Qualys VMDR export into a cumulative HDF file, writing only what changed.")
+    parser.add_argument("input", help="Today's Qualys JSON export")
+    parser.add_argument("cumulative", help="Cumulative HDF JSON, updated in place (created on the first run)")
+    parser.add_argument("--delta", help="Write the new, changed and resolved findings to this file")
+    parser.add_argument("--mapping", help="QID/category to NIST control mapping table (.json or .csv)")
+    parser.add_argument("--catalog", help="Catalog or profile used to validate the mapped control ids")
+    args = parser.parse_args(argv)
+
+    try:
+        mapping = load_mapping(args.mapping, args.catalog) if args.mapping else None
+        delta = convert_delta(json_codec.load(args.input), args.cumulative, mapping)
+        if args.delta:
+            json_codec.dump(delta, args.delta, compact=True)
+    except FileNotFoundError as e:
+        print(f"Error: Input file {e.filename} not found.")
+        return 2
+    except json_codec.DecodeError:
+        print("Error: Invalid JSON format in input file.")
+        return 2
+    summary = delta["executive_summary"]
+    print(f"{summary['new']} new, {summary['changed']} changed, {summary['resolved']} resolved, "
+          f"{summary['unchanged']} unchanged; {args.cumulative} updated")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# search_index.py
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from oscal_pydantic.catalog import Control
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-._][a-z0-9]+)*")
+
+def tokenize(text):
+    """Split text into lowercase tokens; dotted/dashed ids also yield their components."""
+    tokens = set()
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.add(token)
+        if len(token) > 1 and not token.isalnum():
+            tokens.update(t for t in re.split(r"[-._]", token) if t)
+    return tokens
+
+def part_text(part, out):
+    if isinstance(part, dict):
+        out.append(part.get("title") or "")
+        out.append(part.get("prose") or "")
+        for sub_part in part.get("parts") or []:
+            part_text(sub_part, out)
+        return
+    out.append(part.title or "")
+    out.append(part.prose or "")
+    for sub_part in part.parts or []:
+        part_text(sub_part, out)
+
+def param_text(param, out):
+    out.append(param.id)
+    out.append(param.label or "")
+    out.append(param.usage or "")
+    for guideline in param.guidelines or []:
+        out.append(guideline.prose or "")
+    for prop in param.props or []:
+        out.append(f"{prop.name} {prop.value}")
+
+def document_text(obj):
+    """Collect the searchable text of a group or control: id, title, prose, params and props."""
+    out = [obj.id or "", obj.title or ""]
+    for part in obj.parts or []:
+        part_text(part, out)
+    for param in obj.params or []:
+        param_text(param, out)
+    for prop in obj.props or []:
+        if isinstance(prop, dict):
+            out.append(f"{prop.get('name', '')} {prop.get('value', '')}")
+        else:
+            out.append(f"{prop.name} {prop.value}")
+    # Enhancements are not tree rows, so they are searchable through their parent control
+    if isinstance(obj, Control):
+        for child in obj.controls or []:
+            out.append(document_text(child))
+    return " ".join(out)
+
+class SearchIndex:
+    """Inverted index over catalog group and control text with prefix queries."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.postings = defaultdict(set)  # Token -> ids of documents containing it
+        self.doc_tokens = {}  # Id -> tokens, so documents can be replaced incrementally
+        self.sorted_tokens = []
+        self.tokens_dirty = False
+        self.ready = False
+        self.pending = {}  # Updates made while a background build is running
+
+    def documents(self, catalog):
+        for group in catalog.groups or []:
+            yield group.id, group
+            for control in group.controls or []:
+                yield control.id, control
+        for control in catalog.controls or []:
+            yield control.id, control
+
+    def texts(self, catalog):
+        """Yield (id, text); compact catalogs provide their text straight from the raw JSON."""
+        if hasattr(catalog, "search_documents"):
+            yield from catalog.search_documents()
+            return
+        for doc_id, obj in self.documents(catalog):
+            yield doc_id, document_text(obj)
+
+    def build(self, catalog):
+        postings = defaultdict(set)
+        doc_tokens = {}
+        for doc_id, text in self.texts(catalog):
+            tokens = tokenize(text)
+            doc_tokens[doc_id] = tokens
+            for token in tokens:
+                postings[token].add(doc_id)
+        with self.lock:
+            self.postings = postings
+            self.doc_tokens = doc_tokens
+            self.tokens_dirty = True
+            pending, self.pending = self.pending, {}
+            self.ready = True
+        for doc_id, obj in pending.items():
+            self.update(doc_id, obj)
+
+    def build_async(self, catalog):
+        """Build the index on a daemon thread; poll `ready` from the UI thread."""
+        self.ready = False
+        thread = threading.Thread(target=self.build, args=(catalog,), daemon=True)
+        thread.start()
+        return thread
+
+    def update(self, doc_id, obj):
+        """Re-index a single group or control; pass obj=None to remove it."""
+        with self.lock:
+            if not self.ready:
+                self.pending[doc_id] = obj
+                return
+            for token in self.doc_tokens.pop(doc_id, ()):
+                ids = self.postings.get(token)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del self.postings[token]
+            if obj is not None:
+                tokens = tokenize(document_text(obj))
+                self.doc_tokens[doc_id] = tokens
+                for token in tokens:
+                    self.postings[token].add(doc_id)
+            self.tokens_dirty = True
+
+    def remove(self, doc_id):
+        self.update(doc_id, None)
+
+    def prefix_matches(self, prefix):
+        ids = set()
+        tokens = self.sorted_tokens
+        index = bisect_left(tokens, prefix)
+        while index < len(tokens) and tokens[index].startswith(prefix):
+            ids |= self.postings[tokens[index]]
+            index += 1
+        return ids
+
+    def search(self, query):
+        """Return the ids of documents matching every query term as a prefix."""
+        terms = TOKEN_PATTERN.findall(query.lower())
+        if not terms:
+            return None
+        with self.lock:
+            if self.tokens_dirty:
+                self.sorted_tokens = sorted(self.postings)
+                self.tokens_dirty = False
+            result = None
+            for term in sorted(terms, key=len, reverse=True):
+                ids = self.prefix_matches(term)
+                result = ids if result is None else result & ids
+                if not result:
+                    break
+            return result
@@ -0,0 +1,284 @@
+# virtual_tree.py
+from tkinter import ttk
+from itertools import count
+
+class VirtualTree:
+    """Treeview facade that keeps the row model itself and only materializes visible rows.
+
+    It mirrors the subset of the ttk.Treeview API used by CatalogManager (insert, item,
+    selection, see, detach/move, ...) so it can stand in for a Treeview on catalogs with
+    tens of thousands of nodes. Anything it does not override is forwarded to the inner
+    Treeview, which holds at most one screenful of rows whose iids are the node keys.
+    """
+    ROOT = ""
+
+    def __init__(self, parent, height=20, **kwargs):
+        self.inner = ttk.Treeview(parent, height=height, selectmode="browse", **kwargs)
+        self.page = height
+        self.offset = 0
+        self.nodes = {self.ROOT: {"parent": None, "children": [], "open": True}}
+        self.rows = None  # Flattened visible keys, rebuilt lazily after structural changes
+        self.row_index = {}
+        self.depths = {}
+        self.selected = None
+        self.render_job = None
+        self.yscrollcommand = None
+        self.keys = count()
+
+        # Our handlers live on their own bindtag, after the widget tag so the manager's
+        # bindings run first and before the Treeview class bindings so keys can be overridden
+        self.tag = f"VirtualTree{id(self)}"
+        tags = list(self.inner.bindtags())
+        tags.insert(1, self.tag)
+        self.inner.bindtags(tuple(tags))
+        self.inner.bind_class(self.tag, "<ButtonPress-1>", self.on_click)
+        self.inner.bind_class(self.tag, "<Double-Button-1>", self.on_double_click)
+        self.inner.bind_class(self.tag, "<Up>", lambda e: self.move_selection(-1))
+        self.inner.bind_class(self.tag, "<Down>", lambda e: self.move_selection(1))
+        self.inner.bind_class(self.tag, "<Prior>", lambda e: self.move_selection(-self.page))
+        self.inner.bind_class(self.tag, "<Next>", lambda e: self.move_selection(self.page))
+        self.inner.bind_class(self.tag, "<Home>", lambda e: self.move_selection(-len(self.ensure_rows())))
+        self.inner.bind_class(self.tag, "<End>", lambda e: self.move_selection(len(self.ensure_rows())))
+        self.inner.bind_class(self.tag, "<Left>", lambda e: self.set_open(self.selected, False))
+        self.inner.bind_class(self.tag, "<Right>", lambda e: self.set_open(self.selected, True))
+        self.inner.bind_class(self.tag, "<MouseWheel>", self.on_mousewheel)
+        self.inner.bind_class(self.tag, "<Button-4>", lambda e: self.yview("scroll", -3, "units"))
+        self.inner.bind_class(self.tag, "<Button-5>", lambda e: self.yview("scroll", 3, "units"))
+        self.inner.bind_class(self.tag, "<Configure>", self.on_configure)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    # Row model
+
+    def insert(self, parent, index, iid=None, text="", values=(), tags=(), image=None, open=False):
+        key = iid if iid is not None else f"V{next(self.keys)}"
+        if isinstance(tags, str):
+            tags = (tags,)
+        self.nodes[key] = {"parent": parent, "children": [], "text": text, "values": tuple(values),
+                           "tags": tuple(tags), "image": image, "open": open}
+        siblings = self.nodes[parent]["children"]
+        if index == "end":
+            siblings.append(key)
+        else:
+            siblings.insert(int(index), key)
+        self.invalidate()
+        return key
+
+    def delete(self, *keys):
+        for key in keys:
+            node = self.nodes.get(key)
+            if node is None:
+                continue
+            siblings = self.nodes[node["parent"]]["children"]
+            if key in siblings:
+                siblings.remove(key)
+            stack = [key]
+            while stack:
+                current = stack.pop()
+                if current == self.selected:
+                    self.selected = None
+                stack.extend(self.nodes.pop(current)["children"])
+        self.invalidate()
+
+    def detach(self, *keys):
+        for key in keys:
+            node = self.nodes[key]
+            siblings = self.nodes[node["parent"]]["children"]
+            if key in siblings:
+                siblings.remove(key)
+                node["detached"] = True
+        self.invalidate()
+
+    def move(self, key, parent, index):
+        node = self.nodes[key]
+        old_siblings = self.nodes[node["parent"]]["children"]
+        if not node.get("detached") and key in old_siblings:
+            if node["parent"] == parent and index != "end" and old_siblings[index:index + 1] == [key]:
+                return  # Already in place; keeps filtering cheap when nothing changes
+            old_siblings.remove(key)
+        node["parent"] = parent
+        node["detached"] = False
+        siblings = self.nodes[parent]["children"]
+        siblings.insert(index if index != "end" else len(siblings), key)
+        self.invalidate()
+
+    def exists(self, key):
+        return key in self.nodes and key != self.ROOT
+
+    def parent(self, key):
+        return self.nodes[key]["parent"]
+
+    def get_children(self, key=ROOT):
+        return tuple(self.nodes[key]["children"])
+
+    def sibling(self, key, step):
+        siblings = self.nodes[self.nodes[key]["parent"]]["children"]
+        if key not in siblings:
+            return ""
+        index = siblings.index(key) + step
+        return siblings[index] if 0 <= index < len(siblings) else ""
+
+    def next(self, key):
+        return self.sibling(key, 1)
+
+    def prev(self, key):
+        return self.sibling(key, -1)
+
+    def item(self, key, option=None, **kwargs):
+        node = self.nodes[key]
+        if kwargs:
+            for name, value in kwargs.items():
+                if name == "open":
+                    self.set_open(key, bool(value))
+                else:
+                    node[name] = tuple(value) if name in ("values", "tags") else value
+            self.invalidate(structure=False)
+            return None
+        info = {"text": node["text"], "image": node["image"], "values": node["values"],
+                "open": node["open"], "tags": node["tags"]}
+        return info[option] if option else info
+
+    def set_open(self, key, is_open):
+        if key and self.nodes[key]["children"] and self.nodes[key]["open"] != is_open:
+            self.nodes[key]["open"] = is_open
+            self.invalidate()
+        return "break"
+
+    def ensure_rows(self):
+        """Flatten the attached, expanded part of the tree into the list of visible rows."""
+        if self.rows is None:
+            rows, depths = [], {}
+            stack = [(key, 0) for key in reversed(self.nodes[self.ROOT]["children"])]
+            while stack:
+                key, depth = stack.pop()
+                rows.append(key)
+                depths[key] = depth
+                node = self.nodes[key]
+                if node["open"]:
+                    stack.extend((child, depth + 1) for child in reversed(node["children"]))
+            self.rows = rows
+            self.depths = depths
+            self.row_index = {key: index for index, key in enumerate(rows)}
+        return self.rows
+
+    def invalidate(self, structure=True):
+        """Mark the rows (or just their contents) stale; a single idle render picks up all changes."""
+        if structure:
+            self.rows = None
+        if self.render_job is None:
+            self.render_job = self.inner.after_idle(self.render)
+
+    # Selection and scrolling
+
+    def selection(self):
+        return (self.selected,) if self.selected else ()
+
+    def selection_set(self, key):
+        if isinstance(key, (tuple, list)):
+            key = key[0] if key else None
+        self.selected = key
+        self.render()
+        self.inner.event_generate("<<VirtualTreeSelect>>")
+
+    def bind(self, sequence=None, func=None, add=None):
+        # Selection events come from the model, not from the inner Treeview's own selection
+        if sequence == "<<TreeviewSelect>>":
+            sequence = "<<VirtualTreeSelect>>"
+        return self.inner.bind(sequence, func, add)
+
+    def see(self, key):
+        parent = self.nodes[key]["parent"]
+        while parent:
+            if not self.nodes[parent]["open"]:
+                self.nodes[parent]["open"] = True
+                self.rows = None  # Only re-flatten when an ancestor was actually expanded
+            parent = self.nodes[parent]["parent"]
+        self.ensure_rows()
+        row = self.row_index.get(key, -1)
+        if row >= 0 and not self.offset <= row < self.offset + self.page:
+            self.offset = max(0, row - self.page // 2)
+        self.render()
+
+    def move_selection(self, step):
+        rows = self.ensure_rows()
+        if not rows:
+            return "break"
+        current = self.row_index.get(self.selected, -1)
+        target = min(max(current + step, 0), len(rows) - 1)
+        self.see(rows[target])
+        self.selection_set(rows[target])
+        return "break"
+
+    def configure(self, cnf=None, **kwargs):
+        if "yscrollcommand" in kwargs:
+            self.yscrollcommand = kwargs.pop("yscrollcommand")
+        if kwargs or cnf:
+            return self.inner.configure(cnf, **kwargs)
+        return None
+
+    config = configure
+
+    def yview(self, *args):
+        total = len(self.ensure_rows())
+        if not args:
+            return self.fractions(total)
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.offset += amount * (self.page if args[2] == "pages" else 1)
+        self.render()
+        return None
+
+    def fractions(self, total):
+        if not total:
+            return 0.0, 1.0
+        return self.offset / total, min(1.0, (self.offset + self.page) / total)
+
+    # Rendering
+
+    def render(self):
+        """Materialize just the rows inside the current window into the inner Treeview."""
+        if self.render_job is not None:
+            self.inner.after_cancel(self.render_job)
+            self.render_job = None
+        rows = self.ensure_rows()
+        self.offset = max(0, min(self.offset, len(rows) - self.page))
+        self.inner.delete(*self.inner.get_children())
+        for key in rows[self.offset:self.offset + self.page]:
+            node = self.nodes[key]
+            indicator = ("▾ " if node["open"] else "▸ ") if node["children"] else "  "
+            self.inner.insert("", "end", iid=key, text="    " * self.depths[key] + indicator,
+                              values=node["values"], tags=node["tags"], image=node["image"] or "")
+        if self.selected in self.inner.get_children():
+            self.inner.selection_set(self.selected)
+        if self.yscrollcommand:
+            self.yscrollcommand(*self.fractions(len(rows)))
+
+    def on_configure(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        page = max(1, (event.height - rowheight) // rowheight)  # One row is taken by the headings
+        if page != self.page:
+            self.page = page
+            self.render()
+
+    def on_click(self, event):
+        key = self.inner.identify_row(event.y)
+        if not key:
+            return None
+        if self.inner.identify_column(event.x) == "#0" and self.nodes[key]["children"]:
+            self.set_open(key, not self.nodes[key]["open"])
+        self.selection_set(key)
+        return None
+
+    def on_double_click(self, event):
+        key = self.inner.identify_row(event.y)
+        if key:
+            self.set_open(key, not self.nodes[key]["open"])
+        return "break"
+
+    def on_mousewheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        self.yview("scroll", step * max(1, abs(event.delta) // 120) * 3, "units")
+        return "break"
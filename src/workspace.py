@@ -0,0 +1,351 @@
+# workspace.py
+import os
+import sys
+import json_codec
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pydantic import BaseModel
+from oscal_pydantic.catalog import Catalog, Property
+from oscal_handler import load_catalog, load_compact_catalog, load_mapped_catalog, prepare_catalog_store
+from compact_catalog import CompactCatalog
+from json_stream import iter_json
+
+class WorkspaceEntry:
+    """One catalog open in a workspace.
+
+    An entry starts either from a pydantic Catalog or from a CompactCatalog. In the compact
+    case read paths use the compact records, single controls are materialized when opened,
+    and the full pydantic Catalog is only assembled when `catalog` is first accessed (edits
+    and saves), after which it becomes the source of truth and the compact view is dropped.
+    """
+    def __init__(self, key, path, catalog: Catalog = None, compact: CompactCatalog = None):
+        self.key = key
+        self.path = path
+        self._catalog = catalog
+        self.compact = compact
+        self.dirty = False
+        self.memory = None  # Deep size in bytes, computed on demand
+        # snapshot() reuses JSON for groups (None: the loose controls) that have not been edited: the
+        # source JSON of the compact catalog the model was built from, or the last serialization
+        self.baseline = None
+        self.changed = set()
+        self.json_cache = {}
+
+    @property
+    def catalog(self) -> Catalog:
+        if self._catalog is None:
+            self._catalog = self.compact.to_catalog()
+            self.baseline = self.compact
+            self.compact = None
+            self.memory = None
+        return self._catalog
+
+    @property
+    def title(self):
+        return self.compact.title if self.compact else self._catalog.metadata.title
+
+    @property
+    def save_path(self):
+        """Where edits are saved; a resolved profile is written beside the profile, not over it."""
+        metadata = (self.compact.catalog_shell() if self.compact else self._catalog).metadata
+        name = os.path.basename(self.path)
+        if any(link.rel == "source-profile" and link.href == name for link in metadata.links or []):
+            return os.path.splitext(self.path)[0] + "-resolved.json"
+        return self.path
+
+    def view(self):
+        """The object read paths should walk: the compact catalog or the pydantic one."""
+        return self.compact if self.compact else self._catalog
+
+    def view_groups(self):
+        return self.view().groups or []
+
+    def view_controls(self):
+        """Controls that sit directly under the catalog rather than in a group."""
+        return self.view().controls or []
+
+    def find_group(self, group_id):
+        if self.compact:
+            return self.compact.materialize_group(group_id)
+        return next((g for g in self._catalog.groups or [] if g.id == group_id), None)
+
+    def find_control(self, control_id):
+        if self.compact:
+            return self.compact.materialize_control(control_id)
+        for group in self._catalog.groups or []:
+            for control in group.controls or []:
+                if control.id == control_id:
+                    return control
+        return next((c for c in self._catalog.controls or [] if c.id == control_id), None)
+
+    def group_title(self, group_id):
+        if self.compact:
+            record = self.compact.groups_by_id.get(group_id)
+            return record.title if record else None
+        group = self.find_group(group_id)
+        return group.title if group else None
+
+    def control_summary(self, control_id):
+        """Return (title, statement prose) without materializing the control, or None."""
+        if self.compact:
+            record = self.compact.controls_by_id.get(control_id)
+            return (record.title, self.compact.statement(record)) if record else None
+        control = self.find_control(control_id)
+        if control is None:
+            return None
+        statement = next((part for part in control.parts or [] if getattr(part, "name", None) == "statement"), None)
+        return control.title, statement.prose if statement else None
+
+    def resource_title(self, uuid):
+        if self.compact:
+            return self.compact.resource_titles.get(uuid)
+        if self._catalog.back_matter:
+            for resource in self._catalog.back_matter.resources or []:
+                if resource.uuid == uuid:
+                    return resource.title
+        return None
+
+    def params(self):
+        return self.compact.params() if self.compact else self._catalog.params or []
+
+    def mark_changed(self, kind, item_id, group_id=None):
+        """Note that a "group" or "control" was added, edited or removed, so snapshot() serializes
+        the group it belongs to again; group_id is the control's group when the caller knows it.
+
+        Marked groups never go back to the baseline JSON, so a group deleted and re-created under
+        the same id is serialized from the new model.
+        """
+        if kind == "group":
+            group_id = item_id
+        elif group_id is None:
+            group_id = next((group.id for group in self.view_groups()
+                             if any(control.id == item_id for control in group.controls or [])), None)
+        self.changed.add(group_id)
+        self.json_cache.pop(group_id, None)
+
+    def group_snapshot(self, group_id, group):
+        """(group JSON, control JSONs) of a pydantic group, or (JSON with its controls, None) once it
+        has been edited; group None stands for the catalog's loose controls."""
+        cached = self.json_cache.get(group_id)
+        if cached is None:
+            baseline = self.baseline if group_id not in self.changed else None
+            if group is None:
+                cached = ([baseline.strings.get(control.source) for control in baseline.controls] if baseline
+                          else ["".join(iter_json(control)) for control in self._catalog.controls or []])
+            elif baseline and group_id in baseline.groups_by_id:
+                record = baseline.groups_by_id[group_id]
+                cached = (baseline.strings.get(record.source), [baseline.strings.get(control.source)
+                                                                for control in record.controls])
+            else:
+                cached = ("".join(iter_json(group)), None)
+            self.json_cache[group_id] = cached
+        return cached
+
+    def snapshot(self, resources=False):
+        """Freeze the catalog as it is now, unsaved edits included, for work on another thread or process.
+
+        Only groups edited since the last snapshot (or since the compact view was dropped) are
+        serialized here on the GUI thread; the rest reuse JSON text already held. Back-matter
+        resources are included only when asked for.
+        """
+        if self.compact:
+            compact = self.compact
+            return CatalogSnapshot(compact.strings.get(compact.shell),
+                                   [(compact.group_json(group), [compact.control_json(control) for control in group.controls])
+                                    for group in compact.groups],
+                                   [compact.control_json(control) for control in compact.controls],
+                                   [compact.strings.get(position) for position in compact.resource_sources.values()]
+                                   if resources else None)
+        catalog = self._catalog
+        back_matter = catalog.back_matter.resources if catalog.back_matter else None
+        return CatalogSnapshot(catalog.json(by_alias=True, exclude_none=True, exclude={"groups", "controls", "back_matter"}),
+                               [self.group_snapshot(group.id, group) for group in catalog.groups or []],
+                               self.group_snapshot(None, None),
+                               [resource.json(by_alias=True, exclude_none=True) for resource in back_matter or []]
+                               if resources else None)
+
+class CatalogSnapshot:
+    """JSON text of a catalog taken on the GUI thread and decoded where it is used.
+
+    A compact catalog's snapshot shares the immutable per-control JSON strings it already holds, so
+    only controls and groups materialized for editing are serialized; a pydantic catalog is
+    serialized group by group with json_stream. Back-matter resources are only included on request.
+    """
+    __slots__ = ("shell", "groups", "controls", "resources")
+
+    def __init__(self, shell, groups, controls, resources=None):
+        self.shell = shell
+        self.groups = groups  # (group JSON, control JSONs), or (group JSON with its controls, None)
+        self.controls = controls
+        self.resources = resources  # Back-matter resource JSONs, or None when left out
+
+    def to_dict(self):
+        """The "catalog" object of the snapshot as plain JSON."""
+        data = json_codec.loads(self.shell)
+        data.pop("back-matter", None)
+        if self.resources:
+            data["back-matter"] = {"resources": [json_codec.loads(resource) for resource in self.resources]}
+        groups = []
+        for group_json, control_jsons in self.groups:
+            group = json_codec.loads(group_json)
+            if control_jsons:
+                group["controls"] = [json_codec.loads(control) for control in control_jsons]
+            groups.append(group)
+        if groups:
+            data["groups"] = groups
+        if self.controls:
+            data["controls"] = [json_codec.loads(control) for control in self.controls]
+        return data
+
+class Workspace:
+    """Several OSCAL catalogs opened together, sharing identical strings, props and resources."""
+    def __init__(self):
+        self.entries = []
+        self.strings = {}  # Value -> canonical str instance shared by every catalog
+        self.props = {}  # (name, value, ns, class, uuid) -> shared Property
+        self.resources = {}  # Back-matter uuid -> shared Resource
+
+    @classmethod
+    def open(cls, paths, workers=None, use_processes=True, compact=False, mapped=False):
+        workspace = cls()
+        workspace.load(paths, workers, use_processes, compact, mapped)
+        return workspace
+
+    def load(self, paths, workers=None, use_processes=True, compact=False, mapped=False):
+        """Parse catalogs concurrently, then merge them into the workspace in the given order.
+
+        With mapped=True the workers only build or refresh each catalog's store file; the
+        stores are then memory-mapped here, since a mapping cannot cross a process boundary.
+        """
+        paths = list(paths)
+        loader = prepare_catalog_store if mapped else load_compact_catalog if compact else load_catalog
+        workers = workers or min(len(paths), os.cpu_count() or 1)
+        if len(paths) == 1 or workers == 1:
+            catalogs = [loader(path) for path in paths]
+        else:
+            executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor_class(max_workers=workers) as executor:
+                catalogs = list(executor.map(loader, paths))
+        if mapped:
+            catalogs = [load_mapped_catalog(path, store) for path, store in zip(paths, catalogs)]
+        for path, catalog in zip(paths, catalogs):
+            self.add(path, catalog)
+        return self.entries
+
+    def add(self, path, catalog, share=True):
+        """Add a pydantic Catalog or a CompactCatalog under a key derived from its file name."""
+        key = self.unique_key(os.path.splitext(os.path.basename(path))[0])
+        if isinstance(catalog, CompactCatalog):
+            if share:
+                catalog.reintern(self.intern)
+            entry = WorkspaceEntry(key, path, compact=catalog)
+            self.entries.append(entry)
+            return entry
+        if share:
+            self.share(catalog)
+        entry = WorkspaceEntry(key, path, catalog)
+        self.entries.append(entry)
+        return entry
+
+    def unique_key(self, base):
+        keys = {entry.key for entry in self.entries}
+        key, n = base, 2
+        while key in keys:
+            key, n = f"{base}-{n}", n + 1
+        return key
+
+    def get(self, key):
+        return next((entry for entry in self.entries if entry.key == key), None)
+
+    # De-duplication
+
+    def intern(self, value):
+        return self.strings.setdefault(value, value)
+
+    def share(self, catalog: Catalog):
+        """Replace duplicate strings, props and back-matter resources with shared instances.
+
+        Shared objects must not be mutated in place; edit paths replace props instead.
+        """
+        if catalog.back_matter and catalog.back_matter.resources:
+            resources = catalog.back_matter.resources
+            for index, resource in enumerate(resources):
+                shared = self.resources.get(resource.uuid)
+                if shared is not None and shared == resource:
+                    resources[index] = shared
+                else:
+                    self.share_model(resource)
+                    self.resources.setdefault(resource.uuid, resource)
+        self.share_model(catalog)
+
+    def share_model(self, model):
+        stack = [model]
+        while stack:
+            obj = stack.pop()
+            for name, value in obj.__dict__.items():
+                if type(value) is str:
+                    obj.__dict__[name] = self.intern(value)
+                elif isinstance(value, BaseModel):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    for index, element in enumerate(value):
+                        if type(element) is str:
+                            value[index] = self.intern(element)
+                        elif isinstance(element, Property):
+                            value[index] = self.share_prop(element)
+                        elif isinstance(element, BaseModel):
+                            stack.append(element)
+
+    def share_prop(self, prop: Property):
+        if prop.remarks is not None:
+            return prop
+        key = (prop.name, prop.value, prop.ns, prop.class_, prop.uuid)
+        shared = self.props.get(key)
+        if shared is None:
+            prop.__dict__["name"] = self.intern(prop.name)
+            prop.__dict__["value"] = self.intern(prop.value)
+            self.props[key] = shared = prop
+        return shared
+
+    # Memory accounting
+
+    def memory_report(self):
+        """Return the deep size of each catalog and how much the workspace saves by sharing."""
+        report = []
+        seen = set()
+        separate_total = 0
+        for entry in self.entries:
+            size = model_size(entry.view(), set())
+            separate_total += size
+            report.append({"key": entry.key, "path": entry.path, "title": entry.title, "bytes": size})
+        shared_total = sum(model_size(entry.view(), seen) for entry in self.entries)
+        return {"catalogs": report, "total_bytes": shared_total, "shared_bytes": separate_total - shared_total}
+
+def model_size(obj, seen):
+    """Approximate deep size of a pydantic or compact catalog, counting each object once per `seen` set."""
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, (bool, int, float)):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, BaseModel):
+            size += sys.getsizeof(obj.__dict__) + sys.getsizeof(obj.__fields_set__)
+            stack.extend(obj.__dict__.values())
+        elif hasattr(type(obj), "__slots__"):
+            stack.extend(getattr(obj, name) for name in type(obj).__slots__)
+        elif isinstance(obj, CompactCatalog):
+            stack.extend(obj.__dict__.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+    return size
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,60 @@
+# test_workspace.py
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from oscal_pydantic.catalog import Control, ControlGroup
+from workspace import Workspace
+
+CATALOG = {"catalog": {
+    "uuid": "3c2c6f07-7a9e-4c53-9b8d-4c1f0f0f0001",
+    "metadata": {"title": "Test", "last-modified": "2024-01-01T00:00:00+00:00", "version": "1", "oscal-version": "1.1.2"},
+    "groups": [
+        {"id": "ac", "title": "Access Control", "controls": [{"id": "ac-1", "title": "Policy"}, {"id": "ac-2", "title": "Accounts"}]},
+        {"id": "au", "title": "Audit", "controls": [{"id": "au-1", "title": "Policy"}]},
+    ],
+}}
+
+def open_entry(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(CATALOG))
+    entry = Workspace.open([str(path)], compact=True).entries[0]
+    entry.catalog  # Drop the compact view; it becomes the snapshot baseline
+    return entry
+
+def exported_groups(entry):
+    return [(group["id"], group["title"], [control["id"] for control in group.get("controls", [])])
+            for group in entry.snapshot().to_dict()["groups"]]
+
+def test_snapshot_reuses_unedited_groups(tmp_path):
+    entry = open_entry(tmp_path)
+    assert exported_groups(entry) == [("ac", "Access Control", ["ac-1", "ac-2"]), ("au", "Audit", ["au-1"])]
+
+def test_snapshot_includes_group_edits(tmp_path):
+    entry = open_entry(tmp_path)
+    entry.snapshot()  # Fill the JSON cache before editing
+    entry.catalog.groups[0].title = "Access Control (edited)"
+    entry.mark_changed("group", "ac")
+    assert exported_groups(entry)[0] == ("ac", "Access Control (edited)", ["ac-1", "ac-2"])
+
+def test_snapshot_of_recreated_group(tmp_path):
+    entry = open_entry(tmp_path)
+    catalog = entry.catalog
+    catalog.groups.remove(entry.find_group("au"))
+    entry.mark_changed("group", "au")
+    catalog.groups.append(ControlGroup(id="au", title="New Audit"))
+    entry.mark_changed("group", "au")
+    assert exported_groups(entry)[1] == ("au", "New Audit", [])
+
+def test_snapshot_includes_control_edits(tmp_path):
+    entry = open_entry(tmp_path)
+    entry.snapshot()
+    group = entry.find_group("ac")
+    group.controls[1].title = "Account Management"
+    entry.mark_changed("control", "ac-2")
+    group.controls.append(Control(id="ac-3", title="Enforcement"))
+    entry.mark_changed("control", "ac-3", "ac")
+    data = entry.snapshot().to_dict()
+    assert [control["title"] for control in data["groups"][0]["controls"]] == ["Policy", "Account Management", "Enforcement"]